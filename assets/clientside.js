@@ -0,0 +1,588 @@
+// assets/clientside.js
+// Callbacks clientside (TOURISM_CLIENTSIDE=1) : filtres, KPIs, cartes et classements des pages
+// International et Économie calculés dans le navigateur à partir du dcc.Store de la page,
+// sans requête serveur. Chaque fonction reproduit la sortie du callback serveur équivalent.
+
+(function () {
+    var MESURES = {
+        'Nombre de touristes': function (g) { return g.touristes; },
+        'Nuitées touristiques': function (g) { return g.nuitees; },
+        'Durée de séjour moyenne': function (g) { return g.duree_n ? g.duree_somme / g.duree_n : NaN; },
+        'Intensité économique': function (g) { return g.nuitees / g.touristes; }
+    };
+
+    var AGREGATIONS = ['Autre Asie', 'Autre Amérique du Sud', 'Autre Amérique Centrale',
+                       'Europe (hors France)', 'Asie', 'Pacifique', 'Afrique',
+                       'Amérique du Sud', 'Amérique Centrale', 'Autres Pays'];
+
+    // Couleurs des catégories de plotly.express (palette qualitative Plotly)
+    var COULEURS = ['#636efa', '#EF553B', '#00cc96', '#ab63fa', '#FFA15A',
+                    '#19d3f3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52'];
+
+    // ---------- Formatage des nombres, comme les f-strings Python ----------
+
+    // Arrondi à `d` décimales ; les égalités exactes vont au chiffre pair, comme en Python
+    function arrondi(x, d) {
+        var s = x.toFixed(d);
+        var exact = Math.abs(x).toFixed(100);
+        var point = exact.indexOf('.');
+        if (/^50*$/.test(exact.slice(point + 1 + d))) {
+            var tronque = d ? exact.slice(0, point + 1 + d) : exact.slice(0, point);
+            if (+tronque[tronque.length - 1] % 2 === 0) {
+                s = (x < 0 ? '-' : '') + tronque;
+            }
+        }
+        return s;
+    }
+
+    // Équivalent de f"{x:.{d}f}" (groupe=false) ou f"{x:,.{d}f}" (groupe=true)
+    function fmt(x, d, groupe) {
+        if (isNaN(x)) { return 'nan'; }
+        if (!isFinite(x)) { return x > 0 ? 'inf' : '-inf'; }
+        var s = arrondi(x, d);
+        if (!groupe) { return s; }
+        var parties = s.split('.');
+        parties[0] = parties[0].replace(/\B(?=(\d{3})+(?!\d))/g, ',');
+        return parties.join('.');
+    }
+
+    // ---------- Agrégats ----------
+
+    // Agrégat par pays d'une sélection (région, année, pays individuels), dans l'ordre des pays ;
+    // la somme des durées est compensée (Kahan), comme la moyenne par groupe de pandas
+    function agreger(rows, region, annee, individuels, pays) {
+        var groupes = {};
+        for (var i = 0; i < rows.p.length; i++) {
+            var p = rows.p[i];
+            if (p < 0) { continue; }
+            if (region !== null && rows.regions[rows.r[i]] !== region) { continue; }
+            if (annee !== null && rows.annee[i] !== annee) { continue; }
+            if (individuels && !rows.individuel[p]) { continue; }
+            if (pays && pays.indexOf(rows.pays[p]) < 0) { continue; }
+            var g = groupes[p] || (groupes[p] = {
+                region: rows.r[i] < 0 ? null : rows.regions[rows.r[i]],
+                touristes: 0, nuitees: 0, duree_somme: 0, duree_n: 0, compensation: 0
+            });
+            g.touristes += rows.touristes[i];
+            g.nuitees += rows.nuitees[i];
+            var y = rows.duree_somme[i] - g.compensation;
+            var t = g.duree_somme + y;
+            g.compensation = (t - g.duree_somme) - y;
+            g.duree_somme = t;
+            g.duree_n += rows.duree_n[i];
+        }
+        return Object.keys(groupes).map(Number).sort(function (a, b) { return a - b; })
+            .map(function (p) {
+                return {pays: rows.pays[p], iso3: rows.iso3[p], region: groupes[p].region, groupe: groupes[p]};
+            });
+    }
+
+    // Totaux d'une liste de pays agrégés (durée : moyenne sur les lignes d'origine)
+    function totaux(pays) {
+        var t = {touristes: 0, nuitees: 0, duree_somme: 0, duree_n: 0};
+        pays.forEach(function (d) {
+            t.touristes += d.groupe.touristes;
+            t.nuitees += d.groupe.nuitees;
+            t.duree_somme += d.groupe.duree_somme;
+            t.duree_n += d.groupe.duree_n;
+        });
+        return t;
+    }
+
+    // Tri stable selon un critère, sans valeurs manquantes
+    function trier(pays, critere, decroissant) {
+        var valeur = MESURES[critere];
+        var lignes = pays.map(function (d) { return Object.assign({valeur: valeur(d.groupe)}, d); })
+            .filter(function (d) { return !isNaN(d.valeur); });
+        lignes.sort(function (a, b) {
+            if (a.valeur === b.valeur) { return 0; }
+            return (a.valeur < b.valeur) === decroissant ? 1 : -1;
+        });
+        return lignes;
+    }
+
+    // Top N selon un critère, du N-ième au premier
+    function classement(pays, critere, n, decroissant) {
+        return trier(pays, critere, decroissant).slice(0, n).reverse();
+    }
+
+    function mediane(valeurs) {
+        var v = valeurs.filter(function (x) { return !isNaN(x); }).sort(function (a, b) { return a - b; });
+        if (!v.length) { return NaN; }
+        var m = Math.floor(v.length / 2);
+        return v.length % 2 ? v[m] : (v[m - 1] + v[m]) / 2;
+    }
+
+    // Nombre de valeurs par intervalle ]a, b] (le premier fermé à gauche), dernier intervalle ouvert
+    function histogramme(valeurs, bornes, etiquettes) {
+        var comptes = etiquettes.map(function () { return 0; });
+        valeurs.forEach(function (v) {
+            if (isNaN(v) || v < bornes[0]) { return; }
+            for (var i = 0; i < etiquettes.length; i++) {
+                if (i === etiquettes.length - 1 || v <= bornes[i + 1]) {
+                    comptes[i] += 1;
+                    return;
+                }
+            }
+        });
+        var x = [], y = [];
+        comptes.forEach(function (c, i) {
+            if (c > 0) { x.push(etiquettes[i]); y.push(c); }
+        });
+        return {x: x, y: y};
+    }
+
+    // ---------- Composants et figures ----------
+
+    function composant(type, props, namespace) {
+        return {props: props, type: type, namespace: namespace || 'dash_html_components'};
+    }
+
+    function options(noms) {
+        return noms.slice().sort().map(function (p) { return {label: p, value: p}; });
+    }
+
+    function figureVide(payload, texte, police) {
+        var annotation = {showarrow: false, text: texte};
+        if (police) { annotation.font = {color: 'gray', size: 14}; }
+        return {data: [], layout: {annotations: [annotation], template: payload.templates.plotly}};
+    }
+
+    function axes(titreX, titreY) {
+        return {
+            xaxis: {anchor: 'y', domain: [0, 1], title: {text: titreX}},
+            yaxis: {anchor: 'x', domain: [0, 1], title: {text: titreY}}
+        };
+    }
+
+    // Barres colorées par leur valeur, comme px.bar(..., color=<colonne de la valeur>)
+    function barresColorees(payload, echelle, template, t) {
+        var trace = {
+            alignmentgroup: 'True',
+            hovertemplate: t.hovertemplate,
+            legendgroup: '',
+            marker: {color: t.valeurs, coloraxis: 'coloraxis', pattern: {shape: ''}},
+            name: '',
+            offsetgroup: '',
+            orientation: t.orientation,
+            showlegend: false,
+            text: t.valeurs,
+            textposition: 'outside',
+            x: t.orientation === 'h' ? t.valeurs : t.categories,
+            xaxis: 'x',
+            y: t.orientation === 'h' ? t.categories : t.valeurs,
+            yaxis: 'y',
+            type: 'bar'
+        };
+        if (t.texttemplate) { trace.texttemplate = t.texttemplate; }
+        var layout = axes(t.titreX, t.titreY);
+        layout.coloraxis = {colorbar: {title: {text: t.titreCouleur}}, colorscale: payload.colorscales[echelle]};
+        layout.legend = {tracegroupgap: 0};
+        layout.barmode = 'relative';
+        layout.template = payload.templates[template];
+        return {data: [trace], layout: Object.assign(layout, t.layout)};
+    }
+
+    function figureClassement(payload, lignes, critere, echelle, template, texttemplate, layout) {
+        var valeurs = lignes.map(function (d) { return d.valeur; });
+        return barresColorees(payload, echelle, template, {
+            orientation: 'h',
+            valeurs: valeurs,
+            categories: lignes.map(function (d) { return d.pays; }),
+            hovertemplate: critere + '=%{marker.color}<br>Pays=%{y}<extra></extra>',
+            texttemplate: texttemplate,
+            titreX: critere,
+            titreY: 'Pays',
+            titreCouleur: critere,
+            layout: layout
+        });
+    }
+
+    // Histogramme du nombre de pays par intervalle (page International)
+    function figureHistogramme(payload, valeurs, bornes, etiquettes, colonne, echelle, titreX) {
+        var h = histogramme(valeurs, bornes, etiquettes);
+        return barresColorees(payload, echelle, 'plotly_white', {
+            orientation: 'v',
+            valeurs: h.y,
+            categories: h.x,
+            hovertemplate: colonne + '=%{x}<br>Nombre de pays=%{marker.color}<extra></extra>',
+            titreX: colonne,
+            titreY: 'Nombre de pays',
+            titreCouleur: 'Nombre de pays',
+            layout: {
+                showlegend: false,
+                height: 320,
+                margin: {l: 50, r: 20, t: 20, b: 50},
+                xaxis: {anchor: 'y', domain: [0, 1], title: {text: titreX}}
+            }
+        });
+    }
+
+    function carte(payload, pays, metrique) {
+        if (!pays.length) {
+            return figureVide(payload, 'Aucune donnée disponible pour ces filtres', true);
+        }
+        var colonnes = [
+            ['Nombre de touristes', 2, ':,.0f'],
+            ['Nuitées touristiques', 3, ':,.0f'],
+            ['Durée de séjour moyenne', 4, ':.1f']
+        ];
+        var survol = '<b>%{hovertext}</b><br><br>Region=%{customdata[1]}';
+        colonnes.forEach(function (c) {
+            survol += '<br>' + c[0] + '=%{' + (c[0] === metrique ? 'z' : 'customdata[' + c[1] + ']') + c[2] + '}';
+        });
+        if (metrique === 'Intensité économique') {
+            survol += '<br>' + metrique + '=%{z}';
+        }
+        return {
+            data: [{
+                coloraxis: 'coloraxis',
+                customdata: pays.map(function (d) {
+                    return [d.iso3, d.region, d.groupe.touristes, d.groupe.nuitees, MESURES['Durée de séjour moyenne'](d.groupe)];
+                }),
+                geo: 'geo',
+                hovertemplate: survol + '<extra></extra>',
+                hovertext: pays.map(function (d) { return d.pays; }),
+                locations: pays.map(function (d) { return d.iso3; }),
+                name: '',
+                z: pays.map(function (d) { return MESURES[metrique](d.groupe); }),
+                type: 'choropleth'
+            }],
+            layout: {
+                template: payload.templates.plotly_white,
+                geo: {
+                    domain: {x: [0, 1], y: [0, 1]},
+                    center: {},
+                    projection: {type: 'natural earth'},
+                    showframe: true,
+                    showcoastlines: true
+                },
+                coloraxis: {colorbar: {title: {text: metrique}}, colorscale: payload.colorscales.Viridis},
+                legend: {tracegroupgap: 0},
+                title: {text: metrique + ' - ' + pays.length + ' pays affichés'},
+                margin: {l: 0, r: 0, t: 40, b: 0},
+                height: 470
+            }
+        };
+    }
+
+    function tablePays(pays) {
+        var entetes = [['Rang'], ['Pays'], ['Région'], ['Touristes', 'text-end'], ['Nuitées', 'text-end'],
+                       ['Durée moy.', 'text-end'], ['ISO3', 'text-center']];
+        function cellule(type, texte, classe) {
+            var props = {children: texte};
+            if (classe) { props.className = classe; }
+            return composant(type, props);
+        }
+        var lignes = trier(pays, 'Nombre de touristes', true).slice(0, 100).map(function (d, i) {
+            return composant('Tr', {children: [
+                cellule('Td', '#' + (i + 1)),
+                cellule('Td', d.pays),
+                cellule('Td', d.region),
+                cellule('Td', fmt(d.groupe.touristes, 0, true), 'text-end'),
+                cellule('Td', fmt(d.groupe.nuitees, 0, true), 'text-end'),
+                cellule('Td', fmt(MESURES['Durée de séjour moyenne'](d.groupe), 1) + 'j', 'text-end'),
+                cellule('Td', String(d.iso3), 'text-center text-success')
+            ]});
+        });
+        return composant('Table', {
+            children: [
+                composant('Thead', {children: [composant('Tr', {children: entetes.map(function (e) {
+                    return cellule('Th', e[0], e[1]);
+                })})]}),
+                composant('Tbody', {children: lignes})
+            ],
+            bordered: true, hover: true, responsive: true, striped: true, size: 'sm'
+        }, 'dash_bootstrap_components');
+    }
+
+    function alerteInsights(titre, texte, items, conclusion, couleur) {
+        return composant('Alert', {children: [
+            composant('H5', {children: titre, className: 'alert-heading'}),
+            composant('P', {children: texte}),
+            composant('Ul', {children: items.map(function (item) { return composant('Li', {children: item}); })}),
+            composant('P', {children: conclusion, className: 'mb-0'})
+        ], color: couleur}, 'dash_bootstrap_components');
+    }
+
+    // Touristes et nuitées par mois (ou par région) des séries régionales
+    function seriesRegion(series, region, parRegion) {
+        var groupes = {};
+        for (var i = 0; i < series.m.length; i++) {
+            var nom = series.regions[series.r[i]];
+            if (region !== null && nom !== region) { continue; }
+            var cle = parRegion ? series.r[i] : series.m[i];
+            var g = groupes[cle] || (groupes[cle] = {touristes: 0, nuitees: 0});
+            g.touristes += series.touristes[i];
+            g.nuitees += series.nuitees[i];
+        }
+        return Object.keys(groupes).map(Number).sort(function (a, b) { return a - b; })
+            .map(function (cle) {
+                return Object.assign({cle: parRegion ? series.regions[cle] : series.mois[cle]}, groupes[cle]);
+            });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        tourism: {
+            // ---------- Page International ----------
+
+            intl_map_and_kpis: function (region, annee, metrique, payload) {
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, annee || null, true);
+                var t = totaux(pays);
+                var intensites = pays.map(function (d) { return MESURES['Intensité économique'](d.groupe); });
+                var nuitees = pays.map(function (d) { return d.groupe.nuitees; });
+                var top = trier(pays, 'Nombre de touristes', true)[0];
+                return [
+                    carte(payload, pays, metrique),
+                    options(pays.map(function (d) { return d.pays; })),
+                    composant('Alert', {
+                        children: pays.length + ' pays individuels affichés (agrégations régionales exclues)',
+                        className: 'mb-0',
+                        color: 'success'
+                    }, 'dash_bootstrap_components'),
+                    tablePays(pays),
+                    figureHistogramme(payload, intensites, [0, 10, 15, 20, 25, 30, 35, 100],
+                        ['0-10', '10-15', '15-20', '20-25', '25-30', '30-35', '35+'],
+                        'Intervalle_Intensite', 'Oranges', 'Intensité économique (nuitées par touriste)'),
+                    figureHistogramme(payload, nuitees, [0, 10000, 50000, 100000, 500000, 1000000, 3000000],
+                        ['0-10k', '10-50k', '50-100k', '100-500k', '500k-1M', '1M+'],
+                        'Intervalle_Nuitees', 'Purples', 'Nuitées touristiques totales (milliers)'),
+                    String(pays.length),
+                    fmt(t.touristes / 1000, 1) + 'M',
+                    top ? top.pays : 'N/A',
+                    fmt(MESURES['Durée de séjour moyenne'](t), 1) + 'j'
+                ];
+            },
+
+            intl_top_chart: function (region, annee, critere, n, ordre, payload) {
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, annee || null, true);
+                var lignes = classement(pays, critere, n, ordre === 'desc');
+                var texttemplate = critere !== 'Durée de séjour moyenne' ? '%{text:,.0f}' : '%{text:.1f}j';
+                return figureClassement(payload, lignes, critere, 'Teal', 'plotly_white', texttemplate, {
+                    showlegend: false,
+                    height: Math.max(400, n * 25),
+                    margin: {l: 0, r: 100, t: 20, b: 30},
+                    xaxis: {anchor: 'y', domain: [0, 1], fixedrange: true, title: {text: ''}},
+                    yaxis: {anchor: 'x', domain: [0, 1], fixedrange: true, title: {text: ''}}
+                });
+            },
+
+            intl_comparison: function (selection, region, annee, payload) {
+                if (!selection || !selection.length) {
+                    var vide = figureVide(payload, 'Sélectionnez 2 à 5 pays ci-dessus', true);
+                    return [vide, vide];
+                }
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, annee || null, true, selection);
+                var valeurs = pays.map(function (d) {
+                    return [d.groupe.touristes, d.groupe.nuitees, MESURES['Durée de séjour moyenne'](d.groupe)];
+                });
+                var maxima = [0, 1, 2].map(function (j) {
+                    var v = valeurs.map(function (row) { return row[j]; }).filter(function (x) { return !isNaN(x); });
+                    return v.length ? Math.max.apply(null, v) : NaN;
+                });
+                var theta = ['Touristes', 'Nuitées', 'Durée séjour', 'Touristes'];
+                var legende = {orientation: 'h', yanchor: 'bottom', y: -0.2};
+                var radar = {
+                    data: pays.map(function (d, i) {
+                        var r = valeurs[i].map(function (v, j) { return maxima[j] > 0 ? v / maxima[j] * 100 : 0; });
+                        return {fill: 'toself', name: d.pays, r: r.concat([r[0]]), theta: theta, type: 'scatterpolar'};
+                    }),
+                    layout: {
+                        template: payload.templates.plotly_white,
+                        polar: {radialaxis: {visible: true, range: [0, 100]}},
+                        margin: {l: 0, r: 0, t: 0, b: 0},
+                        legend: legende,
+                        height: 350
+                    }
+                };
+                var noms = pays.map(function (d) { return d.pays; });
+                var barres = {
+                    data: [
+                        {marker: {color: '#2E86AB'}, name: 'Touristes', x: noms,
+                         y: pays.map(function (d) { return d.groupe.touristes; }), type: 'bar'},
+                        {marker: {color: '#A23B72'}, name: 'Nuitées', x: noms,
+                         y: pays.map(function (d) { return d.groupe.nuitees; }), type: 'bar'}
+                    ],
+                    layout: {
+                        template: payload.templates.plotly_white,
+                        margin: {l: 0, r: 0, t: 0, b: 40},
+                        yaxis: {fixedrange: true, title: {text: 'Milliers'}},
+                        xaxis: {fixedrange: true, title: {text: ''}},
+                        legend: legende,
+                        barmode: 'group',
+                        height: 350
+                    }
+                };
+                return [radar, barres];
+            },
+
+            // ---------- Page Économie ----------
+
+            eco_kpis_and_intensity: function (region, payload) {
+                var filtre = region === 'Tous' ? null : region;
+                var pays = agreger(payload.rows, filtre, null, false);
+                var t = totaux(pays);
+                var intensite = t.touristes > 0 ? t.nuitees / t.touristes : 0;
+                var regions = seriesRegion(payload.region_months, filtre, true).map(function (g) {
+                    return {region: g.cle, valeur: g.nuitees / g.touristes};
+                });
+                regions = regions.filter(function (d) { return !isNaN(d.valeur); }).sort(function (a, b) {
+                    return a.valeur === b.valeur ? 0 : (a.valeur < b.valeur ? 1 : -1);
+                }).concat(regions.filter(function (d) { return isNaN(d.valeur); }));
+                var valeurs = regions.map(function (d) { return d.valeur; });
+                return [
+                    fmt(t.nuitees / 1000, 1) + 'M',
+                    fmt(t.touristes / 1000, 1) + 'M',
+                    fmt(MESURES['Durée de séjour moyenne'](t), 1) + ' j',
+                    fmt(intensite, 1),
+                    barresColorees(payload, 'RdYlGn', 'plotly', {
+                        orientation: 'h',
+                        valeurs: valeurs,
+                        categories: regions.map(function (d) { return d.region; }),
+                        hovertemplate: 'Intensité économique=%{marker.color}<br>Region=%{y}<extra></extra>',
+                        texttemplate: '%{text:.1f}',
+                        titreX: 'Intensité économique',
+                        titreY: 'Region',
+                        titreCouleur: 'Intensité économique',
+                        layout: {
+                            title: {text: 'Intensité économique par région (nuitées/touriste)'},
+                            showlegend: false,
+                            height: 400
+                        }
+                    }),
+                    options(pays.map(function (d) { return d.pays; }))
+                ];
+            },
+
+            eco_scatter: function (region, payload) {
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, null, false);
+                var top = trier(pays, 'Nombre de touristes', true).slice(0, 20);
+                var duree = MESURES['Durée de séjour moyenne'];
+                var tailleMax = Math.max.apply(null, top.map(function (d) { return d.groupe.nuitees; }));
+                var regions = [];
+                top.forEach(function (d) {
+                    if (regions.indexOf(d.region) < 0) { regions.push(d.region); }
+                });
+                var data = regions.map(function (r, i) {
+                    var groupe = top.filter(function (d) { return d.region === r; });
+                    return {
+                        hovertemplate: '<b>%{hovertext}</b><br><br>Region=' + r +
+                            '<br>Nombre de touristes=%{x}<br>Durée de séjour moyenne=%{y}' +
+                            '<br>Nuitées touristiques=%{marker.size}<extra></extra>',
+                        hovertext: groupe.map(function (d) { return d.pays; }),
+                        legendgroup: r,
+                        marker: {
+                            color: COULEURS[i % COULEURS.length],
+                            size: groupe.map(function (d) { return d.groupe.nuitees; }),
+                            sizemode: 'area',
+                            sizeref: tailleMax / (20 * 20),
+                            symbol: 'circle'
+                        },
+                        mode: 'markers',
+                        name: r,
+                        orientation: 'v',
+                        showlegend: true,
+                        x: groupe.map(function (d) { return d.groupe.touristes; }),
+                        xaxis: 'x',
+                        y: groupe.map(function (d) { return duree(d.groupe); }),
+                        yaxis: 'y',
+                        type: 'scatter'
+                    };
+                });
+                var layout = axes('Nombre de touristes', 'Durée de séjour moyenne');
+                layout.template = payload.templates.plotly;
+                layout.legend = {tracegroupgap: 0, itemsizing: 'constant'};
+                layout.title = {text: 'Volume de touristes vs Durée moyenne de séjour (Top 20 pays)'};
+                // Sans pays, plotly.express ne titre pas la légende et n'ajoute pas les médianes
+                if (top.length) {
+                    var medianeT = mediane(top.map(function (d) { return d.groupe.touristes; }));
+                    var medianeD = mediane(top.map(function (d) { return duree(d.groupe); }));
+                    layout.legend.title = {text: 'Region'};
+                    layout.shapes = [
+                        {line: {color: 'gray', dash: 'dash'}, type: 'line',
+                         x0: 0, x1: 1, xref: 'x domain', y0: medianeD, y1: medianeD, yref: 'y'},
+                        {line: {color: 'gray', dash: 'dash'}, type: 'line',
+                         x0: medianeT, x1: medianeT, xref: 'x', y0: 0, y1: 1, yref: 'y domain'}
+                    ];
+                }
+                layout.height = 500;
+                return {data: data, layout: layout};
+            },
+
+            eco_evolution: function (region, payload) {
+                var mois = seriesRegion(payload.region_months, region === 'Tous' ? null : region, false);
+                var x = mois.map(function (g) { return g.cle; });
+                return {
+                    data: [
+                        {marker: {color: 'lightblue'}, name: 'Nuitées', x: x,
+                         y: mois.map(function (g) { return g.nuitees; }), yaxis: 'y', type: 'bar'},
+                        {line: {color: 'red', width: 3}, mode: 'lines+markers', name: 'Intensité économique', x: x,
+                         y: mois.map(function (g) { return g.nuitees / g.touristes; }), yaxis: 'y2', type: 'scatter'}
+                    ],
+                    layout: {
+                        template: payload.templates.plotly,
+                        title: {text: "Évolution des nuitées et de l'intensité économique"},
+                        xaxis: {title: {text: 'Mois'}},
+                        yaxis: {title: {text: 'Nuitées (milliers)'}, side: 'left'},
+                        yaxis2: {title: {text: 'Intensité (nuitées/touriste)'}, side: 'right', overlaying: 'y'},
+                        hovermode: 'x unified',
+                        height: 400
+                    }
+                };
+            },
+
+            eco_ranking_chart: function (region, critere, n, payload) {
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, null, false);
+                var lignes = classement(pays, critere, n, true);
+                return figureClassement(payload, lignes, critere, 'Viridis', 'plotly', '%{text:,.1f}', {
+                    title: {text: 'Top ' + n + ' pays - ' + critere},
+                    showlegend: false,
+                    height: 450
+                });
+            },
+
+            eco_comparison: function (selection, region, payload) {
+                if (!selection || !selection.length) {
+                    return figureVide(payload, 'Sélectionnez des pays', false);
+                }
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, null, false, selection);
+                var noms = pays.map(function (d) { return d.pays; });
+                return {
+                    data: [
+                        {marker: {color: 'lightblue'}, name: 'Touristes (milliers)', x: noms,
+                         y: pays.map(function (d) { return d.groupe.touristes; }), type: 'bar'},
+                        {marker: {color: 'lightcoral'}, name: 'Nuitées (milliers)', x: noms,
+                         y: pays.map(function (d) { return d.groupe.nuitees; }), type: 'bar'}
+                    ],
+                    layout: {
+                        template: payload.templates.plotly,
+                        barmode: 'group',
+                        title: {text: 'Comparaison : Touristes vs Nuitées'},
+                        height: 400
+                    }
+                };
+            },
+
+            eco_insights: function (region, payload) {
+                var pays = agreger(payload.rows, region === 'Tous' ? null : region, null, false)
+                    .filter(function (d) { return AGREGATIONS.indexOf(d.pays) < 0; });
+                var duree = MESURES['Durée de séjour moyenne'];
+                var haut = trier(pays, 'Intensité économique', true).slice(0, 3);
+                var seuil = mediane(pays.map(function (d) { return d.groupe.touristes; }));
+                var bas = trier(pays.filter(function (d) { return d.groupe.touristes > seuil; }),
+                                'Durée de séjour moyenne', false).slice(0, 3);
+                return [
+                    alerteInsights(' Marchés à forte intensité économique',
+                        'Ces pays génèrent le plus de nuitées par touriste :',
+                        haut.map(function (d) { return d.pays + ' : ' + fmt(d.valeur, 1) + ' nuitées/touriste'; }),
+                        '→ Priorité : fidéliser ces marchés', 'success'),
+                    bas.length ? alerteInsights(" Marchés à potentiel d'amélioration",
+                        'Ces marchés ont du volume mais une courte durée :',
+                        bas.map(function (d) { return d.pays + ' : ' + fmt(duree(d.groupe), 1) + ' jours'; }),
+                        '→ Opportunité : allonger les séjours', 'warning')
+                        : composant('Div', {children: null})
+                ];
+            }
+        }
+    });
+})();
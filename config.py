@@ -0,0 +1,46 @@
+# config.py
+import os
+
+# Source des données du dashboard :
+#   "memory" : chaque worker charge ses propres DataFrames (par défaut)
+#   "mmap"   : store de colonnes mappées en mémoire, partagé entre les workers
+DATA_BACKEND = os.environ.get("TOURISM_DATA_BACKEND", "memory")
+
+# Préchargement des datasets en arrière-plan dès le démarrage (sinon au premier accès)
+DATA_PREFETCH = os.environ.get("TOURISM_DATA_PREFETCH", "0") == "1"
+
+# Rechargement à chaud : jeton exigé par POST /_reload (sans jeton, l'appel est refusé),
+# appels locaux sans jeton autorisés (à ne pas activer derrière un reverse proxy, dont
+# toutes les requêtes arrivent de l'adresse locale) et période de vérification des
+# fichiers nettoyés en secondes (0 = désactivée)
+RELOAD_TOKEN = os.environ.get("TOURISM_RELOAD_TOKEN")
+RELOAD_ALLOW_LOCAL = os.environ.get("TOURISM_RELOAD_ALLOW_LOCAL", "0") == "1"
+RELOAD_INTERVAL = float(os.environ.get("TOURISM_RELOAD_INTERVAL", "0"))
+
+# Budget mémoire (Mo) du cache LRU des sorties de callbacks (0 = désactivé)
+MEMO_MAX_MB = float(os.environ.get("TOURISM_MEMO_MAX_MB", "64"))
+
+# Cache des réponses JSON déjà sérialisées des callbacks (Mo, 0 = désactivé) et encodeur
+# JSON des figures : "auto" (orjson s'il est installé), "orjson" ou "json"
+RESPONSE_CACHE_MAX_MB = float(os.environ.get("TOURISM_RESPONSE_CACHE_MAX_MB", "64"))
+JSON_ENGINE = os.environ.get("TOURISM_JSON_ENGINE", "auto")
+
+# Préchauffage en arrière-plan des sorties de callbacks (toutes les combinaisons de filtres
+# connues) au démarrage et après chaque rechargement, avec le nombre de threads
+WARMUP = os.environ.get("TOURISM_WARMUP", "0") == "1"
+WARMUP_WORKERS = int(os.environ.get("TOURISM_WARMUP_WORKERS", "2"))
+
+# Cache de réponses partagé entre les workers d'une machine (fichier SQLite local) :
+# chemin du fichier (désactivé si absent), taille maximale (Mo) et durée de vie (s)
+SHARED_CACHE_PATH = os.environ.get("TOURISM_SHARED_CACHE_PATH")
+SHARED_CACHE_MAX_MB = float(os.environ.get("TOURISM_SHARED_CACHE_MAX_MB", "256"))
+SHARED_CACHE_TTL = float(os.environ.get("TOURISM_SHARED_CACHE_TTL", "86400"))
+
+# Identifiant du déploiement (ex. commit git), ajouté à l'empreinte du code qui versionne
+# le cache partagé : les réponses d'un autre déploiement ne sont jamais servies
+APP_VERSION = os.environ.get("TOURISM_APP_VERSION", "")
+
+# Mode clientside : tous les callbacks des pages International et Économie (filtres,
+# indicateurs, cartes et graphiques) s'exécutent dans le navigateur à partir d'un
+# dcc.Store envoyé avec la page
+CLIENTSIDE = os.environ.get("TOURISM_CLIENTSIDE", "0") == "1"
@@ -2,11 +2,34 @@
 import dash
 from dash import dcc, html, Input, Output
 import dash_bootstrap_components as dbc
-from src.utils.load_cleaned_data import load_cleaned_data
+import config
+from src.utils.load_cleaned_data import FILES, cleaned_fingerprint, load_dataset
+from src.utils.memo import callback_memo, install_stats
+from src.utils.mmap_store import open_mmap_store
+from src.utils.registry import LazyDataRegistry
+from src.utils.response_cache import ResponseCache, configure_json_engine
+from src.utils.shared_cache import SharedCache, code_version
+from src.utils.snapshots import SnapshotHolder
+from src.utils.warmup import Warmup
 from src.layouts import home_layout, regional_layout, international_layout, economic_layout
 
-# Chargement des données
-df_dict = load_cleaned_data()
+
+def open_data():
+    """Données d'une version : chaque dataset est lu au premier accès"""
+    if config.DATA_BACKEND == "mmap":
+        # Fichiers .npy d'un dossier versionné : figés, rien à revérifier au chargement
+        store = open_mmap_store()
+        return LazyDataRegistry(store.__getitem__, store, version=store.version)
+    # Fichiers nettoyés lus au premier accès : chaque chargement vérifie la version
+    return LazyDataRegistry(load_dataset, FILES, current_version=cleaned_fingerprint)
+
+
+# Snapshots versionnés : les données peuvent être rechargées sans redémarrage
+snapshots = SnapshotHolder(open_data, cleaned_fingerprint)
+df_dict = snapshots.view()
+
+if config.DATA_PREFETCH:
+    snapshots.current().data.prefetch()
 
 # Initialisation de l'application Dash avec thème Bootstrap
 app = dash.Dash(
@@ -17,6 +40,30 @@ app = dash.Dash(
 
 # Configuration du serveur
 server = app.server
+snapshots.install(server, token=config.RELOAD_TOKEN, allow_local=config.RELOAD_ALLOW_LOCAL)
+if config.RELOAD_INTERVAL:
+    snapshots.watch(config.RELOAD_INTERVAL)
+
+# Caches des sorties de callbacks et des réponses sérialisées :
+# vidés des anciennes versions à chaque rechargement
+configure_json_engine(config.JSON_ENGINE)
+callback_memo.max_bytes = int(config.MEMO_MAX_MB * 1024 * 1024)
+shared_cache = None
+if config.SHARED_CACHE_PATH:
+    shared_cache = SharedCache(
+        config.SHARED_CACHE_PATH,
+        int(config.SHARED_CACHE_MAX_MB * 1024 * 1024),
+        config.SHARED_CACHE_TTL,
+        version=code_version(config.APP_VERSION)
+    )
+response_cache = ResponseCache(int(config.RESPONSE_CACHE_MAX_MB * 1024 * 1024), shared=shared_cache)
+response_cache.install(server, snapshots.snapshot_id)
+for cache in (callback_memo, response_cache):
+    snapshots.on_swap(lambda new, old, cache=cache: cache.drop_snapshot(old.id))
+caches = {"callbacks": callback_memo, "responses": response_cache}
+if shared_cache is not None:
+    caches["shared"] = shared_cache
+install_stats(server, caches)
 
 # Layout principal
 app.layout = dbc.Container([
@@ -54,6 +101,18 @@ app.layout = dbc.Container([
     ])
 ], fluid=True)
 
+# Pages construites une fois par version des données, reconstruites après un rechargement
+page_layouts = {
+    'accueil': snapshots.per_snapshot(lambda: home_layout.create_layout(df_dict)),
+    'regions': snapshots.per_snapshot(lambda: regional_layout.create_layout(df_dict)),
+    'international': snapshots.per_snapshot(
+        lambda: international_layout.create_layout(df_dict, clientside=config.CLIENTSIDE)
+    ),
+    'economie': snapshots.per_snapshot(
+        lambda: economic_layout.create_layout(df_dict, clientside=config.CLIENTSIDE)
+    ),
+}
+
 # Callback pour la navigation
 @app.callback(
     Output('page-content', 'children'),
@@ -61,25 +120,28 @@ app.layout = dbc.Container([
 )
 def render_content(tab):
     """Affiche le contenu selon l'onglet sélectionné"""
-    if tab == 'accueil':
-        return home_layout.create_layout(df_dict)
-    elif tab == 'regions':
-        return regional_layout.create_layout(df_dict)
-    elif tab == 'international':
-        return international_layout.create_layout(df_dict)
-    elif tab == 'economie':
-        return economic_layout.create_layout(df_dict)
-    else:
+    build_page = page_layouts.get(tab)
+    if build_page is None:
         return html.Div("Page non trouvée")
+    return build_page()
 
 # Callbacks pour les interactions (seront définis dans les layouts)
 regional_layout.register_callbacks(app, df_dict)
-international_layout.register_callbacks(app, df_dict)
-economic_layout.register_callbacks(app, df_dict)
+international_layout.register_callbacks(app, df_dict, clientside=config.CLIENTSIDE)
+economic_layout.register_callbacks(app, df_dict, clientside=config.CLIENTSIDE)
+
+# Préchauffage des caches : le premier visiteur est servi comme le centième
+if config.WARMUP:
+    Warmup(
+        snapshots,
+        [regional_layout, international_layout, economic_layout],
+        pages=page_layouts.values(),
+        workers=config.WARMUP_WORKERS
+    ).install()
 
 # Lancement de l'application
 if __name__ == '__main__':
     print(" Lancement du dashboard...")
-    print(" Données chargées avec succès")
+    print(" Données chargées à la demande")
     print(" Accédez au dashboard : http://localhost:8050")
     app.run(debug=True, host='0.0.0.0', port=8050)
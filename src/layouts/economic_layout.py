@@ -1,11 +1,26 @@
 # src/layouts/economic_layout.py
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
-def create_layout(df_dict):
+from src.utils.clientside import clientside_payload
+from src.utils.cube import region_cube
+from src.utils.memo import memoize
+from src.utils.rankings import ranking_index
+from src.utils.row_index import row_index
+
+criteres_classement = [
+    {'label': ' Nuitées totales', 'value': 'Nuitées touristiques'},
+    {'label': ' Intensité économique', 'value': 'Intensité économique'},
+    {'label': ' Durée de séjour', 'value': 'Durée de séjour moyenne'}
+]
+
+# Tailles proposées par le curseur du classement
+tailles_classement = range(5, 25, 5)
+
+def create_layout(df_dict, clientside=False):
     """
     Crée le layout de la page économique
     """
@@ -148,11 +163,7 @@ def create_layout(df_dict):
                 html.Label("Critère de classement"),
                 dcc.RadioItems(
                     id='eco-critere',
-                    options=[
-                        {'label': ' Nuitées totales', 'value': 'Nuitées touristiques'},
-                        {'label': ' Intensité économique', 'value': 'Intensité économique'},
-                        {'label': ' Durée de séjour', 'value': 'Durée de séjour moyenne'}
-                    ],
+                    options=criteres_classement,
                     value='Nuitées touristiques',
                     inline=True,
                     className='mb-3'
@@ -165,7 +176,7 @@ def create_layout(df_dict):
                     max=20,
                     step=5,
                     value=10,
-                    marks={i: str(i) for i in range(5, 25, 5)}
+                    marks={i: str(i) for i in tailles_classement}
                 )
             ], width=12, md=3),
             
@@ -210,13 +221,24 @@ def create_layout(df_dict):
         
     ], fluid=True)
     
+    # Mode clientside : données de la page envoyées une fois au navigateur
+    if clientside:
+        layout.children.append(
+            dcc.Store(id='eco-country-store', data=clientside_payload(df_dict["frequentation_hoteliere"], df_region))
+        )
+    
     return layout
 
-def register_callbacks(app, df_dict):
+def register_callbacks(app, df_dict, clientside=False):
     """
     Enregistre les callbacks pour l'interactivité
     """
     
+    # Mode clientside : filtres, KPIs et graphiques calculés dans le navigateur
+    if clientside:
+        register_clientside_callbacks(app)
+        return
+    
     @app.callback(
         [Output('eco-kpi-nuitees', 'children'),
          Output('eco-kpi-touristes', 'children'),
@@ -226,14 +248,13 @@ def register_callbacks(app, df_dict):
          Output('eco-pays-compare', 'options')],
         [Input('eco-region-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_eco_kpis_and_intensity(region_filter):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
+        df_hotel = df_dict["frequentation_hoteliere"]
         
-        # Filtrage
-        if region_filter != 'Tous':
-            df_filtered = df_hotel[df_hotel['Region'] == region_filter]
-        else:
-            df_filtered = df_hotel
+        # Filtrage : lignes de la région lues dans l'index, sans balayer la table
+        region = None if region_filter == 'Tous' else region_filter
+        df_filtered = row_index(df_dict["frequentation_hoteliere"]).select(df_hotel, region=region)
         
         # KPIs
         total_nuitees = df_filtered['Nuitées touristiques'].sum()
@@ -247,15 +268,8 @@ def register_callbacks(app, df_dict):
         kpi_intensite = f"{intensite:.1f}"
         
         # Graphique intensité PAR RÉGION (vue macro)
-        df_region = df_dict["frequentation_region"].copy()
-        if region_filter != 'Tous':
-            df_region = df_region[df_region['Region'] == region_filter]
-        
-        df_ratio = df_region.groupby('Region', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
+        regions = None if region_filter == 'Tous' else [region_filter]
+        df_ratio = region_cube(df_dict["frequentation_region"]).rollup('Region', regions=regions)
         
         df_ratio['Intensité économique'] = df_ratio['Nuitées touristiques'] / df_ratio['Nombre de touristes']
         df_ratio = df_ratio.sort_values('Intensité économique', ascending=False)
@@ -274,8 +288,9 @@ def register_callbacks(app, df_dict):
         fig_intensity.update_traces(texttemplate='%{text:.1f}', textposition='outside')
         fig_intensity.update_layout(showlegend=False, height=400)
         
-        # Options pays depuis frequentation_hoteliere
-        pays_options = [{'label': p, 'value': p} for p in sorted(df_filtered['Pays'].unique())]
+        # Options pays : ceux de l'agrégat par pays partagé avec les autres callbacks
+        df_pays = ranking_index(df_hotel).ranking(region=region).df
+        pays_options = [{'label': p, 'value': p} for p in sorted(df_pays['Pays'])]
         
         return kpi_nuitees, kpi_touristes, kpi_duree, kpi_intensite, fig_intensity, pays_options
     
@@ -283,24 +298,15 @@ def register_callbacks(app, df_dict):
         Output('eco-scatter-chart', 'figure'),
         [Input('eco-region-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_scatter(region_filter):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
-        
-        if region_filter != 'Tous':
-            df_filtered = df_hotel[df_hotel['Region'] == region_filter]
-        else:
-            df_filtered = df_hotel
-        
-        # Agrégation par pays
-        df_scatter = df_filtered.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Durée de séjour moyenne': 'mean',
-            'Nuitées touristiques': 'sum',
-            'Region': 'first'
-        })
+        region = None if region_filter == 'Tous' else region_filter
         
-        # Top 20 pour lisibilité
-        df_scatter = df_scatter.nlargest(20, 'Nombre de touristes')
+        # Agrégation par pays partagée (calculée une fois par région), top 20 pour lisibilité
+        ranking = ranking_index(df_dict["frequentation_hoteliere"]).ranking(region=region)
+        df_scatter = ranking.top('Nombre de touristes', 20)
+        # Plotly regroupe aussi les catégories absentes du top 20
+        df_scatter['Region'] = df_scatter['Region'].cat.remove_unused_categories()
         
         fig_scatter = px.scatter(
             df_scatter,
@@ -327,22 +333,14 @@ def register_callbacks(app, df_dict):
         Output('eco-evolution-chart', 'figure'),
         [Input('eco-region-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_evolution(region_filter):
-        df_region = df_dict["frequentation_region"].copy()
-        
-        if 'Mois' in df_region.columns:
-            df_region['Mois'] = pd.to_datetime(df_region['Mois'])
-        
-        if region_filter != 'Tous':
-            df_filtered = df_region[df_region['Region'] == region_filter]
-        else:
-            df_filtered = df_region
+        regions = None if region_filter == 'Tous' else [region_filter]
         
         # Agrégation mensuelle
-        df_monthly = df_filtered.groupby('Mois', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum'
-        })
+        df_monthly = region_cube(df_dict["frequentation_region"]).rollup(
+            'Mois', regions=regions, measures=['Nombre de touristes', 'Nuitées touristiques']
+        )
         
         df_monthly['Intensité'] = df_monthly['Nuitées touristiques'] / df_monthly['Nombre de touristes']
         
@@ -383,27 +381,13 @@ def register_callbacks(app, df_dict):
          Input('eco-critere', 'value'),
          Input('eco-top-n', 'value')]
     )
+    @memoize(df_dict)
     def update_ranking(region_filter, critere, top_n):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
+        region = None if region_filter == 'Tous' else region_filter
         
-        if region_filter != 'Tous':
-            df_filtered = df_hotel[df_hotel['Region'] == region_filter]
-        else:
-            df_filtered = df_hotel
-        
-        # Agrégation par pays
-        df_classement = df_filtered.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        df_classement['Intensité économique'] = (
-            df_classement['Nuitées touristiques'] / df_classement['Nombre de touristes']
-        )
-        
-        df_top = df_classement.nlargest(top_n, critere)
-        df_top = df_top.sort_values(critere, ascending=True)
+        # Classement par pays précalculé : le top N est une tranche, affiché du N-ième au premier
+        ranking = ranking_index(df_dict["frequentation_hoteliere"]).ranking(region=region)
+        df_top = ranking.top(critere, top_n).iloc[::-1]
         
         fig = px.bar(
             df_top,
@@ -426,20 +410,19 @@ def register_callbacks(app, df_dict):
         [Input('eco-pays-compare', 'value'),
          Input('eco-region-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_comparison(pays_selected, region_filter):
         if not pays_selected:
             return go.Figure().add_annotation(text="Sélectionnez des pays", showarrow=False)
         
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
+        df_hotel = df_dict["frequentation_hoteliere"]
         
-        if region_filter != 'Tous':
-            df_filtered = df_hotel[df_hotel['Region'] == region_filter]
-        else:
-            df_filtered = df_hotel
+        region = None if region_filter == 'Tous' else region_filter
+        df_filtered = row_index(df_dict["frequentation_hoteliere"]).select(df_hotel, region=region)
         
         df_compare = df_filtered[df_filtered['Pays'].isin(pays_selected)]
         
-        df_compare_agg = df_compare.groupby('Pays', as_index=False).agg({
+        df_compare_agg = df_compare.groupby('Pays', as_index=False, observed=True).agg({
             'Nombre de touristes': 'sum',
             'Nuitées touristiques': 'sum'
         })
@@ -473,29 +456,16 @@ def register_callbacks(app, df_dict):
          Output('eco-insights-low', 'children')],
         [Input('eco-region-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_insights(region_filter):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
+        region = None if region_filter == 'Tous' else region_filter
         
-        if region_filter != 'Tous':
-            df_filtered = df_hotel[df_hotel['Region'] == region_filter]
-        else:
-            df_filtered = df_hotel
-        
-        # Filtrer les agrégations régionales
+        # Agrégation par pays partagée, sans les agrégations régionales
+        df_pays = ranking_index(df_dict["frequentation_hoteliere"]).ranking(region=region).df
         agregations = ['Autre Asie', 'Autre Amérique du Sud', 'Autre Amérique Centrale', 
                       'Europe (hors France)', 'Asie', 'Pacifique', 'Afrique', 
                       'Amérique du Sud', 'Amérique Centrale', 'Autres Pays']
-        df_filtered = df_filtered[~df_filtered['Pays'].isin(agregations)]
-        
-        df_classement = df_filtered.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        df_classement['Intensité économique'] = (
-            df_classement['Nuitées touristiques'] / df_classement['Nombre de touristes']
-        )
+        df_classement = df_pays[~df_pays['Pays'].isin(agregations)]
         
         # Top intensité
         df_top_intensite = df_classement.nlargest(3, 'Intensité économique')
@@ -528,4 +498,77 @@ def register_callbacks(app, df_dict):
         else:
             insight_low = html.Div()
         
-        return insight_high, insight_low
\ No newline at end of file
+        return insight_high, insight_low
+
+def register_clientside_callbacks(app):
+    """Callbacks de la page exécutés dans le navigateur (assets/clientside.js), sans requête serveur"""
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_kpis_and_intensity'),
+        [Output('eco-kpi-nuitees', 'children'),
+         Output('eco-kpi-touristes', 'children'),
+         Output('eco-kpi-duree', 'children'),
+         Output('eco-kpi-intensite', 'children'),
+         Output('eco-intensity-chart', 'figure'),
+         Output('eco-pays-compare', 'options')],
+        [Input('eco-region-filter', 'value')],
+        State('eco-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_scatter'),
+        Output('eco-scatter-chart', 'figure'),
+        [Input('eco-region-filter', 'value')],
+        State('eco-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_evolution'),
+        Output('eco-evolution-chart', 'figure'),
+        [Input('eco-region-filter', 'value')],
+        State('eco-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_ranking_chart'),
+        Output('eco-ranking-chart', 'figure'),
+        [Input('eco-region-filter', 'value'),
+         Input('eco-critere', 'value'),
+         Input('eco-top-n', 'value')],
+        State('eco-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_comparison'),
+        Output('eco-compare-chart', 'figure'),
+        [Input('eco-pays-compare', 'value'),
+         Input('eco-region-filter', 'value')],
+        State('eco-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='eco_insights'),
+        [Output('eco-insights-high', 'children'),
+         Output('eco-insights-low', 'children')],
+        [Input('eco-region-filter', 'value')],
+        State('eco-country-store', 'data')
+    )
+
+def warmup_calls(df_dict):
+    """Entrées des callbacks à précalculer : chaque région, chaque critère et taille du classement"""
+    df_region = df_dict["frequentation_region"]
+    regions_dispo = ['Tous'] + sorted(df_region['Region'].unique().tolist())
+    
+    calls = []
+    for region in regions_dispo:
+        calls += [
+            ('update_eco_kpis_and_intensity', (region,)),
+            ('update_scatter', (region,)),
+            ('update_evolution', (region,)),
+            ('update_insights', (region,))
+        ]
+        calls += [
+            ('update_ranking', (region, critere['value'], top_n))
+            for critere in criteres_classement
+            for top_n in tailles_classement
+        ]
+    return calls
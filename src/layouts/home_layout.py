@@ -5,23 +5,24 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
+from src.utils.cube import region_cube
+
 def create_layout(df_dict):
     """Page d'accueil avec vue d'ensemble du tourisme international en France"""
     
-    df_region = df_dict["frequentation_region"].copy()
-    
-    if 'Mois' in df_region.columns:
-        df_region['Mois'] = pd.to_datetime(df_region['Mois'], errors='coerce')
+    df_region = df_dict["frequentation_region"]
+    cube = region_cube(df_region)
     
-    total_touristes = df_region['Nombre de touristes'].sum()
-    total_nuitees = df_region['Nuitées touristiques'].sum()
-    duree_moyenne = df_region['Durée de séjour moyenne'].mean()
-    nb_pays = df_region['Pays'].nunique()
-    nb_regions = df_region['Region'].nunique()
+    totals = cube.totals()
+    total_touristes = totals['Nombre de touristes']
+    total_nuitees = totals['Nuitées touristiques']
+    duree_moyenne = totals['Durée de séjour moyenne']
+    nb_pays = len(cube.members('Pays'))
+    nb_regions = len(cube.members('Region'))
     
-    df_region_agg = df_region.groupby('Region', as_index=False).agg({
-        'Nombre de touristes': 'sum'
-    }).sort_values('Nombre de touristes', ascending=False)
+    df_region_agg = cube.rollup('Region', measures=['Nombre de touristes']).sort_values(
+        'Nombre de touristes', ascending=False
+    )
     
     fig_regions = px.bar(
         df_region_agg,
@@ -42,9 +43,7 @@ def create_layout(df_dict):
         template="plotly_white"
     )
     
-    df_pays = df_region.groupby('Pays', as_index=False).agg({
-        'Nombre de touristes': 'sum'
-    })
+    df_pays = cube.rollup('Pays', measures=['Nombre de touristes'])
     df_top10 = df_pays.nlargest(10, 'Nombre de touristes')
     
     fig_top10 = px.bar(
@@ -68,9 +67,7 @@ def create_layout(df_dict):
     
     fig_evolution = None
     if 'Mois' in df_region.columns:
-        df_monthly = df_region.groupby('Mois', as_index=False).agg({
-            'Nombre de touristes': 'sum'
-        })
+        df_monthly = cube.rollup('Mois', measures=['Nombre de touristes'])
         
         fig_evolution = go.Figure()
         fig_evolution.add_trace(go.Scatter(
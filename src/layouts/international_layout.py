@@ -1,42 +1,26 @@
 # src/layouts/international_layout.py
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
-iso3_mapping = {
-    'Canada': 'CAN', 'États-Unis': 'USA', 'États-Unis (y compris Hawaii)': 'USA',
-    'Hawaii': 'USA', 'USA': 'USA',
-    'Mexique': 'MEX', 'Brésil': 'BRA', 'Argentine': 'ARG', 'Chili': 'CHL',
-    'Colombie': 'COL', 'Pérou': 'PER', 'Venezuela': 'VEN', 'Uruguay': 'URY',
-    'Royaume-Uni': 'GBR', 'Allemagne': 'DEU', 'Italie': 'ITA', 'Espagne': 'ESP',
-    'France': 'FRA', 'Belgique': 'BEL', 'Pays-Bas': 'NLD', 'Suisse': 'CHE',
-    'Autriche': 'AUT', 'Portugal': 'PRT', 'Grèce': 'GRC', 'Pologne': 'POL',
-    'Suède': 'SWE', 'Norvège': 'NOR', 'Danemark': 'DNK', 'Finlande': 'FIN',
-    'Irlande': 'IRL', 'Islande': 'ISL', 'Luxembourg': 'LUX', 'Hongrie': 'HUN',
-    'République tchèque': 'CZE', 'Roumanie': 'ROU', 'Bulgarie': 'BGR',
-    'Croatie': 'HRV', 'Slovénie': 'SVN', 'Slovaquie': 'SVK', 'Estonie': 'EST',
-    'Lettonie': 'LVA', 'Lituanie': 'LTU', 'Serbie': 'SRB', 'Ukraine': 'UKR',
-    'Chine': 'CHN', 'Japon': 'JPN', 'Corée du Sud': 'KOR', 'Inde': 'IND',
-    'Thaïlande': 'THA', 'Vietnam': 'VNM', 'Singapour': 'SGP', 'Malaisie': 'MYS',
-    'Indonésie': 'IDN', 'Philippines': 'PHL', 'Hong Kong': 'HKG', 'Taïwan': 'TWN',
-    'Australie': 'AUS', 'Nouvelle-Zélande': 'NZL', 'Papouasie-Nouvelle-Guinée': 'PNG',
-    'Afrique du Sud': 'ZAF', 'Égypte': 'EGY', 'Maroc': 'MAR', 'Tunisie': 'TUN',
-    'Algérie': 'DZA', 'Kenya': 'KEN', 'Nigeria': 'NGA', 'Éthiopie': 'ETH',
-    'Russie': 'RUS', 'Turquie': 'TUR', 'Arabie Saoudite': 'SAU', 'Israël': 'ISR',
-    'Émirats Arabes Unis': 'ARE', 'Qatar': 'QAT', 'Koweït': 'KWT', 'Liban': 'LBN',
-    'Jordanie': 'JOR', 'Oman': 'OMN', 'Bahreïn': 'BHR', 'Pakistan': 'PAK',
-    'Bangladesh': 'BGD', 'Sri Lanka': 'LKA', 'Népal': 'NPL', 'Afghanistan': 'AFG',
-    'Iran': 'IRN', 'Irak': 'IRQ', 'Syrie': 'SYR', 'Yémen': 'YEM'
-}
+from src.utils.binning import histograms
+from src.utils.clientside import clientside_payload
+from src.utils.countries import country_table
+from src.utils.memo import memoize
+from src.utils.rankings import ranking_index
+from src.utils.row_index import row_index
 
-def create_layout(df_dict):
-    df_hotel = df_dict["frequentation_hoteliere"].copy()
-    
-    if 'Année' in df_hotel.columns:
-        df_hotel['Année'] = pd.to_numeric(df_hotel['Année'], errors='coerce')
+metriques = [
+    {'label': 'Touristes', 'value': 'Nombre de touristes'},
+    {'label': 'Nuitées', 'value': 'Nuitées touristiques'},
+    {'label': 'Durée séjour', 'value': 'Durée de séjour moyenne'}
+]
+
+def create_layout(df_dict, clientside=False):
+    df_hotel = df_dict["frequentation_hoteliere"]
     
     regions_dispo = ['Tous'] + sorted(df_hotel['Region'].unique().tolist())
     
@@ -78,11 +62,7 @@ def create_layout(df_dict):
                         html.Label("Métrique à analyser", className="fw-bold mb-2"),
                         dcc.Dropdown(
                             id='intl-metric',
-                            options=[
-                                {'label': 'Touristes', 'value': 'Nombre de touristes'},
-                                {'label': 'Nuitées', 'value': 'Nuitées touristiques'},
-                                {'label': 'Durée séjour', 'value': 'Durée de séjour moyenne'}
-                            ],
+                            options=metriques,
                             value='Nombre de touristes',
                             clearable=False
                         )
@@ -220,24 +200,20 @@ def create_layout(df_dict):
         
     ], fluid=True)
     
-    return layout
-
-def filter_individual_countries(df):
-    """Filtre pour garder uniquement les pays individuels"""
-    if 'ISO3' in df.columns:
-        df['ISO3_clean'] = df['ISO3'].fillna('').str.strip()
-        df['ISO3_mapped'] = df.apply(
-            lambda row: row['ISO3_clean'] if row['ISO3_clean'] != '' 
-            else iso3_mapping.get(row['Pays'], None), 
-            axis=1
+    # Mode clientside : données de la page envoyées une fois au navigateur
+    if clientside:
+        layout.children.append(
+            dcc.Store(id='intl-country-store', data=clientside_payload(df_hotel))
         )
-    else:
-        df['ISO3_mapped'] = df['Pays'].map(iso3_mapping)
     
-    df_filtered = df[df['ISO3_mapped'].notna()].copy()
-    return df_filtered
+    return layout
 
-def register_callbacks(app, df_dict):
+def register_callbacks(app, df_dict, clientside=False):
+    
+    # Mode clientside : filtres, KPIs et graphiques calculés dans le navigateur
+    if clientside:
+        register_clientside_callbacks(app)
+        return
     
     @app.callback(
         [Output('intl-world-map', 'figure'),
@@ -254,31 +230,29 @@ def register_callbacks(app, df_dict):
          Input('intl-year-filter', 'value'),
          Input('intl-metric', 'value')]
     )
+    @memoize(df_dict)
     def update_intl_map_and_kpis(region_filter, year_filter, metric):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
-        
-        if 'Année' in df_hotel.columns:
-            df_hotel['Année'] = pd.to_numeric(df_hotel['Année'], errors='coerce')
-        
-        df_filtered = df_hotel.copy()
-        
-        if region_filter != 'Tous':
-            df_filtered = df_filtered[df_filtered['Region'] == region_filter]
+        df_hotel = df_dict["frequentation_hoteliere"]
         
-        if year_filter and 'Année' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['Année'] == year_filter]
+        # Lignes de la région et de l'année lues dans l'index, sans balayer la table
+        df_filtered = row_index(df_dict["frequentation_hoteliere"]).select(
+            df_hotel,
+            region=None if region_filter == 'Tous' else region_filter,
+            year=year_filter or None
+        )
         
-        df_pays_only = filter_individual_countries(df_filtered)
+        # Pays individuels (hors agrégats régionaux) et codes ISO3 lus dans la table des pays
+        countries = country_table(df_dict["frequentation_hoteliere"])
+        df_pays_only = countries.individual_rows(df_filtered)
         
-        df_pays = df_pays_only.groupby('Pays', as_index=False).agg({
+        df_pays = df_pays_only.groupby('Pays', as_index=False, observed=True).agg({
             'Nombre de touristes': 'sum',
             'Nuitées touristiques': 'sum',
             'Durée de séjour moyenne': 'mean',
-            'Region': 'first',
-            'ISO3_mapped': 'first'
+            'Region': 'first'
         })
         
-        df_pays.rename(columns={'ISO3_mapped': 'ISO3'}, inplace=True)
+        df_pays['ISO3'] = countries.iso3(df_pays['Pays'])
         
         # Calcul intensité économique
         df_pays['Intensité économique'] = df_pays['Nuitées touristiques'] / df_pays['Nombre de touristes']
@@ -326,7 +300,8 @@ def register_callbacks(app, df_dict):
             className="mb-0"
         )
         
-        df_pays_sorted = df_pays.sort_values('Nombre de touristes', ascending=False)
+        # Tri stable : à égalité, les pays gardent leur ordre (comme en mode clientside)
+        df_pays_sorted = df_pays.sort_values('Nombre de touristes', ascending=False, kind='stable')
         
         table_pays = dbc.Table([
             html.Thead([
@@ -353,18 +328,25 @@ def register_callbacks(app, df_dict):
             ])
         ], bordered=True, hover=True, responsive=True, striped=True, size="sm")
         
-        # HISTOGRAMME 1 : Distribution de l'intensité économique
-        bins_intensite = [0, 10, 15, 20, 25, 30, 35, 100]
-        labels_intensite = ['0-10', '10-15', '15-20', '20-25', '25-30', '30-35', '35+']
-        
-        df_pays['Intervalle_Intensite'] = pd.cut(
-            df_pays['Intensité économique'],
-            bins=bins_intensite,
-            labels=labels_intensite,
-            include_lowest=True
-        )
+        # HISTOGRAMMES : intensité et nuitées par pays, en une passe sur les agrégats ;
+        # le dernier intervalle est ouvert pour ne perdre aucun pays
+        hists = histograms(df_pays, {
+            'Intensité économique': {
+                'edges': [0, 10, 15, 20, 25, 30, 35, 100],
+                'labels': ['0-10', '10-15', '15-20', '20-25', '25-30', '30-35', '35+'],
+                'open_ended': True,
+                'column': 'Intervalle_Intensite'
+            },
+            'Nuitées touristiques': {
+                'edges': [0, 10000, 50000, 100000, 500000, 1000000, 3000000],
+                'labels': ['0-10k', '10-50k', '50-100k', '100-500k', '500k-1M', '1M+'],
+                'open_ended': True,
+                'column': 'Intervalle_Nuitees'
+            }
+        })
         
-        hist_intensite = df_pays.groupby('Intervalle_Intensite', observed=True).size().reset_index(name='Nombre de pays')
+        # HISTOGRAMME 1 : Distribution de l'intensité économique
+        hist_intensite = hists['Intensité économique']
         
         fig_hist_intensite = px.bar(
             hist_intensite,
@@ -385,17 +367,7 @@ def register_callbacks(app, df_dict):
         )
         
         # HISTOGRAMME 2 : Distribution des nuitées totales
-        bins_nuitees = [0, 10000, 50000, 100000, 500000, 1000000, 3000000]
-        labels_nuitees = ['0-10k', '10-50k', '50-100k', '100-500k', '500k-1M', '1M+']
-        
-        df_pays['Intervalle_Nuitees'] = pd.cut(
-            df_pays['Nuitées touristiques'],
-            bins=bins_nuitees,
-            labels=labels_nuitees,
-            include_lowest=True
-        )
-        
-        hist_nuitees = df_pays.groupby('Intervalle_Nuitees', observed=True).size().reset_index(name='Nombre de pays')
+        hist_nuitees = hists['Nuitées touristiques']
         
         fig_hist_nuitees = px.bar(
             hist_nuitees,
@@ -430,30 +402,15 @@ def register_callbacks(app, df_dict):
          Input('intl-top-n', 'value'),
          Input('intl-order', 'value')]
     )
+    @memoize(df_dict)
     def update_top_chart(region_filter, year_filter, metric, top_n, order):
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
-        
-        if 'Année' in df_hotel.columns:
-            df_hotel['Année'] = pd.to_numeric(df_hotel['Année'], errors='coerce')
-        
-        df_filtered = df_hotel.copy()
-        if region_filter != 'Tous':
-            df_filtered = df_filtered[df_filtered['Region'] == region_filter]
-        if year_filter and 'Année' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['Année'] == year_filter]
-        
-        df_pays_only = filter_individual_countries(df_filtered)
-        
-        df_pays = df_pays_only.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        if order == 'desc':
-            df_top = df_pays.nlargest(top_n, metric).sort_values(metric, ascending=True)
-        else:
-            df_top = df_pays.nsmallest(top_n, metric).sort_values(metric, ascending=False)
+        # Classement des pays individuels précalculé : top N croissant ou décroissant par tranche
+        ranking = ranking_index(df_dict["frequentation_hoteliere"]).ranking(
+            region=None if region_filter == 'Tous' else region_filter,
+            year=year_filter or None,
+            individual=True
+        )
+        df_top = ranking.top(metric, top_n, largest=(order == 'desc')).iloc[::-1]
         
         fig = px.bar(
             df_top,
@@ -492,6 +449,7 @@ def register_callbacks(app, df_dict):
          Input('intl-region-filter', 'value'),
          Input('intl-year-filter', 'value')]
     )
+    @memoize(df_dict)
     def update_comparison(pays_selected, region_filter, year_filter):
         if not pays_selected:
             empty_fig = go.Figure().add_annotation(
@@ -501,21 +459,18 @@ def register_callbacks(app, df_dict):
             )
             return empty_fig, empty_fig
         
-        df_hotel = df_dict["frequentation_hoteliere"].copy()
-        
-        if 'Année' in df_hotel.columns:
-            df_hotel['Année'] = pd.to_numeric(df_hotel['Année'], errors='coerce')
+        df_hotel = df_dict["frequentation_hoteliere"]
         
-        df_filtered = df_hotel.copy()
-        if region_filter != 'Tous':
-            df_filtered = df_filtered[df_filtered['Region'] == region_filter]
-        if year_filter and 'Année' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['Année'] == year_filter]
+        df_filtered = row_index(df_dict["frequentation_hoteliere"]).select(
+            df_hotel,
+            region=None if region_filter == 'Tous' else region_filter,
+            year=year_filter or None
+        )
         
-        df_pays_only = filter_individual_countries(df_filtered)
+        df_pays_only = country_table(df_dict["frequentation_hoteliere"]).individual_rows(df_filtered)
         df_compare = df_pays_only[df_pays_only['Pays'].isin(pays_selected)]
         
-        df_compare_agg = df_compare.groupby('Pays', as_index=False).agg({
+        df_compare_agg = df_compare.groupby('Pays', as_index=False, observed=True).agg({
             'Nombre de touristes': 'sum',
             'Nuitées touristiques': 'sum',
             'Durée de séjour moyenne': 'mean'
@@ -579,4 +534,59 @@ def register_callbacks(app, df_dict):
             legend=dict(orientation="h", yanchor="bottom", y=-0.2)
         )
         
-        return fig_radar, fig_compare
\ No newline at end of file
+        return fig_radar, fig_compare
+
+def register_clientside_callbacks(app):
+    """Callbacks de la page exécutés dans le navigateur (assets/clientside.js), sans requête serveur"""
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='intl_map_and_kpis'),
+        [Output('intl-world-map', 'figure'),
+         Output('intl-pays-compare', 'options'),
+         Output('intl-pays-manquants', 'children'),
+         Output('intl-table-pays', 'children'),
+         Output('intl-histogram-intensite', 'figure'),
+         Output('intl-histogram-nuitees', 'figure'),
+         Output('intl-kpi-nb-pays', 'children'),
+         Output('intl-kpi-total', 'children'),
+         Output('intl-kpi-top', 'children'),
+         Output('intl-kpi-duree', 'children')],
+        [Input('intl-region-filter', 'value'),
+         Input('intl-year-filter', 'value'),
+         Input('intl-metric', 'value')],
+        State('intl-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='intl_top_chart'),
+        Output('intl-top-chart', 'figure'),
+        [Input('intl-region-filter', 'value'),
+         Input('intl-year-filter', 'value'),
+         Input('intl-metric', 'value'),
+         Input('intl-top-n', 'value'),
+         Input('intl-order', 'value')],
+        State('intl-country-store', 'data')
+    )
+    
+    app.clientside_callback(
+        ClientsideFunction(namespace='tourism', function_name='intl_comparison'),
+        [Output('intl-radar-chart', 'figure'),
+         Output('intl-compare-chart', 'figure')],
+        [Input('intl-pays-compare', 'value'),
+         Input('intl-region-filter', 'value'),
+         Input('intl-year-filter', 'value')],
+        State('intl-country-store', 'data')
+    )
+
+def warmup_calls(df_dict):
+    """Entrées des callbacks à précalculer : chaque région × année × métrique (classement par défaut)"""
+    df_hotel = df_dict["frequentation_hoteliere"]
+    regions_dispo = ['Tous'] + sorted(df_hotel['Region'].unique().tolist())
+    annees = sorted(df_hotel['Année'].dropna().unique().astype(int).tolist())
+    
+    calls = []
+    for region in regions_dispo:
+        for annee in annees:
+            for metrique in metriques:
+                calls.append(('update_intl_map_and_kpis', (region, annee, metrique['value'])))
+                calls.append(('update_top_chart', (region, annee, metrique['value'], 20, 'desc')))
+    return calls
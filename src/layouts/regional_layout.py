@@ -1,35 +1,24 @@
 # src/layouts/regional_layout.py
-from dash import dcc, html, Input, Output
+from dash import dcc, html, Input, Output, State, no_update
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
-iso3_mapping = {
-    'Canada': 'CAN', 'États-Unis': 'USA', 'États-Unis (y compris Hawaii)': 'USA',
-    'Mexique': 'MEX', 'Brésil': 'BRA', 'Argentine': 'ARG', 'Chili': 'CHL',
-    'Colombie': 'COL', 'Pérou': 'PER', 'Venezuela': 'VEN', 'Uruguay': 'URY',
-    'Royaume-Uni': 'GBR', 'Allemagne': 'DEU', 'Italie': 'ITA', 'Espagne': 'ESP',
-    'France': 'FRA', 'Belgique': 'BEL', 'Pays-Bas': 'NLD', 'Suisse': 'CHE',
-    'Autriche': 'AUT', 'Portugal': 'PRT', 'Grèce': 'GRC', 'Pologne': 'POL',
-    'Suède': 'SWE', 'Norvège': 'NOR', 'Danemark': 'DNK', 'Finlande': 'FIN',
-    'Irlande': 'IRL', 'Islande': 'ISL', 'Luxembourg': 'LUX', 'Hongrie': 'HUN',
-    'République tchèque': 'CZE', 'Roumanie': 'ROU', 'Bulgarie': 'BGR',
-    'Croatie': 'HRV', 'Slovénie': 'SVN', 'Slovaquie': 'SVK', 'Estonie': 'EST',
-    'Lettonie': 'LVA', 'Lituanie': 'LTU', 'Serbie': 'SRB', 'Ukraine': 'UKR',
-    'Chine': 'CHN', 'Japon': 'JPN', 'Corée du Sud': 'KOR', 'Inde': 'IND',
-    'Thaïlande': 'THA', 'Vietnam': 'VNM', 'Singapour': 'SGP', 'Malaisie': 'MYS',
-    'Indonésie': 'IDN', 'Philippines': 'PHL', 'Hong Kong': 'HKG', 'Taïwan': 'TWN',
-    'Australie': 'AUS', 'Nouvelle-Zélande': 'NZL', 'Papouasie-Nouvelle-Guinée': 'PNG',
-    'Afrique du Sud': 'ZAF', 'Égypte': 'EGY', 'Maroc': 'MAR', 'Tunisie': 'TUN',
-    'Algérie': 'DZA', 'Kenya': 'KEN', 'Nigeria': 'NGA', 'Éthiopie': 'ETH',
-    'Russie': 'RUS', 'Turquie': 'TUR', 'Arabie Saoudite': 'SAU', 'Israël': 'ISR',
-    'Émirats Arabes Unis': 'ARE', 'Qatar': 'QAT', 'Koweït': 'KWT', 'Liban': 'LBN',
-    'Jordanie': 'JOR', 'Oman': 'OMN', 'Bahreïn': 'BHR', 'Pakistan': 'PAK',
-    'Bangladesh': 'BGD', 'Sri Lanka': 'LKA', 'Népal': 'NPL', 'Afghanistan': 'AFG',
-    'Iran': 'IRN', 'Irak': 'IRQ', 'Syrie': 'SYR', 'Yémen': 'YEM'
-}
+from src.utils.binning import histograms
+from src.utils.countries import country_table
+from src.utils.cube import region_cube
+from src.utils.memo import memoize
+from src.utils.patches import values_patch
+from src.utils.time_axis import month_index, month_ordinal
+
+indicateurs = [
+    {'label': ' Nombre de touristes', 'value': 'Nombre de touristes'},
+    {'label': ' Nuitées touristiques', 'value': 'Nuitées touristiques'},
+    {'label': ' Durée de séjour moyenne', 'value': 'Durée de séjour moyenne'}
+]
 
 coords_regions = {
     'Europe': {'lat': 50, 'lon': 10},
@@ -46,11 +35,7 @@ coords_regions = {
 def create_layout(df_dict):
     """Analyse géographique avec cartes interactives des flux touristiques"""
     
-    df = df_dict["frequentation_region"].copy()
-    df['Mois'] = pd.to_datetime(df['Mois'], errors='coerce')
-    
-    dates = sorted(df['Mois'].dt.to_period('M').unique())
-    dates_str = [str(d) for d in dates]
+    dates_str = month_index(df_dict["frequentation_region"]).labels
     
     return dbc.Container(fluid=True, children=[
         html.H2("Analyse Géographique du Tourisme", className="text-center mb-3"),
@@ -79,11 +64,7 @@ def create_layout(df_dict):
             html.Label("Indicateur à visualiser", className="fw-bold mb-2"),
             dcc.RadioItems(
                 id='regional-indicator',
-                options=[
-                    {'label': ' Nombre de touristes', 'value': 'Nombre de touristes'},
-                    {'label': ' Nuitées touristiques', 'value': 'Nuitées touristiques'},
-                    {'label': ' Durée de séjour moyenne', 'value': 'Durée de séjour moyenne'}
-                ],
+                options=indicateurs,
                 value='Nombre de touristes',
                 labelStyle={'display': 'block', 'marginBottom': '8px'}
             )
@@ -174,9 +155,213 @@ def create_layout(df_dict):
             ]), className="text-center"), md=3),
         ]),
         
-        dcc.Store(id='regional-dates-store', data=dates_str)
+        dcc.Store(id='regional-dates-store', data=dates_str),
+        # Ce qu'affiche le navigateur (période, indicateur) : base des mises à jour partielles
+        dcc.Store(id='regional-render-store')
     ])
 
+def _indicator_figures(cube, countries, period, indicator):
+    """Carte des pays, carte des régions et top 10 : les sorties qui dépendent de l'indicateur"""
+    df_pays = cube.rollup('Pays', months=period, measures=[indicator])
+    df_pays['ISO3'] = countries.iso3(df_pays['Pays'])
+    df_pays_valides = df_pays.dropna(subset=['ISO3'])
+    
+    nb_pays_total = len(df_pays)
+    nb_pays_affiches = len(df_pays_valides)
+    
+    if not df_pays_valides.empty:
+        fig_world = px.choropleth(
+            df_pays_valides,
+            locations='ISO3',
+            color=indicator,
+            hover_name='Pays',
+            hover_data={indicator: ':,.0f'},
+            color_continuous_scale='Blues',
+            title=f"{indicator} par pays ({nb_pays_affiches}/{nb_pays_total} pays affichés)"
+        )
+        fig_world.update_layout(
+            geo=dict(
+                showframe=True,
+                showcoastlines=True,
+                projection_type='natural earth'
+            ),
+            height=420,
+            margin=dict(l=0, r=0, t=30, b=0),
+            template="plotly_white"
+        )
+    else:
+        fig_world = go.Figure().add_annotation(
+            text="Aucune donnée avec code pays disponible",
+            showarrow=False,
+            font=dict(size=14)
+        )
+    
+    df_reg = cube.rollup('Region', months=period, measures=[indicator])
+    df_reg['lat'] = df_reg['Region'].map(lambda x: coords_regions.get(x, {}).get('lat'))
+    df_reg['lon'] = df_reg['Region'].map(lambda x: coords_regions.get(x, {}).get('lon'))
+    df_reg_valides = df_reg.dropna(subset=['lat'])
+    
+    if not df_reg_valides.empty:
+        fig_scatter = px.scatter_geo(
+            df_reg_valides,
+            lat='lat',
+            lon='lon',
+            size=indicator if indicator != 'Durée de séjour moyenne' else None,
+            color=indicator,
+            hover_name='Region',
+            hover_data={
+                'lat': False,
+                'lon': False,
+                indicator: ':,.1f'
+            },
+            size_max=50,
+            color_continuous_scale='Oranges',
+            title=f"Répartition géographique par région"
+        )
+        fig_scatter.update_layout(
+            geo=dict(
+                projection_type='natural earth',
+                showland=True,
+                landcolor='rgb(243, 243, 243)',
+                coastlinecolor='rgb(204, 204, 204)',
+                showocean=True,
+                oceancolor='rgb(230, 245, 255)'
+            ),
+            height=420,
+            margin=dict(l=0, r=0, t=30, b=0),
+            template="plotly_white"
+        )
+    else:
+        fig_scatter = go.Figure().add_annotation(
+            text="Aucune donnée régionale disponible",
+            showarrow=False,
+            font=dict(size=14)
+        )
+    
+    top = df_reg.nlargest(10, indicator).sort_values(indicator, ascending=True)
+    
+    fig_top = px.bar(
+        top,
+        x=indicator,
+        y='Region',
+        orientation='h',
+        color=indicator,
+        color_continuous_scale='Greens',
+        text=indicator
+    )
+    fig_top.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
+    fig_top.update_layout(
+        showlegend=False,
+        height=320,
+        margin=dict(l=0, r=100, t=0, b=30),
+        xaxis_title="",
+        yaxis_title="",
+        yaxis={'fixedrange': True},
+        xaxis={'fixedrange': True},
+        template="plotly_white"
+    )
+    
+    return fig_world, fig_scatter, fig_top, not df_pays_valides.empty, not df_reg_valides.empty
+
+def _period_outputs(cube, period):
+    """Durées par région, histogrammes, liste des régions et KPIs : les sorties qui ne dépendent que de la période"""
+    totals = cube.totals(months=period)
+    
+    df_duree = cube.rollup('Region', months=period, measures=['Durée de séjour moyenne', 'Nombre de touristes'])
+    df_duree_top = df_duree.nlargest(10, 'Nombre de touristes').sort_values('Durée de séjour moyenne', ascending=True)
+    
+    fig_duree = px.bar(
+        df_duree_top,
+        x='Durée de séjour moyenne',
+        y='Region',
+        orientation='h',
+        color='Durée de séjour moyenne',
+        color_continuous_scale='Purples',
+        text='Durée de séjour moyenne'
+    )
+    fig_duree.update_traces(texttemplate='%{text:.1f}j', textposition='outside')
+    fig_duree.update_layout(
+        showlegend=False,
+        height=320,
+        margin=dict(l=0, r=100, t=0, b=30),
+        xaxis_title="Jours",
+        yaxis_title="",
+        yaxis={'fixedrange': True},
+        xaxis={'fixedrange': True},
+        template="plotly_white"
+    )
+    
+    # HISTOGRAMMES : durées de séjour et volumes par pays, en une passe sur les agrégats
+    df_pays_hist = cube.rollup('Pays', months=period, measures=['Durée de séjour moyenne', 'Nombre de touristes'])
+    
+    # Intervalles (bins) ; le dernier est ouvert pour ne perdre aucun pays
+    hists = histograms(df_pays_hist, {
+        'Durée de séjour moyenne': {
+            'edges': [0, 5, 10, 15, 20, 25, 30, 100],
+            'labels': ['0-5j', '5-10j', '10-15j', '15-20j', '20-25j', '25-30j', '30+j'],
+            'open_ended': True
+        },
+        'Nombre de touristes': {
+            # En milliers
+            'edges': [0, 1000, 5000, 10000, 20000, 50000, 200000],
+            'labels': ['0-1M', '1-5M', '5-10M', '10-20M', '20-50M', '50M+'],
+            'open_ended': True
+        }
+    })
+    
+    # HISTOGRAMME 1 : Distribution des durées de séjour
+    hist_duree = hists['Durée de séjour moyenne']
+    
+    fig_hist_duree = px.bar(
+        hist_duree,
+        x='Intervalle',
+        y='Nombre de pays',
+        color='Nombre de pays',
+        color_continuous_scale='Blues',
+        text='Nombre de pays'
+    )
+    fig_hist_duree.update_traces(textposition='outside')
+    fig_hist_duree.update_layout(
+        showlegend=False,
+        height=320,
+        margin=dict(l=50, r=20, t=20, b=50),
+        xaxis_title="Durée de séjour (jours)",
+        yaxis_title="Nombre de pays",
+        template="plotly_white"
+    )
+    
+    # HISTOGRAMME 2 : Distribution du volume de touristes
+    hist_volume = hists['Nombre de touristes']
+    
+    fig_hist_volume = px.bar(
+        hist_volume,
+        x='Intervalle',
+        y='Nombre de pays',
+        color='Nombre de pays',
+        color_continuous_scale='Greens',
+        text='Nombre de pays'
+    )
+    fig_hist_volume.update_traces(textposition='outside')
+    fig_hist_volume.update_layout(
+        showlegend=False,
+        height=320,
+        margin=dict(l=50, r=20, t=20, b=50),
+        xaxis_title="Volume de touristes (milliers)",
+        yaxis_title="Nombre de pays",
+        template="plotly_white"
+    )
+    
+    return (
+        fig_duree,
+        fig_hist_duree,
+        fig_hist_volume,
+        [{'label': r, 'value': r} for r in sorted(cube.members('Region', months=period))],
+        f"{totals['Nombre de touristes']/1000:.1f}M",
+        f"{totals['Nuitées touristiques']/1000:.1f}M",
+        str(len(df_pays_hist)),
+        f"{totals['Durée de séjour moyenne']:.1f}j"
+    )
+
 def register_callbacks(app, df_dict):
     """Enregistre les callbacks pour l'interactivité des graphiques"""
     
@@ -192,243 +377,61 @@ def register_callbacks(app, df_dict):
             Output('kpi-touristes', 'children'),
             Output('kpi-nuitees', 'children'),
             Output('kpi-pays', 'children'),
-            Output('kpi-duree', 'children')
+            Output('kpi-duree', 'children'),
+            Output('regional-render-store', 'data')
         ],
         [
             Input('regional-date-slider', 'value'),
             Input('regional-indicator', 'value'),
             Input('regional-dates-store', 'data')
-        ]
+        ],
+        State('regional-render-store', 'data')
     )
-    def update_page(date_range, indicator, dates_str):
-        
-        df = df_dict["frequentation_region"].copy()
-        df['Mois'] = pd.to_datetime(df['Mois'], errors='coerce')
-        
-        start = pd.to_datetime(dates_str[date_range[0]])
-        end = pd.to_datetime(dates_str[date_range[1]])
-        df = df[(df['Mois'] >= start) & (df['Mois'] <= end)]
-        
-        agg_map = {
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        }
-        
-        df_pays = df.groupby('Pays', as_index=False).agg({indicator: agg_map[indicator]})
-        df_pays['ISO3'] = df_pays['Pays'].map(iso3_mapping)
-        df_pays_valides = df_pays.dropna(subset=['ISO3'])
-        
-        nb_pays_total = len(df_pays)
-        nb_pays_affiches = len(df_pays_valides)
-        
-        if not df_pays_valides.empty:
-            fig_world = px.choropleth(
-                df_pays_valides,
-                locations='ISO3',
-                color=indicator,
-                hover_name='Pays',
-                hover_data={indicator: ':,.0f'},
-                color_continuous_scale='Blues',
-                title=f"{indicator} par pays ({nb_pays_affiches}/{nb_pays_total} pays affichés)"
-            )
-            fig_world.update_layout(
-                geo=dict(
-                    showframe=True,
-                    showcoastlines=True,
-                    projection_type='natural earth'
-                ),
-                height=420,
-                margin=dict(l=0, r=0, t=30, b=0),
-                template="plotly_white"
-            )
-        else:
-            fig_world = go.Figure().add_annotation(
-                text="Aucune donnée avec code pays disponible",
-                showarrow=False,
-                font=dict(size=14)
-            )
-        
-        df_reg = df.groupby('Region', as_index=False).agg({indicator: agg_map[indicator]})
-        df_reg['lat'] = df_reg['Region'].map(lambda x: coords_regions.get(x, {}).get('lat'))
-        df_reg['lon'] = df_reg['Region'].map(lambda x: coords_regions.get(x, {}).get('lon'))
-        df_reg_valides = df_reg.dropna(subset=['lat'])
-        
-        if not df_reg_valides.empty:
-            fig_scatter = px.scatter_geo(
-                df_reg_valides,
-                lat='lat',
-                lon='lon',
-                size=indicator if indicator != 'Durée de séjour moyenne' else None,
-                color=indicator,
-                hover_name='Region',
-                hover_data={
-                    'lat': False,
-                    'lon': False,
-                    indicator: ':,.1f'
-                },
-                size_max=50,
-                color_continuous_scale='Oranges',
-                title=f"Répartition géographique par région"
-            )
-            fig_scatter.update_layout(
-                geo=dict(
-                    projection_type='natural earth',
-                    showland=True,
-                    landcolor='rgb(243, 243, 243)',
-                    coastlinecolor='rgb(204, 204, 204)',
-                    showocean=True,
-                    oceancolor='rgb(230, 245, 255)'
-                ),
-                height=420,
-                margin=dict(l=0, r=0, t=30, b=0),
-                template="plotly_white"
-            )
-        else:
-            fig_scatter = go.Figure().add_annotation(
-                text="Aucune donnée régionale disponible",
-                showarrow=False,
-                font=dict(size=14)
-            )
-        
-        top = df_reg.nlargest(10, indicator).sort_values(indicator, ascending=True)
-        
-        fig_top = px.bar(
-            top,
-            x=indicator,
-            y='Region',
-            orientation='h',
-            color=indicator,
-            color_continuous_scale='Greens',
-            text=indicator
-        )
-        fig_top.update_traces(texttemplate='%{text:,.0f}', textposition='outside')
-        fig_top.update_layout(
-            showlegend=False,
-            height=320,
-            margin=dict(l=0, r=100, t=0, b=30),
-            xaxis_title="",
-            yaxis_title="",
-            yaxis={'fixedrange': True},
-            xaxis={'fixedrange': True},
-            template="plotly_white"
-        )
-        
-        df_duree = df.groupby('Region', as_index=False).agg({
-            'Durée de séjour moyenne': 'mean',
-            'Nombre de touristes': 'sum'
-        })
-        df_duree_top = df_duree.nlargest(10, 'Nombre de touristes').sort_values('Durée de séjour moyenne', ascending=True)
-        
-        fig_duree = px.bar(
-            df_duree_top,
-            x='Durée de séjour moyenne',
-            y='Region',
-            orientation='h',
-            color='Durée de séjour moyenne',
-            color_continuous_scale='Purples',
-            text='Durée de séjour moyenne'
-        )
-        fig_duree.update_traces(texttemplate='%{text:.1f}j', textposition='outside')
-        fig_duree.update_layout(
-            showlegend=False,
-            height=320,
-            margin=dict(l=0, r=100, t=0, b=30),
-            xaxis_title="Jours",
-            yaxis_title="",
-            yaxis={'fixedrange': True},
-            xaxis={'fixedrange': True},
-            template="plotly_white"
-        )
-        
-        # HISTOGRAMME 1 : Distribution des durées de séjour
-        df_pays_duree = df.groupby('Pays', as_index=False)['Durée de séjour moyenne'].mean()
-        
-        # Définir les intervalles (bins)
-        bins_duree = [0, 5, 10, 15, 20, 25, 30, 100]
-        labels_duree = ['0-5j', '5-10j', '10-15j', '15-20j', '20-25j', '25-30j', '30+j']
-        
-        df_pays_duree['Intervalle'] = pd.cut(
-            df_pays_duree['Durée de séjour moyenne'], 
-            bins=bins_duree, 
-            labels=labels_duree,
-            include_lowest=True
-        )
-        
-        # Compter le nombre de pays par intervalle
-        hist_duree = df_pays_duree.groupby('Intervalle', observed=True).size().reset_index(name='Nombre de pays')
-        
-        fig_hist_duree = px.bar(
-            hist_duree,
-            x='Intervalle',
-            y='Nombre de pays',
-            color='Nombre de pays',
-            color_continuous_scale='Blues',
-            text='Nombre de pays'
-        )
-        fig_hist_duree.update_traces(textposition='outside')
-        fig_hist_duree.update_layout(
-            showlegend=False,
-            height=320,
-            margin=dict(l=50, r=20, t=20, b=50),
-            xaxis_title="Durée de séjour (jours)",
-            yaxis_title="Nombre de pays",
-            template="plotly_white"
-        )
-        
-        # HISTOGRAMME 2 : Distribution du volume de touristes
-        df_pays_volume = df.groupby('Pays', as_index=False)['Nombre de touristes'].sum()
-        
-        # Définir les intervalles (bins) en milliers
-        bins_volume = [0, 1000, 5000, 10000, 20000, 50000, 200000]
-        labels_volume = ['0-1M', '1-5M', '5-10M', '10-20M', '20-50M', '50M+']
-        
-        df_pays_volume['Intervalle'] = pd.cut(
-            df_pays_volume['Nombre de touristes'], 
-            bins=bins_volume, 
-            labels=labels_volume,
-            include_lowest=True
-        )
-        
-        # Compter le nombre de pays par intervalle
-        hist_volume = df_pays_volume.groupby('Intervalle', observed=True).size().reset_index(name='Nombre de pays')
-        
-        fig_hist_volume = px.bar(
-            hist_volume,
-            x='Intervalle',
-            y='Nombre de pays',
-            color='Nombre de pays',
-            color_continuous_scale='Greens',
-            text='Nombre de pays'
-        )
-        fig_hist_volume.update_traces(textposition='outside')
-        fig_hist_volume.update_layout(
-            showlegend=False,
-            height=320,
-            margin=dict(l=50, r=20, t=20, b=50),
-            xaxis_title="Volume de touristes (milliers)",
-            yaxis_title="Nombre de pays",
-            template="plotly_white"
+    @memoize(df_dict)
+    def update_page(date_range, indicator, dates_str, rendered=None):
+        """
+        Met à jour l'onglet en n'envoyant que ce qui a changé par rapport à ce
+        qu'affiche déjà le navigateur (`rendered`, None au premier rendu) :
+        - sorties de la période inchangées si seule la période est identique ;
+        - figures de même indicateur et même structure : Patch des seules
+          valeurs des traces (mise en page, géo et thème restent en place).
+        """
+        rendered = rendered or {}
+        same_period = rendered.get('period') == list(date_range)
+        same_indicator = rendered.get('indicator') == indicator
+        if same_period and same_indicator:
+            raise PreventUpdate
+        
+        # Agrégats de la période lus dans le cube (sommes et durées moyennes exactes)
+        cube = region_cube(df_dict["frequentation_region"])
+        period = (month_ordinal(dates_str[date_range[0]]), month_ordinal(dates_str[date_range[1]]))
+        
+        fig_world, fig_scatter, fig_top, has_world, has_scatter = _indicator_figures(
+            cube, country_table(df_dict["frequentation_region"]), period, indicator
         )
+        if same_indicator:
+            maps = rendered.get('maps', [False, False])
+            if has_world and maps[0]:
+                fig_world = values_patch(fig_world, ['title.text'])
+            if has_scatter and maps[1]:
+                fig_scatter = values_patch(fig_scatter)
+            fig_top = values_patch(fig_top)
+        
+        if same_period:
+            period_outputs = [no_update] * 8
+        else:
+            period_outputs = list(_period_outputs(cube, period))
+            if 'period' in rendered:
+                period_outputs[:3] = [values_patch(fig) for fig in period_outputs[:3]]
         
-        return (
-            fig_world,
-            fig_scatter,
-            fig_top,
-            fig_duree,
-            fig_hist_duree,
-            fig_hist_volume,
-            [{'label': r, 'value': r} for r in sorted(df['Region'].unique())],
-            f"{df['Nombre de touristes'].sum()/1000:.1f}M",
-            f"{df['Nuitées touristiques'].sum()/1000:.1f}M",
-            str(df['Pays'].nunique()),
-            f"{df['Durée de séjour moyenne'].mean():.1f}j"
-        )
+        state = {'period': list(date_range), 'indicator': indicator, 'maps': [has_world, has_scatter]}
+        return (fig_world, fig_scatter, fig_top, *period_outputs, state)
     
     @app.callback(
         Output('regional-evolution-chart', 'figure'),
         Input('regional-regions-dropdown', 'value')
     )
+    @memoize(df_dict)
     def update_evolution(regions):
         
         if not regions:
@@ -438,11 +441,11 @@ def register_callbacks(app, df_dict):
                 font=dict(size=14, color="gray")
             )
         
-        df = df_dict["frequentation_region"].copy()
-        df['Mois'] = pd.to_datetime(df['Mois'], errors='coerce')
-        df = df[df['Region'].isin(regions)]
-        
-        df_agg = df.groupby(['Mois', 'Region'], as_index=False)['Nombre de touristes'].sum()
+        df_agg = region_cube(df_dict["frequentation_region"]).rollup(
+            ['Mois', 'Region'], regions=regions, measures=['Nombre de touristes']
+        )
+        # Plotly regroupe aussi les catégories absentes de la sélection
+        df_agg['Region'] = df_agg['Region'].cat.remove_unused_categories()
         
         fig = px.line(
             df_agg,
@@ -463,4 +466,14 @@ def register_callbacks(app, df_dict):
             yaxis_title="Touristes (milliers)"
         )
         
-        return fig
\ No newline at end of file
+        return fig
+
+def warmup_calls(df_dict):
+    """Entrées des callbacks à précalculer : toute la période, pour chaque indicateur"""
+    dates_str = month_index(df_dict["frequentation_region"]).labels
+    periode = [0, len(dates_str) - 1]
+    
+    # Même forme que les requêtes de Dash, qui passent aussi l'état du store (vide au premier affichage)
+    calls = [('update_page', (periode, indicateur['value'], dates_str, None)) for indicateur in indicateurs]
+    calls.append(('update_evolution', (None,)))
+    return calls
@@ -0,0 +1,65 @@
+# src/utils/binning.py
+import numpy as np
+import pandas as pd
+
+COUNT_COL = "Nombre de pays"
+
+
+def equal_width_edges(values, n_bins):
+    """Bornes de `n_bins` intervalles de même largeur couvrant les valeurs"""
+    values = np.asarray(values, dtype="float64")
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.linspace(0.0, 1.0, n_bins + 1)
+    low, high = values.min(), values.max()
+    if low == high:
+        high = low + 1
+    return np.linspace(low, high, n_bins + 1)
+
+
+def bin_counts(values, edges, open_ended=False):
+    """
+    Nombre de valeurs par intervalle, comme `pd.cut(..., include_lowest=True)` :
+    intervalles fermés à droite, le premier inclut sa borne basse. Avec
+    `open_ended`, le dernier intervalle n'a pas de borne haute (« 50M+ ») ;
+    sinon les valeurs hors bornes et les NaN ne sont pas comptés.
+    """
+    edges = np.asarray(edges, dtype="float64")
+    if open_ended:
+        edges = np.append(edges[:-1], np.inf)
+    values = np.asarray(values, dtype="float64")
+
+    # Intervalle i = ]edges[i], edges[i + 1]] : searchsorted à gauche donne i + 1
+    positions = np.searchsorted(edges, values, side="left") - 1
+    positions[values == edges[0]] = 0
+    valid = (positions >= 0) & (positions < len(edges) - 1)
+    return np.bincount(positions[valid], minlength=len(edges) - 1)
+
+
+def histograms(df, specs):
+    """
+    Histogrammes de plusieurs colonnes d'un même DataFrame d'agrégats.
+
+    `specs` associe à chaque colonne un dict avec `edges` (bornes, ou nombre
+    d'intervalles de même largeur calculés sur les données), et en option
+    `labels`, `open_ended` et `column` (nom de la colonne des intervalles,
+    « Intervalle » par défaut). Retourne, par colonne, un DataFrame prêt à
+    tracer (intervalle, `Nombre de pays`) sans les intervalles vides.
+    """
+    results = {}
+    for col, spec in specs.items():
+        values = df[col].to_numpy(dtype="float64")
+        edges = spec["edges"]
+        if isinstance(edges, int):
+            edges = equal_width_edges(values, edges)
+        counts = bin_counts(values, edges, open_ended=spec.get("open_ended", False))
+
+        labels = spec.get("labels")
+        if labels is None:
+            labels = [f"{low:,.0f}-{high:,.0f}" for low, high in zip(edges[:-1], edges[1:])]
+        present = np.flatnonzero(counts)
+        results[col] = pd.DataFrame({
+            spec.get("column", "Intervalle"): np.asarray(labels, dtype=object)[present],
+            COUNT_COL: counts[present],
+        })
+    return results
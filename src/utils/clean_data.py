@@ -1,7 +1,17 @@
 # src/utils/clean_data.py
+import argparse
+import hashlib
+import json
+import shutil
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+try:
+    from src.utils.columnar_cache import ColumnarWriter, iter_columnar, read_columnar, write_columnar
+except ImportError:  # exécution directe : python src/utils/clean_data.py
+    from columnar_cache import ColumnarWriter, iter_columnar, read_columnar, write_columnar
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 RAW_DIR = PROJECT_ROOT / "data" / "raw"
 CLEANED_DIR = PROJECT_ROOT / "data" / "cleaned"
@@ -14,63 +24,416 @@ FILES = {
     "frequentation_hoteliere.csv": "frequentation_hoteliere_cleaned.csv"
 }
 
-def clean_tourism_data():
+NUMERIC_COLS = ["Nombre de touristes", "Nombre de croisièristes",
+                "Nuitées touristiques", "Durée de séjour moyenne"]
+
+# Manifeste du nettoyage incrémental : empreinte, taille, nombre de lignes et colonnes par fichier brut
+MANIFEST_PATH = CLEANED_DIR / "manifest.json"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def detect_sep(path):
+    """Séparateur du CSV brut : « ; » pour les fichiers data.gouv.fr tels que publiés"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        header = f.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def read_raw(source, sep=",", **kwargs):
+    """
+    Lit un CSV brut en texte : les valeurs sont comparées telles que publiées,
+    quel que soit le morceau du fichier d'où elles proviennent.
+    """
+    return pd.read_csv(source, sep=sep, encoding="utf-8", dtype=str, **kwargs)
+
+
+def row_hashes(df):
+    """Empreinte 64 bits de chaque ligne brute, utilisée pour le dédoublonnage"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def normalize_numeric(df, verbose=True):
+    """Conversion vectorisée des colonnes numériques (virgule décimale, guillemets)"""
+    for col in df.columns:
+        if col in NUMERIC_COLS:
+            # Convertir en string, gérer les virgules décimales
+            values = (df[col]
+                      .astype(str)
+                      .str.replace(',', '.')  # Virgule → point
+                      .str.strip()            # Enlever espaces
+                      .str.replace('"', ''))  # Enlever guillemets si présents
+
+            # Convertir en numérique
+            df[col] = pd.to_numeric(values, errors="coerce")
+
+            # Afficher le nombre de valeurs manquantes
+            n_missing = df[col].isna().sum()
+            if verbose and n_missing > 0:
+                print(f"    {col}: {n_missing} valeurs manquantes")
+        else:
+            # Autres colonnes (Année...) : numériques seulement si toutes les valeurs le sont
+            converted = pd.to_numeric(df[col], errors="coerce")
+            if converted.notna().sum() == df[col].notna().sum() and converted.notna().any():
+                df[col] = converted
+    return df
+
+
+class HashIndex:
+    """
+    Ensemble des empreintes de lignes déjà conservées.
+
+    Les empreintes sont gardées en segments triés de uint64 (8 octets par
+    ligne) et fusionnées de temps en temps, ce qui permet de dédoublonner
+    entre blocs sans garder les lignes elles-mêmes en mémoire.
+    """
+
+    MAX_SEGMENTS = 16
+
+    def __init__(self, hashes=None):
+        self._segments = []
+        if hashes is not None:
+            self.add(hashes)
+
+    def __len__(self):
+        return sum(len(seg) for seg in self._segments)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for seg in self._segments:
+            pos = np.minimum(np.searchsorted(seg, hashes), len(seg) - 1)
+            found |= seg[pos] == hashes
+        return found
+
+    def add(self, hashes):
+        if len(hashes):
+            self._segments.append(np.sort(hashes))
+        if len(self._segments) > self.MAX_SEGMENTS:
+            self._segments = [np.sort(np.concatenate(self._segments))]
+
+    def to_array(self):
+        if not self._segments:
+            return np.array([], dtype=np.uint64)
+        return np.sort(np.concatenate(self._segments))
+
+
+def clean_frame(df, seen=None, verbose=True):
+    """
+    Dédoublonne puis normalise un bloc de lignes brutes.
+
+    Les lignes déjà présentes dans `seen` (HashIndex des blocs ou passages
+    précédents) sont aussi écartées, et les empreintes des lignes conservées
+    y sont ajoutées. Retourne le DataFrame nettoyé et ces empreintes.
+    """
+    hashes = row_hashes(df)
+    keep = ~pd.Series(hashes).duplicated().to_numpy()
+    if seen is not None:
+        keep &= ~seen.contains(hashes)
+        seen.add(hashes[keep])
+
+    df = df[keep].copy()
+    if verbose:
+        print(f"  Shape après dédoublonnage: {df.shape}")
+    return normalize_numeric(df, verbose), hashes[keep]
+
+
+def file_digests(path, prefix_size):
+    """Empreintes SHA-256 du fichier complet et de ses `prefix_size` premiers octets"""
+    full = hashlib.sha256()
+    prefix = None
+    read = 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK_SIZE)
+            if not block:
+                break
+            if prefix is None and read + len(block) >= prefix_size:
+                cut = prefix_size - read
+                full.update(block[:cut])
+                prefix = full.copy()
+                full.update(block[cut:])
+            else:
+                full.update(block)
+            read += len(block)
+    return full.hexdigest(), prefix.hexdigest() if prefix is not None else None
+
+
+def load_manifest():
+    if MANIFEST_PATH.exists():
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest):
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(MANIFEST_PATH)
+
+
+def hashes_path(cleaned_path):
+    """Empreintes des lignes déjà nettoyées, à côté du CSV nettoyé"""
+    return cleaned_path.with_suffix(".rowhashes.npy")
+
+
+def find_new_rows(raw_hashes, stored_hashes):
+    """
+    Lignes brutes absentes du dernier nettoyage, repérées par leurs empreintes
+    (différence d'ensembles, quel que soit l'endroit du fichier où elles sont).
+
+    Retourne (position, masque des nouvelles lignes) où position vaut
+    "prepend" (bloc en tête, fichiers publiés du plus récent au plus ancien)
+    ou "append" (bloc en fin), ou None si un nettoyage complet est nécessaire :
+    lignes déjà nettoyées supprimées ou modifiées, aucune ligne nouvelle, ou
+    nouvelles lignes intercalées parmi les anciennes.
+    """
+    if not np.isin(stored_hashes, raw_hashes).all():
+        return None
+
+    old = HashIndex(stored_hashes).contains(raw_hashes)
+    new = ~old & ~pd.Series(raw_hashes).duplicated().to_numpy()
+    new_positions = np.flatnonzero(new)
+    old_positions = np.flatnonzero(old)
+    if not len(new_positions):
+        return None
+    if not len(old_positions) or new_positions[-1] < old_positions[0]:
+        return "prepend", new
+    if new_positions[0] > old_positions[-1]:
+        return "append", new
+    return None
+
+
+def _write_csv(cleaned_path, df_new, where):
+    """Ajoute les lignes nettoyées en tête (sous l'en-tête) ou en fin du CSV nettoyé"""
+    if where == "append":
+        df_new.to_csv(cleaned_path, mode="a", header=False, index=False, sep=",", encoding="utf-8")
+        return
+
+    tmp_path = cleaned_path.with_name(f".{cleaned_path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as out, \
+            open(cleaned_path, encoding="utf-8", newline="") as previous:
+        out.write(previous.readline())
+        df_new.to_csv(out, header=False, index=False, sep=",")
+        shutil.copyfileobj(previous, out)
+    tmp_path.replace(cleaned_path)
+
+
+def _add_rows(df_new, cleaned_path, where):
+    """Nettoie uniquement les nouvelles lignes brutes et les ajoute aux sorties"""
+    print(f"  Nouvelles lignes ({'en tête' if where == 'prepend' else 'en fin'}): {len(df_new)}")
+    seen = HashIndex(np.load(hashes_path(cleaned_path)))
+    df_new, _ = clean_frame(df_new, seen=seen)
+
+    # L'artefact colonnaire est relu avant que le CSV ne soit modifié
+    df_previous = read_columnar(cleaned_path)
+    if df_previous is None:
+        df_previous = normalize_numeric(
+            pd.read_csv(cleaned_path, sep=",", encoding="utf-8"), verbose=False
+        )
+
+    _write_csv(cleaned_path, df_new, where)
+    np.save(hashes_path(cleaned_path), seen.to_array())
+    print(f"  ✓ {len(df_new)} lignes ajoutées à {cleaned_path}")
+
+    parts = [df_new, df_previous] if where == "prepend" else [df_previous, df_new]
+    return df_new, pd.concat(parts, ignore_index=True)
+
+
+def _stream_chunks(reader, seen, csv_file, writer, mask=None):
+    """
+    Nettoie un flux de blocs : dédoublonnage par empreintes, écriture au fil de
+    l'eau. Avec `mask` (une valeur par ligne du fichier), seules ces lignes
+    sont nettoyées. Retourne le nombre de lignes brutes lues.
+    """
+    n_raw = 0
+    n_kept = 0
+    for i, chunk in enumerate(reader, start=1):
+        first = n_raw
+        n_raw += len(chunk)
+        if mask is not None:
+            chunk = chunk[mask[first:n_raw]]
+        chunk, _ = clean_frame(chunk, seen=seen, verbose=False)
+        n_kept += len(chunk)
+
+        chunk.to_csv(csv_file, header=csv_file.tell() == 0, index=False, sep=",")
+        writer.write(chunk)
+        print(f"  Bloc {i}: {n_raw} lignes lues, {n_kept} conservées")
+    return n_raw
+
+
+def stream_hashes(path, chunksize):
+    """Colonnes et empreintes des lignes d'un fichier brut, lu par blocs"""
+    reader = read_raw(path, sep=detect_sep(path), chunksize=chunksize)
+    columns = None
+    hashes = []
+    for chunk in reader:
+        columns = chunk.columns.tolist()
+        hashes.append(row_hashes(chunk))
+    if columns is None:
+        columns = read_raw(path, sep=detect_sep(path), nrows=0).columns.tolist()
+    return columns, np.concatenate(hashes) if hashes else np.array([], dtype=np.uint64)
+
+
+def _previous_chunks(cleaned_path, chunksize):
+    """Lignes déjà nettoyées, par blocs, lues dans l'artefact colonnaire ou le CSV"""
+    previous = iter_columnar(cleaned_path, batch_size=chunksize)
+    if previous is None:
+        previous = (normalize_numeric(chunk, verbose=False)
+                    for chunk in pd.read_csv(cleaned_path, sep=",", encoding="utf-8",
+                                             chunksize=chunksize))
+    return previous
+
+
+def clean_file_streaming(path, cleaned_path, chunksize, new_rows=None):
+    """
+    Nettoie un fichier brut par blocs de `chunksize` lignes.
+
+    La mémoire utilisée dépend de la taille des blocs, plus 8 octets par ligne
+    pour les index d'empreintes. Avec `new_rows` (résultat de find_new_rows),
+    seules les nouvelles lignes sont nettoyées, puis placées en tête ou en fin
+    des sorties : l'artefact Parquet est recopié bloc par bloc et le CSV
+    complété (ou recopié octet par octet derrière les nouvelles lignes).
+    Retourne le nombre de lignes brutes lues.
+    """
+    writer = ColumnarWriter(cleaned_path)
+    with writer:
+        if new_rows is None:
+            seen = HashIndex()
+            tmp_path = cleaned_path.with_name(f".{cleaned_path.name}.tmp")
+            with open(tmp_path, "w", encoding="utf-8", newline="") as csv_file:
+                reader = read_raw(path, sep=detect_sep(path), chunksize=chunksize)
+                n_raw = _stream_chunks(reader, seen, csv_file, writer)
+            tmp_path.replace(cleaned_path)
+        else:
+            where, mask = new_rows
+            print(f"  Nouvelles lignes ({'en tête' if where == 'prepend' else 'en fin'}): {mask.sum()}")
+            seen = HashIndex(np.load(hashes_path(cleaned_path)))
+            reader = read_raw(path, sep=detect_sep(path), chunksize=chunksize)
+
+            if where == "append":
+                # Lignes déjà nettoyées recopiées dans le nouvel artefact, puis les nouvelles
+                for chunk in _previous_chunks(cleaned_path, chunksize):
+                    writer.write(chunk)
+                with open(cleaned_path, "a", encoding="utf-8", newline="") as csv_file:
+                    n_raw = _stream_chunks(reader, seen, csv_file, writer, mask)
+            else:
+                # Nouvelles lignes d'abord, puis les lignes déjà nettoyées
+                tmp_path = cleaned_path.with_name(f".{cleaned_path.name}.tmp")
+                with open(tmp_path, "w", encoding="utf-8", newline="") as csv_file, \
+                        open(cleaned_path, encoding="utf-8", newline="") as previous:
+                    csv_file.write(previous.readline())
+                    n_raw = _stream_chunks(reader, seen, csv_file, writer, mask)
+                    shutil.copyfileobj(previous, csv_file)
+                for chunk in _previous_chunks(cleaned_path, chunksize):
+                    writer.write(chunk)
+                tmp_path.replace(cleaned_path)
+
+    np.save(hashes_path(cleaned_path), seen.to_array())
+    print(f"  ✓ Sauvegardé: {cleaned_path}")
+    if writer.schema is not None:
+        print(f"  ✓ Sauvegardé: {writer.parquet_path}")
+    return n_raw
+
+
+def clean_tourism_data(incremental=True, chunksize=None):
+    """
+    Nettoie les fichiers bruts de data/raw vers data/cleaned.
+
+    En mode incrémental, un fichier dont l'empreinte n'a pas changé est ignoré.
+    Sinon ses lignes sont comparées, par leurs empreintes, à celles du dernier
+    nettoyage : si des lignes ont seulement été ajoutées, en tête (fichiers
+    publiés du plus récent au plus ancien) ou en fin de fichier, seules ces
+    lignes sont nettoyées et placées au même endroit dans les sorties. Le
+    fichier brut est relu et haché, mais rien d'autre n'est renettoyé.
+    Retourne, par fichier brut, les lignes nettoyées lors de cet appel.
+
+    Avec `chunksize`, les fichiers sont traités en streaming par blocs de
+    lignes et rien n'est retourné pour eux : la mémoire ne dépend plus de la
+    taille des fichiers bruts.
+    """
+    manifest = load_manifest() if incremental else {}
     cleaned_dfs = {}
     for raw_file, cleaned_file in FILES.items():
         path = RAW_DIR / raw_file
+        cleaned_path = CLEANED_DIR / cleaned_file
         print(f"Nettoyage de {raw_file}...")
-        
+
         if not path.exists():
             print(f"   {path} n'existe pas !")
             continue
-        
-        # Lecture avec le bon séparateur
-        df = pd.read_csv(path, sep=",", encoding='utf-8')
-        
-        print(f"  Colonnes: {df.columns.tolist()}")
-        print(f"  Shape avant: {df.shape}")
-        
-        # Suppression des doublons
-        df = df.drop_duplicates()
-        print(f"  Shape après dédoublonnage: {df.shape}")
-        
-        # Conversion des colonnes numériques
-        numeric_cols = ["Nombre de touristes", "Nombre de croisièristes", 
-                       "Nuitées touristiques", "Durée de séjor moyenne"]
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                # Convertir en string, gérer les virgules décimales
-                df[col] = (df[col]
-                          .astype(str)
-                          .str.replace(',', '.')  # Virgule → point
-                          .str.strip()            # Enlever espaces
-                          .str.replace('"', ''))  # Enlever guillemets si présents
-                
-                # Convertir en numérique
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-                
-                # Afficher le nombre de valeurs manquantes
-                n_missing = df[col].isna().sum()
-                if n_missing > 0:
-                    print(f"    {col}: {n_missing} valeurs manquantes")
-        
-        cleaned_dfs[raw_file] = df
-        
-        # Sauvegarde propre
-        cleaned_path = CLEANED_DIR / cleaned_file
-        df.to_csv(
-            cleaned_path, 
-            index=False, 
-            sep=",",
-            encoding="utf-8"
-        )
-        print(f"  ✓ Sauvegardé: {cleaned_path}\n")
-    
+
+        entry = manifest.get(raw_file)
+        outputs_exist = cleaned_path.exists() and hashes_path(cleaned_path).exists()
+        size = path.stat().st_size
+        digest, _ = file_digests(path, 0)
+
+        if entry and outputs_exist and digest == entry["sha256"]:
+            print("  Inchangé depuis le dernier nettoyage\n")
+            continue
+
+        # Empreintes de toutes les lignes brutes, comparées à celles déjà nettoyées
+        if chunksize:
+            columns, raw_hashes = stream_hashes(path, chunksize)
+        else:
+            df = read_raw(path, sep=detect_sep(path))
+            columns, raw_hashes = df.columns.tolist(), row_hashes(df)
+        new_rows = None
+        if entry is not None and outputs_exist and columns == entry["columns"]:
+            new_rows = find_new_rows(raw_hashes, np.load(hashes_path(cleaned_path)))
+        n_rows = len(raw_hashes)
+
+        if chunksize:
+            clean_file_streaming(path, cleaned_path, chunksize, new_rows)
+        elif new_rows is not None:
+            where, mask = new_rows
+            df_new, df = _add_rows(df[mask], cleaned_path, where)
+            cleaned_dfs[raw_file] = df_new
+        else:
+            print(f"  Colonnes: {df.columns.tolist()}")
+            print(f"  Shape avant: {df.shape}")
+
+            # Suppression des doublons et conversion des colonnes numériques
+            df, hashes = clean_frame(df)
+            cleaned_dfs[raw_file] = df
+
+            # Sauvegarde propre
+            df.to_csv(
+                cleaned_path,
+                index=False,
+                sep=",",
+                encoding="utf-8"
+            )
+            np.save(hashes_path(cleaned_path), hashes)
+            print(f"  ✓ Sauvegardé: {cleaned_path}")
+
+        if not chunksize:
+            # Artefact colonnaire typé, lu en priorité par load_cleaned_data
+            parquet_path = write_columnar(df, cleaned_path)
+            if parquet_path is not None:
+                print(f"  ✓ Sauvegardé: {parquet_path}")
+
+        # Empreinte du fichier traité : les prochains passages le compareront à celle-ci
+        manifest[raw_file] = {
+            "sha256": digest,
+            "size": size,
+            "rows": n_rows,
+            "columns": columns
+        }
+        save_manifest(manifest)
+        print()
+
     return cleaned_dfs
 
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nettoyage des données touristiques")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore le manifeste et renettoie tous les fichiers")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="traitement en streaming par blocs de N lignes (gros fichiers)")
+    args = parser.parse_args()
+
     print(f"RAW_DIR: {RAW_DIR}")
     print(f"CLEANED_DIR: {CLEANED_DIR}\n")
-    clean_tourism_data()
-    print(" Nettoyage terminé !")
\ No newline at end of file
+    clean_tourism_data(incremental=not args.full, chunksize=args.chunksize)
+    print(" Nettoyage terminé !")
@@ -0,0 +1,85 @@
+# src/utils/clientside.py
+import plotly.io as pio
+from plotly.colors import make_colorscale
+from plotly.express.colors import diverging, sequential
+
+from src.utils.countries import country_table
+from src.utils.cube import region_cube
+from src.utils.time_axis import frame_cache
+
+# Échelles de couleurs et thèmes utilisés par assets/clientside.js, que Plotly.js
+# ne connaît pas par leur nom
+COLORSCALES = ["Teal", "Viridis", "Oranges", "Purples", "RdYlGn"]
+TEMPLATES = ["plotly", "plotly_white"]
+
+
+def build_country_rows(df):
+    """
+    Agrégat par (année, pays) d'un DataFrame hôtelier, en colonnes compactes :
+    pays et régions en codes (avec leurs libellés et codes ISO3), sommes des
+    mesures et, pour la durée, somme et nombre de valeurs (la moyenne reste
+    exacte quand le navigateur regroupe plusieurs années).
+    """
+    df_rows = df.groupby(["Année", "Pays"], as_index=False, observed=True).agg(
+        region=("Region", "first"),
+        touristes=("Nombre de touristes", "sum"),
+        nuitees=("Nuitées touristiques", "sum"),
+        duree_somme=("Durée de séjour moyenne", "sum"),
+        duree_n=("Durée de séjour moyenne", "count"),
+    )
+    table = country_table(df)
+    return {
+        "pays": table.names.tolist(),
+        "iso3": table.table["ISO3"].tolist(),
+        "individuel": table.table["individuel"].tolist(),
+        "regions": df["Region"].cat.categories.tolist(),
+        "p": df_rows["Pays"].cat.codes.tolist(),
+        "r": df_rows["region"].cat.codes.tolist(),
+        "annee": df_rows["Année"].astype(int).tolist(),
+        "touristes": df_rows["touristes"].astype(float).tolist(),
+        "nuitees": df_rows["nuitees"].astype(float).tolist(),
+        "duree_somme": df_rows["duree_somme"].astype(float).tolist(),
+        "duree_n": df_rows["duree_n"].astype(int).tolist(),
+    }
+
+
+country_rows = frame_cache(build_country_rows)
+
+
+def build_region_months(df):
+    """Touristes et nuitées par (mois, région) d'un DataFrame régional, lus dans le cube"""
+    df_mois = region_cube(df).rollup(
+        ["Mois", "Region"], measures=["Nombre de touristes", "Nuitées touristiques"]
+    )
+    mois = df_mois["Mois"].astype("category")
+    return {
+        "mois": mois.cat.categories.strftime("%Y-%m-%dT%H:%M:%S").tolist(),
+        "regions": df_mois["Region"].cat.categories.tolist(),
+        "m": mois.cat.codes.tolist(),
+        "r": df_mois["Region"].cat.codes.tolist(),
+        "touristes": df_mois["Nombre de touristes"].astype(float).tolist(),
+        "nuitees": df_mois["Nuitées touristiques"].astype(float).tolist(),
+    }
+
+
+region_months = frame_cache(build_region_months)
+
+
+def _colorscale(name):
+    return make_colorscale(getattr(sequential, name, None) or getattr(diverging, name))
+
+
+def clientside_payload(df_hotel, df_region=None):
+    """
+    Contenu du dcc.Store lu par les callbacks clientside (assets/clientside.js) :
+    les lignes par pays et année, les séries mensuelles par région si
+    `df_region` est fourni, plus les échelles de couleurs et thèmes Plotly.
+    """
+    payload = {
+        "rows": country_rows(df_hotel),
+        "colorscales": {name: _colorscale(name) for name in COLORSCALES},
+        "templates": {name: pio.templates[name].to_plotly_json() for name in TEMPLATES},
+    }
+    if df_region is not None:
+        payload["region_months"] = region_months(df_region)
+    return payload
@@ -0,0 +1,151 @@
+# src/utils/columnar_cache.py
+import json
+import os
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel : on retombe alors sur le CSV
+    pa = None
+    pq = None
+
+# Version du format de l'artefact : l'incrémenter invalide les fichiers existants
+SCHEMA_VERSION = 1
+METADATA_KEY = b"tourism_dashboard"
+
+
+def columnar_path(csv_path):
+    """Chemin de l'artefact Parquet associé à un CSV nettoyé"""
+    return Path(csv_path).with_suffix(".parquet")
+
+
+def is_fresh(csv_path):
+    """Indique si l'artefact Parquet existe et est plus récent que le CSV"""
+    if pq is None:
+        return False
+
+    parquet_path = columnar_path(csv_path)
+    if not parquet_path.exists():
+        return False
+
+    csv_path = Path(csv_path)
+    if csv_path.exists() and csv_path.stat().st_mtime_ns > parquet_path.stat().st_mtime_ns:
+        return False
+
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        info = json.loads(metadata.get(METADATA_KEY, b"{}"))
+    except (OSError, ValueError, pa.ArrowException):
+        return False
+
+    return info.get("version") == SCHEMA_VERSION
+
+
+def _metadata(csv_path, df, rows=None):
+    return {METADATA_KEY: json.dumps({
+        "version": SCHEMA_VERSION,
+        "source": Path(csv_path).name,
+        "rows": rows,
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()}
+    }).encode("utf-8")}
+
+
+def write_columnar(df, csv_path):
+    """
+    Écrit l'artefact Parquet typé (schéma embarqué) à côté du CSV nettoyé.
+
+    L'écriture passe par un fichier temporaire puis un renommage atomique,
+    pour que plusieurs workers puissent la déclencher sans se gêner.
+    """
+    if pa is None:
+        print("  pyarrow non installé : artefact colonnaire ignoré")
+        return None
+
+    parquet_path = columnar_path(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    metadata = dict(table.schema.metadata or {})
+    metadata.update(_metadata(csv_path, df, rows=len(df)))
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = parquet_path.with_name(f".{parquet_path.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, parquet_path)
+
+    return parquet_path
+
+
+class ColumnarWriter:
+    """
+    Écriture bloc par bloc de l'artefact Parquet (nettoyage en streaming).
+
+    Le schéma est fixé au premier bloc : colonnes numériques en float64 et
+    colonnes texte en string, pour que tous les blocs suivants s'y conforment
+    quel que soit le typage déduit par pandas sur chacun d'eux.
+    """
+
+    def __init__(self, csv_path):
+        self.csv_path = csv_path
+        self.parquet_path = columnar_path(csv_path)
+        self.tmp_path = self.parquet_path.with_name(f".{self.parquet_path.name}.{os.getpid()}.tmp")
+        self.schema = None
+        self.rows = 0
+        self._writer = None
+
+    def write(self, df):
+        if pa is None or df.empty:
+            return
+
+        if self._writer is None:
+            fields = [
+                pa.field(col, pa.float64() if dtype.kind in "iufb" else pa.string())
+                for col, dtype in df.dtypes.items()
+            ]
+            self.schema = pa.schema(fields, metadata=_metadata(self.csv_path, df))
+            self._writer = pq.ParquetWriter(self.tmp_path, self.schema)
+
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is None:
+            return None
+        self._writer.close()
+        os.replace(self.tmp_path, self.parquet_path)
+        return self.parquet_path
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            os.remove(self.tmp_path)
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def read_columnar(csv_path):
+    """Lit l'artefact Parquet s'il est à jour, sinon retourne None"""
+    if not is_fresh(csv_path):
+        return None
+
+    try:
+        return pq.read_table(columnar_path(csv_path)).to_pandas()
+    except (OSError, pa.ArrowException):
+        return None
+
+
+def iter_columnar(csv_path, batch_size=65536):
+    """Parcourt l'artefact Parquet par blocs (None s'il est absent ou périmé)"""
+    if not is_fresh(csv_path):
+        return None
+
+    parquet_file = pq.ParquetFile(columnar_path(csv_path))
+    return (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=batch_size))
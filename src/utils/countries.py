@@ -0,0 +1,86 @@
+# src/utils/countries.py
+import numpy as np
+import pandas as pd
+
+from src.utils.time_axis import frame_cache
+
+# Codes ISO3 des pays publiés sans code dans les fichiers sources
+ISO3_BY_NAME = {
+    'Canada': 'CAN', 'États-Unis': 'USA', 'États-Unis (y compris Hawaii)': 'USA',
+    'Hawaii': 'USA', 'USA': 'USA',
+    'Mexique': 'MEX', 'Brésil': 'BRA', 'Argentine': 'ARG', 'Chili': 'CHL',
+    'Colombie': 'COL', 'Pérou': 'PER', 'Venezuela': 'VEN', 'Uruguay': 'URY',
+    'Royaume-Uni': 'GBR', 'Allemagne': 'DEU', 'Italie': 'ITA', 'Espagne': 'ESP',
+    'France': 'FRA', 'Belgique': 'BEL', 'Pays-Bas': 'NLD', 'Suisse': 'CHE',
+    'Autriche': 'AUT', 'Portugal': 'PRT', 'Grèce': 'GRC', 'Pologne': 'POL',
+    'Suède': 'SWE', 'Norvège': 'NOR', 'Danemark': 'DNK', 'Finlande': 'FIN',
+    'Irlande': 'IRL', 'Islande': 'ISL', 'Luxembourg': 'LUX', 'Hongrie': 'HUN',
+    'République tchèque': 'CZE', 'Roumanie': 'ROU', 'Bulgarie': 'BGR',
+    'Croatie': 'HRV', 'Slovénie': 'SVN', 'Slovaquie': 'SVK', 'Estonie': 'EST',
+    'Lettonie': 'LVA', 'Lituanie': 'LTU', 'Serbie': 'SRB', 'Ukraine': 'UKR',
+    'Chine': 'CHN', 'Japon': 'JPN', 'Corée du Sud': 'KOR', 'Inde': 'IND',
+    'Thaïlande': 'THA', 'Vietnam': 'VNM', 'Singapour': 'SGP', 'Malaisie': 'MYS',
+    'Indonésie': 'IDN', 'Philippines': 'PHL', 'Hong Kong': 'HKG', 'Taïwan': 'TWN',
+    'Australie': 'AUS', 'Nouvelle-Zélande': 'NZL', 'Papouasie-Nouvelle-Guinée': 'PNG',
+    'Afrique du Sud': 'ZAF', 'Égypte': 'EGY', 'Maroc': 'MAR', 'Tunisie': 'TUN',
+    'Algérie': 'DZA', 'Kenya': 'KEN', 'Nigeria': 'NGA', 'Éthiopie': 'ETH',
+    'Russie': 'RUS', 'Turquie': 'TUR', 'Arabie Saoudite': 'SAU', 'Israël': 'ISR',
+    'Émirats Arabes Unis': 'ARE', 'Qatar': 'QAT', 'Koweït': 'KWT', 'Liban': 'LBN',
+    'Jordanie': 'JOR', 'Oman': 'OMN', 'Bahreïn': 'BHR', 'Pakistan': 'PAK',
+    'Bangladesh': 'BGD', 'Sri Lanka': 'LKA', 'Népal': 'NPL', 'Afghanistan': 'AFG',
+    'Iran': 'IRN', 'Irak': 'IRQ', 'Syrie': 'SYR', 'Yémen': 'YEM'
+}
+
+
+class CountryTable:
+    """
+    Table de dimension des pays d'un DataFrame : code ISO3 et indicateur
+    « pays individuel » (par opposition aux agrégats comme « Autre Europe »,
+    qui n'ont pas de code).
+
+    Une ligne par modalité de `Pays` ; le code présent dans les données est
+    prioritaire, sinon celui de ISO3_BY_NAME. Les lignes d'un DataFrame sont
+    résolues par leurs codes catégoriels, sans parcours ligne à ligne.
+    """
+
+    def __init__(self, df):
+        pays = df["Pays"]
+        if isinstance(pays.dtype, pd.CategoricalDtype):
+            self.names = pays.cat.categories
+        else:
+            self.names = pd.Index(pd.unique(pays.dropna())).sort_values()
+
+        iso3 = pd.Series(self.names, index=self.names, dtype=object).map(ISO3_BY_NAME)
+        if "ISO3" in df.columns:
+            published = df["ISO3"].astype(object).fillna("").str.strip()
+            known = published != ""
+            iso3.update(published[known].groupby(pays.astype(object)[known], sort=False).first())
+
+        self.table = pd.DataFrame({
+            "Pays": self.names,
+            "ISO3": iso3.to_numpy(dtype=object),
+            "individuel": iso3.notna().to_numpy(),
+        })
+        # Une case de plus en fin de tableau : le code -1 (pays inconnu) y pointe
+        self._iso3 = np.append(self.table["ISO3"].to_numpy(), None)
+        self._individual = np.append(self.table["individuel"].to_numpy(), False)
+
+    def _codes(self, pays):
+        if isinstance(pays.dtype, pd.CategoricalDtype) and pays.cat.categories.equals(self.names):
+            return pays.cat.codes.to_numpy()
+        return self.names.get_indexer(pays)
+
+    def iso3(self, pays):
+        """Codes ISO3 (None pour les agrégats) d'une série de noms de pays"""
+        return self._iso3[self._codes(pays)]
+
+    def individual(self, pays):
+        """Masque des pays individuels d'une série de noms de pays"""
+        return self._individual[self._codes(pays)]
+
+    def individual_rows(self, df):
+        """Lignes de `df` portant sur un pays individuel"""
+        return df.take(np.flatnonzero(self.individual(df["Pays"])))
+
+
+country_table = frame_cache(CountryTable)
@@ -0,0 +1,231 @@
+# src/utils/cube.py
+import numpy as np
+import pandas as pd
+
+from src.utils.time_axis import ORDINAL_COL, frame_cache
+
+DIMENSIONS = ["Region", "Pays"]
+SUM_MEASURES = ["Nombre de touristes", "Nuitées touristiques"]
+MEAN_MEASURE = "Durée de séjour moyenne"
+MEASURES = SUM_MEASURES + [MEAN_MEASURE]
+
+
+# Décimales maximales pour stocker une mesure en virgule fixe
+MAX_DECIMALS = 4
+
+
+def fixed_point_scale(values):
+    """
+    Facteur 10**d qui rend toutes les valeurs entières (mesures publiées avec
+    d décimales), ou None. Les sommes de ces entiers sont exactes : une durée
+    moyenne de 10,0 j ne devient pas 10,000000000000002 selon l'ordre des
+    additions et tombe toujours dans le même intervalle d'histogramme.
+    """
+    values = values[~np.isnan(values)]
+    for decimals in range(MAX_DECIMALS + 1):
+        scale = 10 ** decimals
+        scaled = values * scale
+        if np.abs(scaled).sum() >= 2 ** 53:
+            return None
+        if np.allclose(scaled, np.round(scaled), rtol=0, atol=1e-6):
+            return scale
+    return None
+
+
+def month_dates(ordinals):
+    """Premier jour de chaque mois, à partir des ordinaux (année * 12 + mois - 1)"""
+    return (np.asarray(ordinals, dtype="int64") - 1970 * 12).astype("datetime64[M]").astype("datetime64[ns]")
+
+
+class RegionCube:
+    """
+    Cube d'agrégats Région × Pays × Mois de frequentation_region.
+
+    Une cellule par combinaison présente, triée par mois, avec les sommes des
+    mesures, la somme et le nombre de durées renseignées (pour recomposer
+    une moyenne exacte) et le nombre de lignes. Les agrégats par région, par
+    pays et par mois sur toute la période sont matérialisés à la construction,
+    et des cumuls mensuels par région et par pays répondent à n'importe quelle
+    période en une soustraction ; les autres requêtes ne parcourent que les
+    cellules, pas les lignes brutes.
+    """
+
+    def __init__(self, df):
+        self.categories = {dim: df[dim].cat.categories for dim in DIMENSIONS}
+        self.dtypes = {col: df[col].dtype for col in SUM_MEASURES}
+        self.scales = {}
+
+        keys = pd.DataFrame({
+            "month": df[ORDINAL_COL].to_numpy(),
+            "Region": df["Region"].cat.codes.to_numpy(),
+            "Pays": df["Pays"].cat.codes.to_numpy(),
+        })
+        measures = pd.DataFrame({col: self._scaled(df, col, col) for col in SUM_MEASURES})
+        durations = df[MEAN_MEASURE].to_numpy(dtype="float64")
+        measures["duree_sum"] = np.nan_to_num(self._scaled(df, MEAN_MEASURE, "duree_sum"))
+        measures["duree_count"] = (~np.isnan(durations)).astype("float64")
+        measures["rows"] = 1.0
+
+        cells = pd.concat([keys, measures], axis=1).groupby(
+            ["month", "Region", "Pays"], sort=True
+        ).sum().reset_index()
+
+        self.month = cells["month"].to_numpy()
+        self.codes = {dim: cells[dim].to_numpy() for dim in DIMENSIONS}
+        self.values = {col: cells[col].to_numpy() for col in SUM_MEASURES + ["duree_sum", "duree_count", "rows"]}
+        self.months = np.unique(self.month)
+
+        # Cumuls mensuels par région, par pays et toutes lignes confondues
+        self._prefix = {dim: self._build_prefix(self.codes[dim], len(self.categories[dim])) for dim in DIMENSIONS}
+        self._prefix[None] = self._build_prefix(np.zeros(len(self.month), dtype="int64"), 1)
+
+        # Agrégats matérialisés : toute la période, toutes les régions
+        self._rollups = {dim: self._compute([dim]) for dim in ["Region", "Pays", "Mois"]}
+
+    def _scaled(self, df, col, name):
+        """Valeurs de `col` en virgule fixe quand c'est possible (échelle notée pour `name`)"""
+        values = df[col].to_numpy(dtype="float64")
+        scale = fixed_point_scale(values)
+        if scale is None:
+            return values
+        self.scales[name] = scale
+        return np.round(values * scale)
+
+    def _build_prefix(self, codes, n_groups):
+        """
+        Sommes cumulées sur l'axe des mois pour chaque groupe : la ligne i
+        contient les totaux des i premiers mois, une période [a, b] vaut donc
+        prefix[b + 1] - prefix[a]. Les mesures en virgule fixe étant des
+        entiers, la soustraction reste exacte.
+        """
+        month_pos = np.searchsorted(self.months, self.month)
+        valid = codes >= 0
+        flat = month_pos[valid] * n_groups + codes[valid]
+        size = len(self.months) * n_groups
+
+        prefix = {}
+        for col, values in self.values.items():
+            grid = np.bincount(flat, weights=values[valid], minlength=size).reshape(len(self.months), n_groups)
+            prefix[col] = np.vstack([np.zeros((1, n_groups)), np.cumsum(grid, axis=0)])
+        return prefix
+
+    def _month_bounds(self, months):
+        """Positions [début, fin) d'une période d'ordinaux dans l'axe des mois du cube"""
+        if months is None:
+            return 0, len(self.months)
+        lo = int(np.searchsorted(self.months, months[0], side="left"))
+        hi = int(np.searchsorted(self.months, months[1], side="right"))
+        return lo, max(lo, hi)
+
+    def _range_sums(self, dim, months):
+        """Sommes de chaque groupe de `dim` sur la période : une soustraction par groupe"""
+        lo, hi = self._month_bounds(months)
+        return {col: prefix[hi] - prefix[lo] for col, prefix in self._prefix[dim].items()}
+
+    def _select(self, months=None, regions=None):
+        """Tranche des cellules de la période, puis masque des régions demandées"""
+        lo, hi = 0, len(self.month)
+        if months is not None:
+            lo = int(np.searchsorted(self.month, months[0], side="left"))
+            hi = max(lo, int(np.searchsorted(self.month, months[1], side="right")))
+        selection = np.arange(lo, hi)
+
+        if regions is not None:
+            codes = self.categories["Region"].get_indexer(list(regions))
+            selection = selection[np.isin(self.codes["Region"][lo:hi], codes[codes >= 0])]
+        return selection
+
+    def _measures(self, sums):
+        """Mesures finales à partir des sommes : entiers restitués, moyenne recomposée"""
+        out = {}
+        for col in SUM_MEASURES:
+            values = sums[col]
+            if np.dtype(self.dtypes[col]).kind in "iu":
+                values = np.rint(values).astype("int64")
+            elif col in self.scales:
+                values = values / self.scales[col]
+            out[col] = values
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[MEAN_MEASURE] = sums["duree_sum"] / self.scales.get("duree_sum", 1) / sums["duree_count"]
+        return out
+
+    def _group(self, dims, selection):
+        """Codes de groupe des cellules sélectionnées pour une ou plusieurs dimensions"""
+        columns = []
+        for dim in dims:
+            if dim == "Mois":
+                columns.append(np.searchsorted(self.months, self.month[selection]))
+            else:
+                columns.append(self.codes[dim][selection])
+        return columns
+
+    def rollup(self, by, months=None, regions=None, measures=MEASURES):
+        """
+        Agrégat par `by` ("Region", "Pays", "Mois" ou une liste de ces
+        dimensions), restreint à une période [début, fin] d'ordinaux de mois et
+        à une liste de régions. Seuls les groupes ayant des lignes sont
+        retournés, triés comme un groupby pandas, avec les colonnes `measures`.
+        """
+        dims = [by] if isinstance(by, str) else list(by)
+        if months is None and regions is None and isinstance(by, str) and by in self._rollups:
+            result = self._rollups[by]
+        elif regions is None and isinstance(by, str) and by in DIMENSIONS:
+            result = self._range_rollup(by, months)
+        else:
+            result = self._compute(dims, months, regions)
+        return result[dims + list(measures)].copy()
+
+    def _range_rollup(self, dim, months):
+        """Agrégat par région ou par pays d'une période, lu dans les cumuls"""
+        sums = self._range_sums(dim, months)
+        codes = np.flatnonzero(sums["rows"] > 0)
+        data = {dim: pd.Categorical.from_codes(codes, self.categories[dim])}
+        data.update(self._measures({col: values[codes] for col, values in sums.items()}))
+        return pd.DataFrame(data)
+
+    def _compute(self, dims, months=None, regions=None):
+        selection = self._select(months, regions)
+        columns = np.column_stack(self._group(dims, selection))
+
+        # Comme groupby, les cellules sans modalité (code -1) sont écartées
+        valid = (columns >= 0).all(axis=1)
+        selection, columns = selection[valid], columns[valid]
+        group_keys, inverse = np.unique(columns, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        sums = {
+            col: np.bincount(inverse, weights=values[selection], minlength=len(group_keys)).astype("float64")
+            for col, values in self.values.items()
+        }
+
+        data = {}
+        for i, dim in enumerate(dims):
+            codes = group_keys[:, i]
+            if dim == "Mois":
+                data[dim] = month_dates(self.months[codes])
+            else:
+                data[dim] = pd.Categorical.from_codes(codes, self.categories[dim])
+        data.update(self._measures(sums))
+        return pd.DataFrame(data)
+
+    def totals(self, months=None, regions=None):
+        """Sommes et durée moyenne sur la sélection (comme sum() et mean() sur les lignes)"""
+        if regions is None:
+            sums = self._range_sums(None, months)
+        else:
+            selection = self._select(months, regions)
+            sums = {col: np.array([values[selection].sum()]) for col, values in self.values.items()}
+        out = {col: values[0] for col, values in self._measures(sums).items()}
+        out["rows"] = int(sums["rows"][0])
+        return out
+
+    def members(self, dim, months=None, regions=None):
+        """Modalités de `dim` présentes dans la sélection"""
+        if regions is None:
+            codes = np.flatnonzero(self._range_sums(dim, months)["rows"] > 0)
+        else:
+            codes = np.unique(self.codes[dim][self._select(months, regions)])
+        return self.categories[dim][codes[codes >= 0]].tolist()
+
+
+region_cube = frame_cache(RegionCube)
@@ -1,6 +1,13 @@
 # src/utils/get_data.py
-import pandas as pd
+import argparse
+import base64
+import hashlib
+import http.client
+import json
 import os
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 # URLs des datasets
 URLS = {
@@ -12,16 +19,178 @@ URLS = {
 # Répertoire existant où stocker les fichiers
 RAW_DIR = "data/raw/"
 
-def load_raw_data():
-    dfs = {}
-    for name, url in URLS.items():
-        print(f"Téléchargement de {name}...")
-        df = pd.read_csv(url, sep=";")
-        dfs[name] = df
-        # Sauvegarde directe dans data/raw/
-        df.to_csv(os.path.join(RAW_DIR, f"{name}.csv"), index=False)
-        print(f"{name} sauvegardé dans {RAW_DIR}{name}.csv")
-    return dfs
+# Validateurs HTTP (ETag, Last-Modified) et empreintes des derniers téléchargements
+MANIFEST_FILE = ".downloads.json"
+BLOCK_SIZE = 64 * 1024
+TIMEOUT = 60
+
+
+def load_manifest(raw_dir=RAW_DIR):
+    path = os.path.join(raw_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest, raw_dir=RAW_DIR):
+    path = os.path.join(raw_dir, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            h.update(block)
+    return h
+
+
+def _expected_digest(response):
+    """Empreinte annoncée par le serveur (en-tête « Digest: sha-256=... »), si présente"""
+    for part in (response.headers.get("Digest") or "").split(","):
+        algo, _, value = part.strip().partition("=")
+        if algo.lower() == "sha-256" and value:
+            return base64.b64decode(value).hex()
+    return None
+
+
+def _expected_size(response):
+    """Taille complète annoncée (Content-Range pour une reprise, sinon Content-Length)"""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def download_file(name, url, entry=None, raw_dir=RAW_DIR, timeout=TIMEOUT):
+    """
+    Télécharge un dataset en streaming directement vers data/raw/<name>.csv.
+
+    - revalidation conditionnelle (If-None-Match / If-Modified-Since) : un 304
+      laisse le fichier local intact ;
+    - reprise d'un transfert interrompu (.part) avec une requête Range ;
+    - empreinte SHA-256 calculée au fil de l'eau et vérifiée si le serveur en
+      annonce une.
+
+    Retourne (statut, nouvelle entrée du manifeste).
+    """
+    entry = entry or {}
+    final_path = os.path.join(raw_dir, f"{name}.csv")
+    part_path = final_path + ".part"
+    # ETag de la version en cours de transfert, pour reprendre le bon fichier
+    part_etag_path = part_path + ".etag"
+
+    headers = {}
+    if os.path.exists(final_path):
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    # Reprise uniquement si l'on sait à quelle version appartient le fichier partiel
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if offset and os.path.exists(part_etag_path):
+        with open(part_etag_path, encoding="utf-8") as f:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = f.read().strip()
+
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return "inchangé", entry
+        raise
+
+    with response:
+        resumed = response.status == 206
+        digest = _sha256_file(part_path) if resumed else hashlib.sha256()
+        etag = response.headers.get("ETag")
+        if etag and not resumed:
+            with open(part_etag_path, "w", encoding="utf-8") as f:
+                f.write(etag)
+
+        with open(part_path, "ab" if resumed else "wb") as f:
+            for block in iter(lambda: response.read(BLOCK_SIZE), b""):
+                f.write(block)
+                digest.update(block)
+
+        # Transfert coupé : le fichier partiel est gardé pour être repris
+        expected_size = _expected_size(response)
+        received = os.path.getsize(part_path)
+        if expected_size is not None and received < expected_size:
+            raise ConnectionError(f"{name}: transfert interrompu ({received}/{expected_size} octets)")
+
+        expected = _expected_digest(response)
+        if expected is not None and expected != digest.hexdigest():
+            os.remove(part_path)
+            raise ValueError(f"{name}: empreinte SHA-256 invalide")
+
+        os.replace(part_path, final_path)
+        if os.path.exists(part_etag_path):
+            os.remove(part_etag_path)
+
+        new_entry = {
+            "url": url,
+            "etag": etag,
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": digest.hexdigest(),
+            "size": os.path.getsize(final_path),
+        }
+
+    if entry.get("sha256") == new_entry["sha256"]:
+        return "identique", new_entry
+    return "repris" if resumed else "téléchargé", new_entry
+
+
+def load_raw_data(urls=URLS, raw_dir=RAW_DIR, max_workers=None):
+    """
+    Télécharge tous les datasets en parallèle (un thread par fichier).
+
+    La durée d'une mise à jour est celle du fichier le plus lent, et un
+    dataset inchangé côté serveur ne coûte qu'une requête conditionnelle.
+    Retourne le statut de chaque téléchargement.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    manifest = load_manifest(raw_dir)
+    statuses = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(urls)) as pool:
+        futures = {}
+        for name, url in urls.items():
+            print(f"Téléchargement de {name}...")
+            futures[name] = pool.submit(download_file, name, url, manifest.get(name), raw_dir)
+
+        for name, future in futures.items():
+            try:
+                status, entry = future.result()
+            except (OSError, ValueError, http.client.HTTPException) as e:
+                # Le fichier .part éventuel sera repris au prochain lancement
+                statuses[name] = "erreur"
+                print(f"  Échec: {e}")
+                continue
+            manifest[name] = entry
+            statuses[name] = status
+            print(f"  {name} {status} ({raw_dir}{name}.csv)")
+
+    save_manifest(manifest, raw_dir)
+    return statuses
+
 
 if __name__ == "__main__":
-    load_raw_data()
+    parser = argparse.ArgumentParser(description="Téléchargement des données brutes")
+    parser.add_argument("--base-url", default=None,
+                        help="serveur alternatif (ex. src/utils/local_data_server.py) "
+                             "servant <base-url>/<dataset>.csv")
+    args = parser.parse_args()
+
+    urls = URLS
+    if args.base_url:
+        urls = {name: f"{args.base_url.rstrip('/')}/{name}.csv" for name in URLS}
+    load_raw_data(urls)
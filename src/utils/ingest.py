@@ -0,0 +1,145 @@
+# src/utils/ingest.py
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.utils.clean_data import (CLEANED_DIR, FILES, RAW_DIR, clean_frame, detect_sep,
+                                      file_digests, hashes_path, load_manifest, read_raw,
+                                      save_manifest)
+    from src.utils.columnar_cache import write_columnar
+except ImportError:  # exécution directe : python src/utils/ingest.py
+    from clean_data import (CLEANED_DIR, FILES, RAW_DIR, clean_frame, detect_sep,
+                            file_digests, hashes_path, load_manifest, read_raw,
+                            save_manifest)
+    from columnar_cache import write_columnar
+
+# Clé naturelle d'une ligne : un millésime plus récent remplace la même clé
+KEY_COLS = ["Mois", "Année", "Region", "Pays"]
+TIME_COLS = ["Mois", "Année"]
+
+
+def dataset_of(path):
+    """Dataset d'un fichier brut d'après son nom (ex. frequentation_region_2025-09.csv)"""
+    stem = path.stem
+    matches = [raw_file for raw_file in FILES if stem.startswith(Path(raw_file).stem)]
+    return max(matches, key=len) if matches else None
+
+
+def discover_raw_files(raw_dir=RAW_DIR):
+    """
+    Liste les fichiers bruts de chaque dataset, du plus ancien au plus récent.
+
+    Les millésimes archivés (sous-dossiers ou suffixes datés) sont triés par
+    chemin ; le fichier courant à la racine de data/raw passe en dernier.
+    """
+    found = {raw_file: [] for raw_file in FILES}
+    for path in raw_dir.rglob("*.csv"):
+        dataset = dataset_of(path)
+        if dataset is not None:
+            found[dataset].append(path)
+
+    def vintage_order(path):
+        is_current = path.parent == raw_dir and path.name in FILES
+        return (is_current, path.relative_to(raw_dir).as_posix())
+
+    return {
+        dataset: sorted(paths, key=vintage_order)
+        for dataset, paths in found.items() if paths
+    }
+
+
+def clean_raw_file(path):
+    """Nettoie un fichier brut (exécuté dans un processus du pool)"""
+    start = time.perf_counter()
+    df = read_raw(path, sep=detect_sep(path))
+    n_raw = len(df)
+    df, hashes = clean_frame(df, verbose=False)
+    df["_hash"] = hashes
+    return path, df, n_raw, time.perf_counter() - start
+
+
+def merge_vintages(frames):
+    """
+    Fusionne les millésimes d'un dataset de façon déterministe.
+
+    Les frames arrivent dans l'ordre des millésimes : pour une même clé
+    (mois ou année, région, pays), la version la plus récente est conservée,
+    puis les lignes sont triées comme dans les fichiers publiés.
+    """
+    df = pd.concat(frames, ignore_index=True)
+    keys = [col for col in KEY_COLS if col in df.columns]
+    if keys:
+        df = df.drop_duplicates(subset=keys, keep="last")
+
+        time_cols = [col for col in TIME_COLS if col in keys]
+        df = df.sort_values(keys, ascending=[col not in time_cols for col in keys], kind="stable")
+    else:
+        df = df.drop_duplicates(subset=[col for col in df.columns if col != "_hash"], keep="last")
+    return df.reset_index(drop=True)
+
+
+def ingest(raw_dir=RAW_DIR, workers=None, dry_run=False):
+    """Nettoie tous les millésimes en parallèle puis reconstruit le store nettoyé"""
+    raw_files = discover_raw_files(raw_dir)
+    all_paths = [path for paths in raw_files.values() for path in paths]
+    print(f"{len(all_paths)} fichiers bruts trouvés dans {raw_dir}")
+    for dataset, paths in raw_files.items():
+        print(f"  {dataset}: {len(paths)} millésime(s)")
+    if dry_run or not all_paths:
+        return {}
+
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, df, n_raw, elapsed in pool.map(clean_raw_file, all_paths):
+            results[path] = (df, n_raw)
+            print(f"  {path.relative_to(raw_dir)}: {n_raw} → {len(df)} lignes ({elapsed:.2f} s)")
+    print(f"Nettoyage parallèle: {time.perf_counter() - start:.2f} s\n")
+
+    manifest = load_manifest()
+    merged = {}
+    for dataset, paths in raw_files.items():
+        df = merge_vintages([results[path][0] for path in paths])
+        hashes = df.pop("_hash").to_numpy(dtype=np.uint64)
+
+        cleaned_path = CLEANED_DIR / FILES[dataset]
+        df.to_csv(cleaned_path, index=False, sep=",", encoding="utf-8")
+        np.save(hashes_path(cleaned_path), hashes)
+        write_columnar(df, cleaned_path)
+        print(f"  ✓ {cleaned_path.name}: {len(df)} lignes")
+
+        # Le fichier courant est marqué comme traité pour le nettoyage incrémental
+        current = raw_dir / dataset
+        if current in paths:
+            digest, _ = file_digests(current, 0)
+            manifest[dataset] = {
+                "sha256": digest,
+                "size": current.stat().st_size,
+                "rows": results[current][1],
+                "columns": df.columns.tolist()
+            }
+        merged[dataset] = df
+
+    save_manifest(manifest)
+    print(f"\nIngestion terminée en {time.perf_counter() - start:.2f} s")
+    return merged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Ingestion de tous les millésimes bruts de data/raw (nettoyage parallèle)"
+    )
+    parser.add_argument("--raw-dir", type=Path, default=RAW_DIR,
+                        help="dossier des fichiers bruts (parcouru récursivement)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (par défaut : nombre de cœurs)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="liste les fichiers trouvés sans rien nettoyer")
+    args = parser.parse_args()
+
+    ingest(args.raw_dir.resolve(), workers=args.workers, dry_run=args.dry_run)
@@ -1,45 +1,89 @@
 # src/utils/load_data.py
+import hashlib
 import pandas as pd
 import os
 
+from src.utils.columnar_cache import read_columnar, write_columnar
+from src.utils.schema import apply_schema, memory_usage, read_only
+from src.utils.time_axis import add_month_axis
+
 CLEANED_DIR = "data/cleaned/"
 
-def load_cleaned_data():
-    files = {
-        "frequentation_hoteliere": "frequentation_hoteliere_cleaned.csv",
-        "frequentation_mensuelle": "frequentation_mensuelle_cleaned.csv",
-        "frequentation_region": "frequentation_region_cleaned.csv",
-    }
-
-    dfs = {}
-    for key, filename in files.items():
+FILES = {
+    "frequentation_hoteliere": "frequentation_hoteliere_cleaned.csv",
+    "frequentation_mensuelle": "frequentation_mensuelle_cleaned.csv",
+    "frequentation_region": "frequentation_region_cleaned.csv",
+}
+
+
+def cleaned_fingerprint():
+    """Empreinte des fichiers nettoyés (nom, taille, date de modification)"""
+    h = hashlib.sha1()
+    for filename in sorted(FILES.values()):
         path = os.path.join(CLEANED_DIR, filename)
-        
-        print(f"Chargement de {filename}...")
-        
+        if os.path.exists(path):
+            stat = os.stat(path)
+            h.update(f"{filename}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def load_dataset(key):
+    """Charge et type un dataset nettoyé (Parquet en priorité, sinon CSV)"""
+    filename = FILES[key]
+    path = os.path.join(CLEANED_DIR, filename)
+
+    print(f"Chargement de {filename}...")
+
+    # Artefact Parquet typé en priorité, CSV seulement s'il est absent ou périmé
+    df = read_columnar(path)
+    from_csv = df is None
+    if from_csv:
         # Lecture simple avec virgule
         df = pd.read_csv(path, sep=",", encoding="utf-8")
-        
-        print(f"  Colonnes: {df.columns.tolist()}")
-        print(f"  Shape: {df.shape}")
-        
-        # Conversion des colonnes numériques si nécessaire
-        num_cols = ["Nombre de touristes", "Nombre de croisièristes", 
-                   "Nuitées touristiques", "Durée de séjour moyenne"]
-        for col in num_cols:
-            if col in df.columns:
-                # Si déjà numérique, on skip
-                if df[col].dtype in ['int64', 'float64']:
-                    continue
-                df[col] = pd.to_numeric(
-                    df[col].astype(str).str.replace(",", "."), 
-                    errors="coerce"
-                )
-
-        dfs[key] = df
-        print(f"  ✓ Chargé avec succès\n")
-
-    return dfs
+
+    print(f"  Source: {'CSV' if from_csv else 'Parquet'}")
+    print(f"  Colonnes: {df.columns.tolist()}")
+    print(f"  Shape: {df.shape}")
+
+    # Conversion des colonnes numériques si nécessaire
+    num_cols = ["Nombre de touristes", "Nombre de croisièristes", 
+               "Nuitées touristiques", "Durée de séjour moyenne"]
+    for col in num_cols:
+        if col in df.columns:
+            # Si déjà numérique, on skip
+            if df[col].dtype in ['int64', 'float64']:
+                continue
+            df[col] = pd.to_numeric(
+                df[col].astype(str).str.replace(",", "."), 
+                errors="coerce"
+            )
+
+    # On régénère l'artefact pour que les démarrages suivants évitent le CSV
+    if from_csv:
+        try:
+            write_columnar(df, path)
+        except OSError as e:
+            print(f"  Artefact colonnaire non écrit: {e}")
+
+    # Schéma compact : dimensions catégorielles, comptages en 32 bits
+    mem_before = memory_usage(df)
+    df = apply_schema(df)
+    mem_after = memory_usage(df)
+    print(f"  Mémoire: {mem_before/1024:.0f} Ko → {mem_after/1024:.0f} Ko")
+
+    # Axe mensuel typé (datetime + ordinal), trié une fois pour toutes
+    df = add_month_axis(df)
+
+    # Partagé entre toutes les requêtes : lecture seule, jamais copié
+    df = read_only(df)
+
+    print(f"  ✓ Chargé avec succès\n")
+    return df
+
+
+def load_cleaned_data():
+    """Charge tous les datasets nettoyés"""
+    return {key: load_dataset(key) for key in FILES}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+# src/utils/local_data_server.py
+"""
+Serveur HTTP local qui imite data.gouv.fr pour tester get_data hors ligne.
+
+Il sert les fichiers d'un dossier avec ETag, Last-Modified, Digest (SHA-256),
+requêtes conditionnelles (304) et partielles (Range / If-Range, 206).
+L'option --fail-after coupe chaque réponse complète après N octets, pour
+simuler un transfert interrompu puis vérifier sa reprise.
+
+    python src/utils/local_data_server.py --dir data/raw --port 8765
+    python src/utils/get_data.py --base-url http://127.0.0.1:8765
+"""
+import argparse
+import base64
+import hashlib
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _file_info(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).digest()
+    return {
+        "content": content,
+        "etag": f'"{digest.hex()[:32]}"',
+        "digest": "sha-256=" + base64.b64encode(digest).decode("ascii"),
+        "mtime": int(os.path.getmtime(path)),
+    }
+
+
+def make_handler(directory, fail_after=None):
+    """Construit la classe de handler servant `directory`"""
+
+    class DataHandler(BaseHTTPRequestHandler):
+
+        def log_message(self, format, *args):
+            print(f"  [serveur] {self.address_string()} {format % args}")
+
+        def do_GET(self):
+            name = os.path.basename(self.path.split("?")[0])
+            path = os.path.join(directory, name)
+            if not name or not os.path.isfile(path):
+                self.send_error(404)
+                return
+
+            info = _file_info(path)
+            content = info["content"]
+
+            if self._not_modified(info):
+                self.send_response(304)
+                self.send_header("ETag", info["etag"])
+                self.end_headers()
+                return
+
+            start = self._range_start(info, len(content))
+            status = 206 if start is not None else 200
+            body = content[start:] if start is not None else content
+
+            self.send_response(status)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", info["etag"])
+            self.send_header("Last-Modified", formatdate(info["mtime"], usegmt=True))
+            self.send_header("Digest", info["digest"])
+            self.send_header("Accept-Ranges", "bytes")
+            if start is not None:
+                self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+            self.end_headers()
+
+            if fail_after is not None and status == 200:
+                # Transfert interrompu : le client devra reprendre avec Range
+                self.wfile.write(body[:fail_after])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+
+        def _not_modified(self, info):
+            if_none_match = self.headers.get("If-None-Match")
+            if if_none_match is not None:
+                return info["etag"] in [tag.strip() for tag in if_none_match.split(",")]
+
+            if_modified_since = self.headers.get("If-Modified-Since")
+            if if_modified_since:
+                try:
+                    return info["mtime"] <= parsedate_to_datetime(if_modified_since).timestamp()
+                except (TypeError, ValueError):
+                    return False
+            return False
+
+        def _range_start(self, info, size):
+            """Début de la plage demandée, ou None pour une réponse complète"""
+            range_header = self.headers.get("Range", "")
+            if not range_header.startswith("bytes="):
+                return None
+            if_range = self.headers.get("If-Range")
+            if if_range is not None and if_range != info["etag"]:
+                return None
+            try:
+                start = int(range_header[len("bytes="):].split("-")[0])
+            except ValueError:
+                return None
+            return start if 0 <= start < size else None
+
+    return DataHandler
+
+
+def start_server(directory, host="127.0.0.1", port=0, fail_after=None):
+    """Démarre le serveur dans un thread ; retourne (serveur, URL de base)"""
+    server = ThreadingHTTPServer((host, port), make_handler(directory, fail_after))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur local de données de test")
+    parser.add_argument("--dir", default="data/raw", help="dossier des fichiers servis")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-after", type=int, default=None,
+                        help="coupe les réponses complètes après N octets")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.dir, args.fail_after))
+    print(f"Serveur de données sur http://{args.host}:{args.port} ({args.dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,172 @@
+# src/utils/memo.py
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from collections import OrderedDict
+
+from flask import jsonify
+from plotly.io.json import to_json_plotly
+
+# Budget mémoire par défaut d'un cache (remplacé par config au démarrage)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _normalize(value):
+    """Forme canonique d'une entrée de callback (10.0 et 10 donnent la même clé)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+
+def input_key(args, kwargs):
+    """Empreinte des entrées normalisées d'un appel"""
+    payload = json.dumps([_normalize(list(args)), _normalize(kwargs)], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def output_size(value):
+    """Taille approximative d'une sortie de callback : sa sérialisation JSON par Dash"""
+    return len(to_json_plotly(value))
+
+
+class LRUCache:
+    """
+    Cache LRU borné en octets, dont les clés sont des tuples
+    (nom, identifiant de snapshot, empreinte).
+
+    Les entrées les moins récemment utilisées sont évincées quand le budget
+    est dépassé ; `max_bytes = 0` désactive le cache.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def drop_snapshot(self, snapshot_id):
+        """Retire les entrées calculées sur un snapshot remplacé"""
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == snapshot_id]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+
+class CallbackMemo(LRUCache):
+    """
+    Cache des sorties de callbacks. La clé combine le callback, ses entrées
+    normalisées et l'identifiant du snapshot de données : après un
+    rechargement, les anciennes sorties ne sont plus jamais servies.
+
+    Les callbacks décorés sont recensés par (module, nom) dans `callbacks`,
+    pour pouvoir être appelés hors requête (préchauffage).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(max_bytes)
+        self.callbacks = {}
+
+    def memoize(self, source):
+        """
+        Décorateur de callback : `source` est le dictionnaire de données passé
+        à register_callbacks, qui fournit l'identifiant du snapshot en cours.
+        À placer sous @app.callback. Les exceptions (PreventUpdate…) ne sont
+        pas mises en cache.
+        """
+        snapshot_id = getattr(source, "snapshot_id", lambda: None)
+
+        def decorator(func):
+            name = f"{func.__module__}.{func.__qualname__}"
+            signature = inspect.signature(func)
+
+            def cache_key(*args, **kwargs):
+                # Valeurs par défaut explicitées : f(a) et f(a, None) partagent la même clé
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return (name, snapshot_id(), input_key(bound.args, bound.kwargs))
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if self.max_bytes <= 0:
+                    return func(*args, **kwargs)
+
+                key = cache_key(*args, **kwargs)
+                entry = self.get(key)
+                if entry is not None:
+                    return entry[0]
+
+                value = func(*args, **kwargs)
+                self.put(key, value, output_size(value))
+                return value
+
+            wrapper.cache_key = cache_key
+            self.callbacks[(func.__module__, func.__name__)] = wrapper
+            return wrapper
+
+        return decorator
+
+
+def install_stats(server, caches, route="/_memo"):
+    """Expose en GET les compteurs de plusieurs caches nommés"""
+    @server.route(route, methods=["GET"])
+    def cache_stats():
+        return jsonify({name: cache.stats() for name, cache in caches.items()})
+
+
+# Cache partagé par les callbacks de toutes les pages
+callback_memo = CallbackMemo()
+memoize = callback_memo.memoize
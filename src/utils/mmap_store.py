@@ -0,0 +1,238 @@
+# src/utils/mmap_store.py
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.utils.load_cleaned_data import CLEANED_DIR, cleaned_fingerprint, load_cleaned_data
+from src.utils.registry import StaleDataError
+from src.utils.schema import read_only
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrous flock, les anciennes versions sont conservées
+    fcntl = None
+
+# Un sous-dossier par version des données nettoyées : data/cleaned/mmap/<empreinte>/
+STORE_DIR = os.path.join(CLEANED_DIR, "mmap")
+META_FILE = "meta.json"
+# Verrou d'une version : partagé par chaque store ouvert, exclusif pour la supprimer
+LOCK_FILE = ".lock"
+# Version du format des fichiers : l'incrémenter force la reconstruction du store
+STORE_VERSION = 4
+
+
+def _write_frame(df, frame_dir):
+    """Écrit chaque colonne d'un DataFrame dans un fichier .npy"""
+    os.makedirs(frame_dir)
+    columns = []
+    for i, col in enumerate(df.columns):
+        filename = f"col_{i}.npy"
+        series = df[col]
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Dimensions du schéma : les codes catégoriels sont mappés tels quels
+            np.save(os.path.join(frame_dir, filename), series.cat.codes.to_numpy())
+            columns.append({
+                "name": col,
+                "file": filename,
+                "kind": "categorical",
+                "categories": [str(c) for c in series.cat.categories]
+            })
+        elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+            # Axe mensuel : datetime64 mappé tel quel, comme une colonne numérique
+            np.save(os.path.join(frame_dir, filename), series.to_numpy(dtype="datetime64[ns]"))
+            columns.append({"name": col, "file": filename, "kind": "numeric"})
+        elif pd.api.types.is_numeric_dtype(series.dtype):
+            np.save(os.path.join(frame_dir, filename), series.to_numpy())
+            columns.append({"name": col, "file": filename, "kind": "numeric"})
+        else:
+            # Colonnes texte : codes entiers partagés + dictionnaire des valeurs
+            codes, uniques = pd.factorize(series, sort=True)
+            np.save(os.path.join(frame_dir, filename), codes.astype(np.int32))
+            columns.append({
+                "name": col,
+                "file": filename,
+                "kind": "codes",
+                "categories": [str(u) for u in uniques]
+            })
+
+    with open(os.path.join(frame_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "columns": columns}, f, ensure_ascii=False)
+
+
+def _read_frame(frame_dir):
+    """Reconstruit un DataFrame dont les colonnes pointent vers les fichiers mappés"""
+    with open(os.path.join(frame_dir, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+
+    data = {}
+    for column in meta["columns"]:
+        values = np.load(os.path.join(frame_dir, column["file"]), mmap_mode="r")
+        if column["kind"] == "categorical":
+            values = pd.Categorical.from_codes(values, column["categories"], validate=False)
+        elif column["kind"] == "codes":
+            categories = np.array(column["categories"] + [np.nan], dtype=object)
+            # Le code -1 (valeur manquante) pointe sur le NaN ajouté en fin de tableau
+            values = categories.take(values)
+        data[column["name"]] = values
+
+    return read_only(pd.DataFrame(data, copy=False))
+
+
+def build_mmap_store(dfs, fingerprint, store_dir=STORE_DIR):
+    """
+    Écrit les DataFrames dans un dossier versionné de fichiers .npy.
+
+    La construction se fait dans un dossier temporaire renommé à la fin :
+    si un autre worker a déjà publié la même version, la sienne est conservée.
+    Une fois la version publiée, les anciennes versions inutilisées sont supprimées.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    version_dir = os.path.join(store_dir, fingerprint)
+    if os.path.isdir(version_dir):
+        return version_dir
+
+    tmp_dir = tempfile.mkdtemp(prefix=".build-", dir=store_dir)
+    try:
+        for key, df in dfs.items():
+            _write_frame(df, os.path.join(tmp_dir, key))
+        os.rename(tmp_dir, version_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(version_dir):
+            raise
+        return version_dir
+
+    removed = prune_versions(store_dir, keep={fingerprint})
+    if removed:
+        print(f"Anciennes versions du store supprimées: {', '.join(removed)}")
+    return version_dir
+
+
+def _lock_version(version_dir):
+    """
+    Pose un verrou partagé sur une version et retourne son descripteur (None
+    sans fcntl). FileNotFoundError si la version a été supprimée entre-temps.
+    """
+    if fcntl is None:
+        return None
+    path = os.path.join(version_dir, LOCK_FILE)
+    fd = os.open(path, os.O_RDONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        # Version supprimée pendant l'attente du verrou : le fichier verrouillé n'est plus le sien
+        if os.fstat(fd).st_ino != os.stat(path).st_ino:
+            raise FileNotFoundError(version_dir)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def prune_versions(store_dir=STORE_DIR, keep=()):
+    """
+    Supprime les versions du store qu'aucun snapshot vivant n'utilise.
+
+    Chaque MmapStore garde un verrou partagé sur sa version jusqu'à sa
+    libération, dans tous les workers : une version dont on obtient le verrou
+    exclusif n'est donc ouverte nulle part. Elle est d'abord renommée (plus
+    aucun worker ne peut l'ouvrir), puis effacée. Les dossiers cachés
+    (constructions en cours) et `keep` ne sont jamais touchés.
+    Retourne les versions supprimées.
+    """
+    if fcntl is None:
+        return []
+    removed = []
+    for name in sorted(os.listdir(store_dir)):
+        version_dir = os.path.join(store_dir, name)
+        if name in keep or name.startswith(".") or not os.path.isdir(version_dir):
+            continue
+        try:
+            fd = os.open(os.path.join(version_dir, LOCK_FILE), os.O_RDONLY | os.O_CREAT, 0o644)
+        except OSError:
+            # Supprimée au même moment par un autre worker
+            continue
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            trash_dir = tempfile.mkdtemp(prefix=".old-", dir=store_dir)
+            os.rename(version_dir, os.path.join(trash_dir, name))
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            removed.append(name)
+        finally:
+            os.close(fd)
+    return removed
+
+
+class MmapStore(Mapping):
+    """
+    Dictionnaire de DataFrames adossés à des fichiers mappés en mémoire.
+
+    Les colonnes numériques ne sont jamais copiées : tous les workers d'une
+    même machine partagent les mêmes pages via le cache du système. Le store
+    verrouille sa version tant qu'il est vivant, pour que `prune_versions`
+    ne la supprime pas.
+    """
+
+    def __init__(self, version_dir, version=None):
+        self.version_dir = version_dir
+        self.version = version
+        lock_fd = _lock_version(version_dir)
+        if lock_fd is not None:
+            weakref.finalize(self, os.close, lock_fd)
+        self._keys = sorted(
+            name for name in os.listdir(version_dir)
+            if os.path.isfile(os.path.join(version_dir, name, META_FILE))
+        )
+        self._frames = {}
+
+    def __getitem__(self, key):
+        if key not in self._frames:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._frames[key] = _read_frame(os.path.join(self.version_dir, key))
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def open_mmap_store(store_dir=STORE_DIR):
+    """Ouvre le store de la version courante, en le construisant si nécessaire"""
+    version = cleaned_fingerprint()
+    fingerprint = f"{version}-v{STORE_VERSION}"
+    version_dir = os.path.join(store_dir, fingerprint)
+
+    if not os.path.isdir(version_dir):
+        print(f"Construction du store mmap ({fingerprint})...")
+        dfs = load_cleaned_data()
+        # Fichiers modifiés pendant la lecture : ne pas publier un mélange sous cette version
+        if cleaned_fingerprint() != version:
+            raise StaleDataError(f"fichiers nettoyés modifiés pendant la construction de {fingerprint}")
+        build_mmap_store(dfs, fingerprint, store_dir)
+
+    print(f"Store mmap: {version_dir}")
+    try:
+        return MmapStore(version_dir, version)
+    except FileNotFoundError:
+        # Supprimée par un worker qui a publié une version plus récente
+        raise StaleDataError(f"{fingerprint} remplacée pendant son ouverture")
+
+
+if __name__ == "__main__":
+    store = open_mmap_store()
+    for k, df in store.items():
+        print(f"\n=== {k} ===")
+        print(f"Shape: {df.shape}")
+        print(df.dtypes)
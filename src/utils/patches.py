@@ -0,0 +1,35 @@
+# src/utils/patches.py
+from dash import Patch
+
+# Propriétés des traces qui portent les valeurs ; le reste (style, axes, géo, thème) ne bouge pas
+TRACE_FIELDS = ["x", "y", "z", "text", "locations", "lat", "lon", "hovertext", "customdata"]
+MARKER_FIELDS = ["color", "size", "sizeref"]
+
+
+def values_patch(fig, layout_fields=()):
+    """
+    Patch qui remplace, dans la figure déjà affichée par le navigateur, les
+    seules valeurs des traces de `fig` et les champs de mise en page demandés
+    (chemins pointés, ex. "title.text").
+
+    À réserver au cas où la figure affichée a la même structure que `fig`
+    (mêmes traces, même indicateur) : seules les données ont changé.
+    """
+    patch = Patch()
+    for i, trace in enumerate(fig.data):
+        props = trace.to_plotly_json()
+        for field in TRACE_FIELDS:
+            if field in props:
+                patch["data"][i][field] = props[field]
+        marker = props.get("marker", {})
+        for field in MARKER_FIELDS:
+            if field in marker:
+                patch["data"][i]["marker"][field] = marker[field]
+
+    for path in layout_fields:
+        keys = path.split(".")
+        value, target = fig.layout, patch["layout"]
+        for key in keys[:-1]:
+            value, target = value[key], target[key]
+        target[keys[-1]] = value[keys[-1]]
+    return patch
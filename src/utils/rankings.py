@@ -0,0 +1,100 @@
+# src/utils/rankings.py
+import threading
+import weakref
+
+import numpy as np
+
+from src.utils.countries import country_table
+from src.utils.row_index import row_index
+from src.utils.time_axis import frame_cache
+
+CRITERIA = [
+    "Nombre de touristes",
+    "Nuitées touristiques",
+    "Durée de séjour moyenne",
+    "Intensité économique",
+]
+
+
+def aggregate_by_country(df):
+    """Sommes, durée moyenne, région et intensité économique par pays"""
+    aggregations = {
+        "Nombre de touristes": "sum",
+        "Nuitées touristiques": "sum",
+        "Durée de séjour moyenne": "mean",
+    }
+    if "Region" in df.columns:
+        aggregations["Region"] = "first"
+    df_pays = df.groupby("Pays", as_index=False, observed=True).agg(aggregations)
+    df_pays["Intensité économique"] = df_pays["Nuitées touristiques"] / df_pays["Nombre de touristes"]
+    return df_pays
+
+
+class Ranking:
+    """
+    Classement complet des pays d'une sélection, pour chaque critère.
+
+    Les ordres sont calculés une fois par tri stable (à égalité, l'ordre des
+    pays est conservé, comme nlargest/nsmallest) et sans les valeurs
+    manquantes : un top N n'est plus qu'une tranche.
+    """
+
+    def __init__(self, df_pays):
+        self.df = df_pays
+        self._orders = {}
+        for criterion in CRITERIA:
+            values = df_pays[criterion].to_numpy(dtype="float64")
+            valid = np.flatnonzero(~np.isnan(values))
+            self._orders[criterion] = {
+                True: valid[np.argsort(-values[valid], kind="stable")],
+                False: valid[np.argsort(values[valid], kind="stable")],
+            }
+
+    def top(self, criterion, n, largest=True):
+        """Les `n` premiers pays selon `criterion`, du premier au n-ième"""
+        return self.df.take(self._orders[criterion][largest][:n])
+
+
+class RankingIndex:
+    """
+    Classements des pays par (région, année, pays individuels seulement) d'un
+    DataFrame hôtelier. Chaque classement est construit à sa première demande
+    puis conservé pour la version des données.
+
+    `ranking(...).df` est l'agrégat par pays de la sélection : les callbacks
+    qui réagissent au même filtre le lisent ici au lieu de refaire chacun le
+    même groupby.
+
+    Le DataFrame n'est tenu que par une référence faible : l'index est
+    conservé par frame_cache tant que ce DataFrame existe, et ne doit pas
+    l'empêcher d'être libéré (ni les index qui en dépendent).
+    """
+
+    def __init__(self, df):
+        self._df = weakref.ref(df)
+        self._rankings = {}
+        self._lock = threading.Lock()
+
+    def ranking(self, region=None, year=None, individual=False):
+        key = (region, year, individual)
+        ranking = self._rankings.get(key)
+        if ranking is not None:
+            return ranking
+
+        with self._lock:
+            ranking = self._rankings.get(key)
+            if ranking is None:
+                source = self._df()
+                if source is None:
+                    raise ReferenceError("DataFrame du classement libéré")
+                df = row_index(source).select(source, region=region, year=year)
+                if individual:
+                    df = country_table(source).individual_rows(df)
+                ranking = Ranking(aggregate_by_country(df))
+                # Une sélection vide (région ou année inconnue) n'est pas conservée
+                if not df.empty:
+                    self._rankings[key] = ranking
+        return ranking
+
+
+ranking_index = frame_cache(RankingIndex)
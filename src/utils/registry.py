@@ -0,0 +1,80 @@
+# src/utils/registry.py
+import threading
+import time
+from collections.abc import Mapping
+
+
+class StaleDataError(RuntimeError):
+    """Les fichiers sur disque ne correspondent plus à la version du registre"""
+
+
+class LazyDataRegistry(Mapping):
+    """
+    Dictionnaire de datasets chargés à la demande.
+
+    Chaque dataset est chargé (et typé) au premier accès par une page ou un
+    callback, puis conservé. Un verrou par dataset garantit un seul chargement
+    même si plusieurs requêtes arrivent en même temps ; `prefetch` charge
+    en arrière-plan ceux qui ne l'ont pas encore été.
+
+    `version` identifie la version des données du registre (l'identifiant du
+    snapshot). Si `current_version()` est fourni, les fichiers lus ne sont
+    pas figés : chaque chargement vérifie, avant et après lecture, que la
+    version sur disque est toujours celle du registre, et lève
+    StaleDataError sinon. Un registre ne mélange donc jamais deux versions.
+    """
+
+    def __init__(self, loader, keys, version=None, current_version=None):
+        self._loader = loader
+        self._keys = list(keys)
+        self._frames = {}
+        self._locks = {key: threading.Lock() for key in self._keys}
+        self._current_version = current_version
+        self.version = version if version is not None or current_version is None else current_version()
+
+    def _check_version(self, key):
+        if self._current_version is not None and self._current_version() != self.version:
+            raise StaleDataError(f"{key}: fichiers modifiés depuis la version {self.version}")
+
+    def __getitem__(self, key):
+        frame = self._frames.get(key)
+        if frame is not None:
+            return frame
+        if key not in self._locks:
+            raise KeyError(key)
+
+        with self._locks[key]:
+            if key not in self._frames:
+                self._check_version(key)
+                frame = self._loader(key)
+                # Fichier remplacé pendant la lecture : le résultat n'est pas conservé
+                self._check_version(key)
+                self._frames[key] = frame
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def is_loaded(self, key):
+        return key in self._frames
+
+    def prefetch(self, keys=None):
+        """Charge les datasets restants dans un thread d'arrière-plan"""
+        pending = [key for key in (keys or self._keys) if not self.is_loaded(key)]
+
+        def run():
+            start = time.perf_counter()
+            for key in pending:
+                try:
+                    self[key]
+                except StaleDataError as e:
+                    print(f"Préchargement interrompu: {e}")
+                    return
+            print(f"Préchargement terminé en {time.perf_counter() - start:.2f} s")
+
+        thread = threading.Thread(target=run, name="data-prefetch", daemon=True)
+        thread.start()
+        return thread
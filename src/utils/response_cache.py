@@ -0,0 +1,78 @@
+# src/utils/response_cache.py
+import hashlib
+
+import plotly.io as pio
+from flask import Response, g, request
+
+from src.utils.memo import LRUCache
+
+# Point d'entrée unique de tous les callbacks Dash
+DASH_UPDATE_PATH = "_dash-update-component"
+
+
+def configure_json_engine(engine):
+    """
+    Encodeur JSON des figures et composants renvoyés par Dash : "auto"
+    (orjson s'il est installé), "orjson" (tableaux NumPy sérialisés sans
+    conversion en listes) ou "json" (bibliothèque standard).
+    """
+    try:
+        pio.json.config.default_engine = engine
+    except (ValueError, ImportError) as e:
+        print(f"Encodeur JSON {engine} indisponible ({e}) : encodeur par défaut conservé")
+    return pio.json.config.default_engine
+
+
+class ResponseCache(LRUCache):
+    """
+    Cache des réponses sérialisées de /_dash-update-component.
+
+    La clé est l'empreinte du corps de la requête (entrées, états, sorties
+    demandées et propriété déclenchante) et le snapshot épinglé : une requête
+    identique sur la même version des données reçoit directement les octets
+    déjà encodés, sans construire ni sérialiser les figures. Seules les
+    réponses 200 sont conservées (pas les 204 de PreventUpdate).
+
+    `shared` (un SharedCache) ajoute un second niveau commun aux workers de
+    la machine : une réponse calculée par l'un est servie par les autres.
+    """
+
+    def __init__(self, max_bytes, shared=None):
+        super().__init__(max_bytes)
+        self.shared = shared
+
+    def drop_snapshot(self, snapshot_id):
+        super().drop_snapshot(snapshot_id)
+        if self.shared is not None:
+            self.shared.drop_snapshot(snapshot_id)
+
+    def install(self, server, snapshot_id):
+        """À appeler après SnapshotHolder.install, qui épingle le snapshot de la requête"""
+        @server.before_request
+        def serve_cached_response():
+            if self.max_bytes <= 0 or request.method != "POST" or not request.path.endswith(DASH_UPDATE_PATH):
+                return None
+            key = ("response", snapshot_id(), hashlib.blake2b(request.get_data(), digest_size=16).hexdigest())
+            entry = self.get(key)
+            if entry is not None:
+                return Response(entry[0], mimetype="application/json")
+
+            if self.shared is not None:
+                body = self.shared.get(key[1], key[2])
+                if body is not None:
+                    self.put(key, body, len(body))
+                    return Response(body, mimetype="application/json")
+
+            g.response_cache_key = key
+            return None
+
+        @server.after_request
+        def store_response(response):
+            key = g.pop("response_cache_key", None)
+            if key is not None and response.status_code == 200 and not response.direct_passthrough:
+                body = response.get_data()
+                self.put(key, body, len(body))
+                if self.shared is not None:
+                    callback = (request.get_json(silent=True) or {}).get("output")
+                    self.shared.put(key[1], key[2], body, callback=callback)
+            return response
@@ -0,0 +1,84 @@
+# src/utils/row_index.py
+import numpy as np
+import pandas as pd
+
+from src.utils.time_axis import frame_cache
+
+REGION_COL = "Region"
+YEAR_COL = "Année"
+
+
+class GroupIndex:
+    """
+    Positions des lignes regroupées par valeur d'une ou plusieurs colonnes.
+
+    Les positions sont triées une fois (tri stable) par clé de groupe : chaque
+    groupe est une tranche contiguë du tableau, dont les positions restent
+    dans l'ordre d'origine des lignes.
+    """
+
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        self.uniques = []
+        key = np.zeros(len(df), dtype="int64")
+        for col in self.columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self.uniques.append(pd.Index(uniques))
+            key = key * (len(uniques) + 1) + (codes + 1)
+
+        self.order = np.argsort(key, kind="stable")
+        self.keys = key[self.order]
+
+    def _encode(self, values):
+        key = 0
+        for value, uniques in zip(values, self.uniques):
+            code = uniques.get_indexer([value])[0]
+            if code < 0:
+                return None
+            key = key * (len(uniques) + 1) + (code + 1)
+        return key
+
+    def positions(self, *values):
+        """Positions (croissantes) des lignes dont les colonnes valent `values`"""
+        key = self._encode(values)
+        if key is None:
+            return self.order[:0]
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        return self.order[lo:hi]
+
+
+class RowIndex:
+    """Index des lignes d'un DataFrame par région, par année et par (région, année)"""
+
+    def __init__(self, df):
+        self.n_rows = len(df)
+        self.by_region = GroupIndex(df, [REGION_COL]) if REGION_COL in df.columns else None
+        self.by_year = GroupIndex(df, [YEAR_COL]) if YEAR_COL in df.columns else None
+        self.by_region_year = (
+            GroupIndex(df, [REGION_COL, YEAR_COL])
+            if self.by_region is not None and self.by_year is not None else None
+        )
+
+    def positions(self, region=None, year=None):
+        """Positions des lignes de la région et/ou de l'année demandées (None : toutes)"""
+        if region is not None and year is not None:
+            return self.by_region_year.positions(region, year)
+        if region is not None:
+            return self.by_region.positions(region)
+        if year is not None:
+            return self.by_year.positions(year)
+        return None
+
+    def select(self, df, region=None, year=None):
+        """
+        Lignes de `df` (le DataFrame indexé, ou une copie aux mêmes lignes)
+        pour une région et/ou une année, sans parcourir la table.
+        """
+        if len(df) != self.n_rows:
+            raise ValueError("select attend le DataFrame indexé ou une copie de mêmes lignes")
+        positions = self.positions(region, year)
+        return df if positions is None else df.take(positions)
+
+
+row_index = frame_cache(RowIndex)
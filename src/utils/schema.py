@@ -0,0 +1,123 @@
+# src/utils/schema.py
+import functools
+import inspect
+
+import numpy as np
+import pandas as pd
+
+# Dimensions : peu de valeurs distinctes, stockées en codes catégoriels
+DIMENSION_COLS = ["Region", "Pays", "ISO3"]
+
+# Mesures : les comptages publiés en milliers tiennent en 32 bits ; les
+# mesures décimales restent en float64, car les KPI affichés en sont des sommes
+# et moyennes, qu'un float32 arrondirait différemment
+MEASURE_DTYPES = {
+    "Nombre de touristes": "int32",
+    "Nombre de croisièristes": "int32",
+    "Nuitées touristiques": "float64",
+    "Durée de séjour moyenne": "float64",
+    "Année": "int16",
+}
+
+
+def _downcast(series, dtype):
+    """Convertit une mesure vers le type déclaré, sans perte de valeurs"""
+    target = np.dtype(dtype)
+
+    if target.kind in "iu":
+        # Entier impossible avec des valeurs manquantes ou décimales : float64
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+        if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+            return series.astype("float64")
+
+        info = np.iinfo(target)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            return series
+    return series.astype(target)
+
+
+def memory_usage(df):
+    """Mémoire occupée par un DataFrame, chaînes comprises (en octets)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def apply_schema(df):
+    """Applique le schéma déclaré : dimensions catégorielles, mesures réduites"""
+    df = df.copy()
+
+    for col in DIMENSION_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+
+    for col, dtype in MEASURE_DTYPES.items():
+        if col in df.columns and pd.api.types.is_numeric_dtype(df[col].dtype):
+            df[col] = _downcast(df[col], dtype)
+
+    return df
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """
+    DataFrame partagé en lecture seule : ajout, remplacement ou suppression
+    de colonne, affectation d'attribut (dont `columns` et `index`), `update`
+    et toute méthode appelée avec `inplace=True` lèvent une erreur. Les
+    résultats de filtres et d'agrégations sont des DataFrames ordinaires.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _refuse(self, *args, **kwargs):
+        raise TypeError("DataFrame partagé en lecture seule : modifier un résultat filtré ou agrégé")
+
+    __setitem__ = __delitem__ = insert = pop = update = _refuse
+    # Point de passage interne des méthodes appelées avec inplace=True
+    _update_inplace = _refuse
+
+    def __setattr__(self, name, value):
+        # df.columns = ..., df.index = ... ou df.<colonne> = ... (que pandas transforme
+        # en attribut masquant la colonne) : seuls les attributs internes restent permis
+        if not name.startswith("_"):
+            self._refuse()
+        super().__setattr__(name, value)
+
+
+def _refuse_inplace(method):
+    """Refuse `inplace=True` avant toute modification (certaines méthodes changent les axes d'abord)"""
+    @functools.wraps(method)
+    def guarded(self, *args, **kwargs):
+        if kwargs.get("inplace"):
+            self._refuse()
+        return method(self, *args, **kwargs)
+    return guarded
+
+
+# Toutes les méthodes publiques acceptant `inplace` (sort_values, reset_index, rename…)
+for _name, _method in inspect.getmembers(pd.DataFrame, inspect.isfunction):
+    if not _name.startswith("_") and "inplace" in inspect.signature(_method).parameters:
+        setattr(ReadOnlyFrame, _name, _refuse_inplace(_method))
+
+
+def read_only(df):
+    """
+    Version en lecture seule d'un DataFrame partagé entre les requêtes.
+
+    Chaque colonne est adossée à un tableau numpy non modifiable (les codes
+    pour les catégories) et le DataFrame refuse les changements de structure :
+    une écriture accidentelle dans les données partagées lève une erreur au
+    lieu de fuiter d'une requête à l'autre. Les callbacks filtrent et
+    agrègent donc sans copie préalable.
+    """
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = np.array(series.cat.codes.to_numpy(), copy=False)
+            codes.flags.writeable = False
+            data[col] = pd.Categorical.from_codes(codes, dtype=series.dtype, validate=False)
+        else:
+            values = series.to_numpy()
+            values.flags.writeable = False
+            data[col] = values
+    return ReadOnlyFrame(data, index=df.index, copy=False)
@@ -0,0 +1,172 @@
+# src/utils/shared_cache.py
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import dash
+import plotly
+
+# Racine du projet : le code dont dépendent les réponses mises en cache
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CODE_PATTERNS = ["main.py", "config.py", "src/**/*.py", "assets/*"]
+
+
+def code_version(deploy_id=""):
+    """
+    Empreinte du code qui produit les réponses : identifiant de déploiement,
+    versions de Dash et Plotly et contenu des sources Python et des assets.
+    Un déploiement qui change une figure ou un format change donc la clé
+    des réponses, même si les données et les entrées sont les mêmes.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(f"{deploy_id}|{dash.__version__}|{plotly.__version__}".encode("utf-8"))
+    for pattern in CODE_PATTERNS:
+        for path in sorted(glob.glob(os.path.join(PROJECT_DIR, pattern), recursive=True)):
+            digest.update(os.path.relpath(path, PROJECT_DIR).encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+class SharedCache:
+    """
+    Cache de réponses sérialisées partagé par tous les workers d'une machine,
+    dans un fichier SQLite local (mode WAL : lectures concurrentes, écritures
+    atomiques).
+
+    Une entrée est identifiée par la version du code (`version`, voir
+    code_version), le snapshot de données et l'empreinte de la requête ; le
+    callback concerné est noté à titre indicatif. Le fichier survit aux
+    redémarrages : les réponses d'une autre version du code sont purgées à
+    l'ouverture et ne sont jamais servies. Les entrées
+    plus vieilles que `ttl` secondes sont ignorées puis purgées, et les plus
+    anciennes sont évincées quand la taille totale dépasse `max_bytes`. Le
+    cache est un accélérateur : une erreur SQLite compte comme un échec de
+    lecture et ne fait jamais échouer la requête.
+    """
+
+    def __init__(self, path, max_bytes, ttl, version=""):
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._connect()
+        # Fichier d'un ancien format (sans version du code) : c'est un cache, on repart de zéro
+        columns = [row[1] for row in db.execute("PRAGMA table_info(responses)")]
+        if columns and "version" not in columns:
+            db.execute("DROP TABLE responses")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                version TEXT NOT NULL,
+                snapshot TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                callback TEXT,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (version, snapshot, digest)
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+        db.execute("DELETE FROM responses WHERE version != ?", (version,))
+
+    def _connect(self):
+        """
+        Une connexion par thread et par processus : les connexions SQLite ne
+        se partagent ni entre threads ni avec les workers créés par fork.
+        """
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def _failed(self, e):
+        self.errors += 1
+        if self.errors == 1:
+            print(f"Cache partagé indisponible ({self.path}): {e}")
+
+    def get(self, snapshot_id, digest):
+        try:
+            row = self._connect().execute(
+                "SELECT body FROM responses"
+                " WHERE version = ? AND snapshot = ? AND digest = ? AND created >= ?",
+                (self.version, snapshot_id, digest, time.time() - self.ttl),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed(e)
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, snapshot_id, digest, body, callback=None):
+        if len(body) > self.max_bytes:
+            return
+        try:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.version, snapshot_id, digest, callback, body, len(body), time.time()),
+                )
+                db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+                # Éviction des plus anciennes au-delà du budget (cumul du plus récent au plus ancien)
+                db.execute("""
+                    DELETE FROM responses WHERE rowid IN (
+                        SELECT rowid FROM (
+                            SELECT rowid, SUM(size) OVER (ORDER BY created DESC, rowid DESC) AS total
+                            FROM responses
+                        ) WHERE total > ?
+                    )
+                """, (self.max_bytes,))
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self._failed(e)
+
+    def drop_snapshot(self, snapshot_id):
+        """Retire les réponses calculées sur un snapshot remplacé"""
+        try:
+            self._connect().execute("DELETE FROM responses WHERE snapshot = ?", (snapshot_id,))
+        except sqlite3.Error as e:
+            self._failed(e)
+
+    def stats(self):
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._failed(e)
+            entries = size = None
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "version": self.version,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "errors": self.errors,
+        }
@@ -0,0 +1,219 @@
+# src/utils/snapshots.py
+import hmac
+import threading
+import time
+from collections.abc import Mapping
+
+from flask import g, has_request_context, jsonify, request
+
+from src.utils.registry import StaleDataError
+
+
+class Snapshot:
+    """Version figée des données : identifiant + dictionnaire de DataFrames"""
+
+    def __init__(self, snapshot_id, data):
+        self.id = snapshot_id
+        self.data = data
+        self.created_at = time.time()
+
+
+class SnapshotView(Mapping):
+    """
+    Dictionnaire de données passé aux layouts et callbacks.
+
+    Chaque accès lit le snapshot épinglé par la requête en cours : un callback
+    commencé avant un rechargement termine sur l'ancienne version, les
+    requêtes suivantes voient la nouvelle.
+    """
+
+    def __init__(self, holder):
+        self._holder = holder
+
+    def __getitem__(self, key):
+        try:
+            return self._holder.pinned().data[key]
+        except StaleDataError:
+            # Fichiers changés avant le premier accès : on passe à la nouvelle version
+            self._holder.reload_in_background()
+            raise
+
+    def __iter__(self):
+        return iter(self._holder.pinned().data)
+
+    def __len__(self):
+        return len(self._holder.pinned().data)
+
+    def snapshot_id(self):
+        return self._holder.snapshot_id()
+
+
+class SnapshotHolder:
+    """
+    Détient le snapshot courant et le remplace atomiquement au rechargement.
+
+    `factory()` construit le dictionnaire de données d'une version et
+    `fingerprint()` identifie la version sur disque : l'identifiant étant
+    dérivé des fichiers, tous les workers s'accordent sur la même valeur.
+    Si le dictionnaire porte sa propre `version` (registre figé sur une
+    version), c'est elle qui sert d'identifiant.
+    """
+
+    def __init__(self, factory, fingerprint):
+        self._factory = factory
+        self._fingerprint = fingerprint
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+        self._current = self._snapshot(fingerprint(), factory())
+
+    @staticmethod
+    def _snapshot(snapshot_id, data):
+        version = getattr(data, "version", None)
+        return Snapshot(version if version is not None else snapshot_id, data)
+
+    def current(self):
+        return self._current
+
+    def pinned(self):
+        """Snapshot épinglé par la requête en cours (le courant hors requête)"""
+        if has_request_context():
+            snapshot = g.get("data_snapshot")
+            if snapshot is not None:
+                return snapshot
+        return self._current
+
+    def snapshot_id(self):
+        """Identifiant à inclure dans la clé de tout cache dérivé des données"""
+        return self.pinned().id
+
+    def view(self):
+        return SnapshotView(self)
+
+    def on_swap(self, listener):
+        """Enregistre `listener(nouveau, ancien)`, appelé après chaque remplacement"""
+        self._listeners.append(listener)
+        return listener
+
+    def per_snapshot(self, builder):
+        """
+        Retourne une fonction sans argument qui renvoie `builder()` calculé
+        une seule fois par snapshot (celui épinglé par la requête) ; le
+        résultat est oublié quand le snapshot est remplacé.
+        """
+        built = {}
+        lock = threading.Lock()
+
+        def get():
+            snapshot = self.pinned()
+            if snapshot.id in built:
+                return built[snapshot.id]
+            with lock:
+                if snapshot.id not in built:
+                    value = builder()
+                    # Snapshot remplacé pendant la construction : résultat non conservé
+                    if snapshot is not self._current:
+                        return value
+                    built[snapshot.id] = value
+                return built[snapshot.id]
+
+        self.on_swap(lambda new, old: built.pop(old.id, None))
+        return get
+
+    def _validate(self, data):
+        """
+        Chaque dataset doit être non vide et garder les colonnes de la version
+        en cours. Seuls les datasets déjà chargés dans la version en cours
+        servent de référence : en charger un ici lirait les nouveaux fichiers
+        dans l'ancien snapshot, et la comparaison ne prouverait plus rien.
+        """
+        old = self._current.data
+        is_loaded = getattr(old, "is_loaded", lambda key: True)
+        for key in old:
+            if key not in data:
+                raise ValueError(f"{key}: dataset absent de la nouvelle version")
+            df = data[key]
+            if df.empty:
+                raise ValueError(f"{key}: dataset vide")
+            if not is_loaded(key):
+                continue
+            missing = set(old[key].columns) - set(df.columns)
+            if missing:
+                raise ValueError(f"{key}: colonnes manquantes {sorted(missing)}")
+
+    def reload(self, force=False):
+        """
+        Charge la version présente sur disque, la valide puis la publie.
+
+        Les datasets sont tous chargés avant le remplacement : la première
+        requête sur la nouvelle version ne paie aucun chargement. En cas
+        d'échec, l'ancienne version reste en place.
+        Retourne le statut : "inchangé", "rechargé", "en cours" ou "erreur".
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return "en cours"
+        try:
+            snapshot_id = self._fingerprint()
+            if snapshot_id == self._current.id and not force:
+                return "inchangé"
+
+            start = time.perf_counter()
+            try:
+                data = self._factory()
+                for key in data:
+                    data[key]
+                self._validate(data)
+            except (OSError, ValueError, KeyError, StaleDataError) as e:
+                print(f"Rechargement refusé ({snapshot_id}): {e}")
+                return "erreur"
+
+            old, self._current = self._current, self._snapshot(snapshot_id, data)
+            print(f"Données rechargées: {old.id} → {self._current.id} "
+                  f"({time.perf_counter() - start:.2f} s)")
+            for listener in self._listeners:
+                listener(self._current, old)
+            return "rechargé"
+        finally:
+            self._reload_lock.release()
+
+    def reload_in_background(self, force=False):
+        thread = threading.Thread(target=self.reload, kwargs={"force": force},
+                                  name="data-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def watch(self, interval):
+        """Vérifie périodiquement l'empreinte des fichiers et recharge s'ils ont changé"""
+        def run():
+            while True:
+                time.sleep(interval)
+                if self._fingerprint() != self._current.id:
+                    self.reload()
+
+        thread = threading.Thread(target=run, name="data-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def install(self, server, token=None, allow_local=False):
+        """
+        Branche le holder sur le serveur Flask de Dash :
+        - chaque requête épingle le snapshot courant pour toute sa durée ;
+        - POST /_reload déclenche un rechargement en arrière-plan, avec le
+          jeton X-Reload-Token. Sans jeton configuré, il est refusé, sauf
+          appels locaux si `allow_local` : derrière un reverse proxy, toutes
+          les requêtes arrivent de l'adresse locale.
+        """
+        @server.before_request
+        def pin_snapshot():
+            g.data_snapshot = self._current
+
+        @server.route("/_reload", methods=["POST"])
+        def reload_data():
+            if token:
+                allowed = hmac.compare_digest(request.headers.get("X-Reload-Token", ""), token)
+            else:
+                allowed = allow_local and request.remote_addr in ("127.0.0.1", "::1")
+            if not allowed:
+                return jsonify({"status": "refusé"}), 403
+
+            self.reload_in_background(force=request.args.get("force") == "1")
+            return jsonify({"status": "lancé", "snapshot": self._current.id}), 202
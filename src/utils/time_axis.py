@@ -0,0 +1,94 @@
+# src/utils/time_axis.py
+import weakref
+
+import numpy as np
+import pandas as pd
+
+MONTH_COL = "Mois"
+ORDINAL_COL = "Mois_ordinal"
+# Ordinal des mois manquants : trié après tous les mois valides
+MISSING_ORDINAL = np.iinfo(np.int32).max
+
+
+def month_ordinal(label):
+    """Ordinal d'un mois 'AAAA-MM' (ou 'AAAA-MM-JJ') : année * 12 + mois - 1"""
+    return int(label[:4]) * 12 + int(label[5:7]) - 1
+
+
+def month_label(ordinal):
+    """Libellé 'AAAA-MM' d'un ordinal de mois"""
+    return f"{ordinal // 12}-{ordinal % 12 + 1:02d}"
+
+
+def add_month_axis(df):
+    """
+    Matérialise l'axe mensuel une fois pour toutes au chargement.
+
+    `Mois` devient un datetime64, `Mois_ordinal` un entier (année * 12 + mois)
+    et les lignes sont triées par mois : une période se sélectionne alors par
+    une simple tranche, sans analyse de dates à chaque requête.
+    """
+    if MONTH_COL not in df.columns:
+        return df
+
+    df = df.copy()
+    if not pd.api.types.is_datetime64_any_dtype(df[MONTH_COL].dtype):
+        df[MONTH_COL] = pd.to_datetime(df[MONTH_COL], errors="coerce")
+
+    months = df[MONTH_COL]
+    ordinals = months.dt.year * 12 + months.dt.month - 1
+    df[ORDINAL_COL] = ordinals.fillna(MISSING_ORDINAL).astype(np.int32)
+
+    return df.sort_values(ORDINAL_COL, kind="stable").reset_index(drop=True)
+
+
+class MonthIndex:
+    """Index des mois d'un DataFrame trié par `Mois_ordinal`"""
+
+    def __init__(self, df):
+        ordinals = df[ORDINAL_COL].to_numpy()
+        n_valid = int(np.searchsorted(ordinals, MISSING_ORDINAL))
+        self.ordinals = ordinals[:n_valid]
+        self.months = np.unique(self.ordinals)
+        self.labels = [month_label(int(o)) for o in self.months]
+
+    def bounds(self, start, end):
+        """Positions [début, fin) des lignes dont le mois est dans [start, end]"""
+        if isinstance(start, str):
+            start = month_ordinal(start)
+        if isinstance(end, str):
+            end = month_ordinal(end)
+        lo = int(np.searchsorted(self.ordinals, start, side="left"))
+        hi = int(np.searchsorted(self.ordinals, end, side="right"))
+        return lo, max(lo, hi)
+
+    def slice(self, df, start, end):
+        """Lignes de `df` comprises entre deux mois (bornes incluses)"""
+        lo, hi = self.bounds(start, end)
+        return df.iloc[lo:hi]
+
+
+def frame_cache(builder):
+    """
+    Mémorise le résultat de `builder(df)` tant que le DataFrame existe.
+
+    Les DataFrames ne sont pas hachables : le cache est indexé par id() et
+    chaque entrée est retirée par un weakref quand le DataFrame est libéré.
+    """
+    cache = {}
+
+    def get(df):
+        key = id(df)
+        entry = cache.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+        value = builder(df)
+        cache[key] = (weakref.ref(df, lambda _, key=key: cache.pop(key, None)), value)
+        return value
+
+    get.cache = cache
+    return get
+
+
+month_index = frame_cache(MonthIndex)
@@ -0,0 +1,90 @@
+# src/utils/warmup.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dash.exceptions import PreventUpdate
+
+from src.utils.memo import callback_memo
+
+
+class Warmup:
+    """
+    Précalcul, en arrière-plan, de toutes les sorties de callbacks dont les
+    entrées forment un ensemble fini et connu (régions, années, métriques…).
+
+    Chaque module de page fournit `warmup_calls(df_dict)`, la liste des
+    (nom du callback, arguments) à calculer. Les sorties vont dans le cache
+    des callbacks sous l'identifiant du snapshot courant ; les pages
+    construites une fois par snapshot sont aussi préparées. Un pool de
+    threads (et non de processus) est utilisé, car le cache vit dans le
+    processus du serveur.
+    """
+
+    def __init__(self, holder, modules, pages=(), workers=2, memo=callback_memo):
+        self.holder = holder
+        self.modules = list(modules)
+        self.pages = list(pages)
+        self.workers = workers
+        self.memo = memo
+        self.last_report = None
+
+    def _tasks(self, data):
+        tasks = []
+        for module in self.modules:
+            for name, args in module.warmup_calls(data):
+                callback = self.memo.callbacks.get((module.__name__, name))
+                if callback is not None:
+                    tasks.append((callback, args))
+        return tasks
+
+    def run(self):
+        """Précalcule tout pour le snapshot courant et retourne le bilan"""
+        snapshot = self.holder.current()
+        start = time.perf_counter()
+        for build_page in self.pages:
+            build_page()
+
+        tasks = self._tasks(self.holder.view())
+        failed = 0
+
+        def compute(task):
+            # Snapshot remplacé entre-temps : le préchauffage suivant prendra le relais
+            if self.holder.current() is not snapshot:
+                return False
+            callback, args = task
+            try:
+                callback(*args)
+            except PreventUpdate:
+                pass
+            return True
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="warmup") as pool:
+            for future in [pool.submit(compute, task) for task in tasks]:
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Préchauffage : échec d'un callback ({type(e).__name__}: {e})")
+
+        cached = sum(callback.cache_key(*args) in self.memo for callback, args in tasks)
+        self.last_report = {
+            "snapshot": snapshot.id,
+            "calls": len(tasks),
+            "cached": cached,
+            "failed": failed,
+            "seconds": round(time.perf_counter() - start, 2),
+        }
+        print(f"Préchauffage {snapshot.id} : {cached}/{len(tasks)} sorties en cache "
+              f"({failed} échecs) en {self.last_report['seconds']:.1f} s")
+        return self.last_report
+
+    def run_in_background(self):
+        thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def install(self):
+        """Lance le préchauffage maintenant, puis après chaque rechargement"""
+        self.holder.on_swap(lambda new, old: self.run_in_background())
+        return self.run_in_background()
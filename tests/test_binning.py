@@ -0,0 +1,51 @@
+# tests/test_binning.py
+import numpy as np
+import pandas as pd
+
+from src.utils.binning import bin_counts, equal_width_edges, histograms
+
+
+def cut_counts(values, edges):
+    return pd.Series(pd.cut(values, edges, include_lowest=True)).value_counts(sort=False).to_numpy()
+
+
+def make_values(edges, seed=0):
+    """Valeurs aléatoires, bornes exactes, valeurs hors bornes et NaN"""
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(edges[0] - 5, edges[-1] + 5, 500)
+    return np.concatenate([values, edges, [np.nan, np.nan, edges[0] - 1e-9, edges[-1] + 1e-9]])
+
+
+def test_comptes_identiques_a_pd_cut():
+    edges = np.array([0.0, 1.0, 2.5, 10.0, 50.0])
+    values = make_values(edges)
+    np.testing.assert_array_equal(bin_counts(values, edges), cut_counts(values, edges))
+
+
+def test_dernier_intervalle_ouvert():
+    edges = np.array([0.0, 1.0, 2.5, 10.0, 50.0])
+    values = make_values(edges, seed=1)
+    open_edges = np.append(edges[:-1], np.inf)
+    counts = bin_counts(values, edges, open_ended=True)
+    np.testing.assert_array_equal(counts, cut_counts(values, open_edges))
+    assert counts[-1] == np.sum(values > 10.0)
+
+
+def test_intervalles_de_meme_largeur():
+    values = make_values(np.array([3.0, 80.0]), seed=2)
+    edges = equal_width_edges(values, 7)
+    assert len(edges) == 8
+    assert edges[0] == np.nanmin(values) and edges[-1] == np.nanmax(values)
+    np.testing.assert_array_equal(bin_counts(values, edges), cut_counts(values, edges))
+    # Valeur unique ou absence de valeurs : intervalles de largeur non nulle
+    assert equal_width_edges([4.0, 4.0], 2).tolist() == [4.0, 4.5, 5.0]
+    assert equal_width_edges([np.nan], 2).tolist() == [0.0, 0.5, 1.0]
+
+
+def test_histogrammes_sans_intervalles_vides():
+    df = pd.DataFrame({"touristes": [5.0, 15.0, 15.0, 1e9]})
+    result = histograms(df, {"touristes": {
+        "edges": [0, 10, 20, 30, 40], "labels": ["0-10", "10-20", "20-30", "30+"], "open_ended": True,
+    }})["touristes"]
+    assert result["Intervalle"].tolist() == ["0-10", "10-20", "30+"]
+    assert result["Nombre de pays"].tolist() == [1, 2, 1]
@@ -0,0 +1,91 @@
+# tests/test_clean_data.py
+import pandas as pd
+import pytest
+
+from src.utils import clean_data
+from src.utils.columnar_cache import read_columnar
+
+HEADER = "Mois,Region,Pays,Nombre de touristes,Nuitées touristiques,Durée de séjour moyenne\n"
+
+
+def month_rows(month, base):
+    return "".join(
+        f'{month},{region},{pays},{base + i},"{base * 10 + i},5",{i + 1}\n'
+        for i, (region, pays) in enumerate([("Asie", "Japon"), ("Asie", "Chine"), ("Europe", "Italie")])
+    )
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    raw_dir, cleaned_dir = tmp_path / "raw", tmp_path / "cleaned"
+    raw_dir.mkdir()
+    cleaned_dir.mkdir()
+    monkeypatch.setattr(clean_data, "RAW_DIR", raw_dir)
+    monkeypatch.setattr(clean_data, "CLEANED_DIR", cleaned_dir)
+    monkeypatch.setattr(clean_data, "MANIFEST_PATH", cleaned_dir / "manifest.json")
+    monkeypatch.setattr(clean_data, "FILES", {"region.csv": "region_cleaned.csv"})
+    return raw_dir, cleaned_dir
+
+
+def write_raw(raw_dir, months):
+    # Fichiers publiés du plus récent au plus ancien
+    (raw_dir / "region.csv").write_text(
+        HEADER + "".join(month_rows(month, base) for month, base in months), encoding="utf-8"
+    )
+
+
+def full_clean(dirs):
+    raw_dir, cleaned_dir = dirs
+    clean_data.clean_tourism_data(incremental=False)
+    return pd.read_csv(cleaned_dir / "region_cleaned.csv")
+
+
+HISTORY = [("2025-08-01", 300), ("2025-07-01", 200), ("2025-06-01", 100)]
+
+
+@pytest.mark.parametrize("chunksize", [None, 2])
+@pytest.mark.parametrize("months", [
+    [("2025-09-01", 400)] + HISTORY,               # nouveau mois en tête
+    HISTORY + [("2025-05-01", 50)],                # nouveau mois en fin
+], ids=["prepend", "append"])
+def test_nouveau_mois_seul_nettoye(dirs, months, chunksize):
+    raw_dir, cleaned_dir = dirs
+    write_raw(raw_dir, HISTORY)
+    clean_data.clean_tourism_data(chunksize=chunksize)
+
+    write_raw(raw_dir, months)
+    cleaned = clean_data.clean_tourism_data(chunksize=chunksize)
+    if chunksize is None:
+        assert len(cleaned["region.csv"]) == 3
+    incremental = pd.read_csv(cleaned_dir / "region_cleaned.csv")
+    columnar = read_columnar(cleaned_dir / "region_cleaned.csv")
+
+    expected = full_clean(dirs)
+    pd.testing.assert_frame_equal(incremental, expected)
+    if columnar is not None:
+        pd.testing.assert_frame_equal(columnar, expected, check_dtype=False)
+
+    # Passage suivant : fichier inchangé
+    assert clean_data.clean_tourism_data(chunksize=chunksize) == {}
+
+
+def test_ligne_modifiee_nettoyage_complet(dirs):
+    raw_dir, cleaned_dir = dirs
+    write_raw(raw_dir, HISTORY)
+    clean_data.clean_tourism_data()
+
+    write_raw(raw_dir, [("2025-09-01", 400), ("2025-08-01", 301)] + HISTORY[1:])
+    cleaned = clean_data.clean_tourism_data()
+    assert len(cleaned["region.csv"]) == 12
+    pd.testing.assert_frame_equal(pd.read_csv(cleaned_dir / "region_cleaned.csv"), full_clean(dirs))
+
+
+def test_find_new_rows():
+    stored = clean_data.row_hashes(pd.DataFrame({"a": ["1", "2"]}))
+    raw = clean_data.row_hashes(pd.DataFrame({"a": ["3", "3", "1", "2"]}))
+    where, mask = clean_data.find_new_rows(raw, stored)
+    assert where == "prepend" and mask.tolist() == [True, False, False, False]
+
+    interleaved = clean_data.row_hashes(pd.DataFrame({"a": ["1", "3", "2"]}))
+    assert clean_data.find_new_rows(interleaved, stored) is None
+    assert clean_data.find_new_rows(stored[:1], stored) is None
@@ -0,0 +1,101 @@
+# tests/test_cube.py
+import numpy as np
+import pandas as pd
+
+from src.utils.cube import MEASURES, RegionCube, fixed_point_scale
+from src.utils.time_axis import add_month_axis
+
+AGG = {
+    "Nombre de touristes": "sum",
+    "Nuitées touristiques": "sum",
+    "Durée de séjour moyenne": "mean",
+}
+
+
+def make_region(n_rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    durations = np.round(rng.uniform(1, 15, n_rows), 1)
+    durations[rng.random(n_rows) < 0.1] = np.nan
+    df = pd.DataFrame({
+        "Mois": pd.to_datetime("2018-01-01") + pd.to_timedelta(rng.integers(0, 24, n_rows) * 31, unit="D"),
+        "Region": pd.Categorical(rng.choice(["Asie", "Europe", "Amérique", "Océanie"], n_rows),
+                                 categories=["Afrique", "Amérique", "Asie", "Europe", "Océanie"]),
+        "Pays": pd.Categorical(rng.choice(["Chine", "Japon", "Italie", "Brésil", "Australie"], n_rows)),
+        "Nombre de touristes": rng.integers(0, 10_000, n_rows),
+        "Nuitées touristiques": np.round(rng.uniform(0, 50_000, n_rows), 1),
+        "Durée de séjour moyenne": durations,
+    })
+    df["Mois"] = df["Mois"].dt.to_period("M").dt.to_timestamp()
+    return add_month_axis(df)
+
+
+def reference(df, by):
+    return df.groupby(by, observed=True, sort=True).agg(AGG).reset_index()[list(by) + MEASURES]
+
+
+def assert_same(result, expected):
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected.reset_index(drop=True),
+        check_categorical=False, check_dtype=False,
+    )
+
+
+def test_agregats_identiques_a_groupby():
+    df = make_region()
+    cube = RegionCube(df)
+    for by in [["Region"], ["Pays"], ["Mois"], ["Mois", "Region"], ["Region", "Pays"]]:
+        key = by[0] if len(by) == 1 else by
+        assert_same(cube.rollup(key), reference(df, by))
+
+
+def test_selection_par_regions_identique_a_groupby():
+    df = make_region()
+    cube = RegionCube(df)
+    regions = ["Asie", "Océanie", "Inconnue"]
+    expected = reference(df[df["Region"].isin(regions)], ["Pays"])
+    assert_same(cube.rollup("Pays", regions=regions), expected)
+
+
+def test_virgule_fixe():
+    assert fixed_point_scale(np.array([1.0, 2.0, np.nan])) == 1
+    assert fixed_point_scale(np.array([1.5, 2.25])) == 100
+    assert fixed_point_scale(np.array([1 / 3])) is None
+    assert fixed_point_scale(np.array([2.0 ** 53])) is None
+
+
+def test_sommes_en_virgule_fixe_exactes():
+    df = add_month_axis(pd.DataFrame({
+        "Mois": pd.to_datetime(["2020-01-01"] * 10),
+        "Region": pd.Categorical(["Asie"] * 10),
+        "Pays": pd.Categorical(["Japon"] * 10),
+        "Nombre de touristes": [1] * 10,
+        "Nuitées touristiques": [0.1] * 10,
+        "Durée de séjour moyenne": [0.1] * 10,
+    }))
+    cube = RegionCube(df)
+    assert cube.scales["Nuitées touristiques"] == 10
+    totals = cube.totals()
+    # En flottants, 0.1 additionné dix fois vaut 0.9999999999999999
+    assert totals["Nuitées touristiques"] == 1.0
+    assert totals["Durée de séjour moyenne"] == 0.1
+    assert totals["rows"] == 10
+
+
+def test_periodes_lues_dans_les_cumuls_identiques_a_groupby():
+    df = make_region(seed=1)
+    cube = RegionCube(df)
+    ordinals = df["Mois_ordinal"]
+    rng = np.random.default_rng(2)
+    # Bornes tirées au-delà des mois présents pour couvrir les périodes vides
+    for low, high in rng.integers(ordinals.min() - 2, ordinals.max() + 3, size=(100, 2)):
+        months = (min(low, high), max(low, high))
+        rows = df[ordinals.between(*months)]
+        for dim in ["Region", "Pays"]:
+            assert_same(cube.rollup(dim, months=months), reference(rows, [dim]))
+            assert cube.members(dim, months=months) == sorted(rows[dim].unique().tolist())
+
+        totals = cube.totals(months=months)
+        assert totals["rows"] == len(rows)
+        assert totals["Nombre de touristes"] == rows["Nombre de touristes"].sum()
+        np.testing.assert_allclose(totals["Nuitées touristiques"], rows["Nuitées touristiques"].sum())
+        np.testing.assert_allclose(totals["Durée de séjour moyenne"], rows["Durée de séjour moyenne"].mean())
@@ -0,0 +1,104 @@
+# tests/test_get_data.py
+import hashlib
+import http.client
+import os
+
+import pytest
+
+from src.utils.get_data import download_file, load_manifest, load_raw_data
+from src.utils.local_data_server import _file_info, start_server
+
+CONTENT = "".join(f"2025-{m:02d};Paris;{m * 1000}\n" for m in range(1, 13)).encode("utf-8")
+
+
+@pytest.fixture
+def served(tmp_path):
+    """Dossier servi (contenant dataset.csv) et dossier de destination"""
+    served_dir = tmp_path / "serveur"
+    raw_dir = tmp_path / "raw"
+    served_dir.mkdir()
+    raw_dir.mkdir()
+    (served_dir / "dataset.csv").write_bytes(CONTENT)
+    return str(served_dir), str(raw_dir)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def _start(directory, fail_after=None):
+        server, base_url = start_server(directory, fail_after=fail_after)
+        servers.append(server)
+        return f"{base_url}/dataset.csv"
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fichier_inchange_revalide_par_304(served, serve):
+    served_dir, raw_dir = served
+    url = serve(served_dir)
+
+    status, entry = download_file("dataset", url, raw_dir=raw_dir)
+    assert status == "téléchargé"
+    assert entry["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+
+    status, same_entry = download_file("dataset", url, entry, raw_dir=raw_dir)
+    assert status == "inchangé"
+    assert same_entry == entry
+    with open(os.path.join(raw_dir, "dataset.csv"), "rb") as f:
+        assert f.read() == CONTENT
+
+
+def test_manifeste_conserve_entre_deux_lancements(served, serve):
+    served_dir, raw_dir = served
+    urls = {"dataset": serve(served_dir)}
+    raw_dir += os.sep
+
+    assert load_raw_data(urls, raw_dir) == {"dataset": "téléchargé"}
+    assert load_manifest(raw_dir)["dataset"]["size"] == len(CONTENT)
+    assert load_raw_data(urls, raw_dir) == {"dataset": "inchangé"}
+
+
+def test_transfert_coupe_puis_repris_par_206(served, serve):
+    served_dir, raw_dir = served
+    part_path = os.path.join(raw_dir, "dataset.csv.part")
+
+    with pytest.raises((ConnectionError, http.client.HTTPException)):
+        download_file("dataset", serve(served_dir, fail_after=40), raw_dir=raw_dir)
+    # Le fichier partiel et l'ETag de sa version sont gardés pour la reprise
+    assert 0 < os.path.getsize(part_path) < len(CONTENT)
+    assert os.path.exists(part_path + ".etag")
+    assert not os.path.exists(os.path.join(raw_dir, "dataset.csv"))
+
+    status, entry = download_file("dataset", serve(served_dir), raw_dir=raw_dir)
+    assert status == "repris"
+    assert entry["sha256"] == hashlib.sha256(CONTENT).hexdigest()
+    with open(os.path.join(raw_dir, "dataset.csv"), "rb") as f:
+        assert f.read() == CONTENT
+    assert not os.path.exists(part_path)
+    assert not os.path.exists(part_path + ".etag")
+
+
+def test_empreinte_invalide_rejetee(served, serve):
+    served_dir, raw_dir = served
+    part_path = os.path.join(raw_dir, "dataset.csv.part")
+
+    # Début de fichier corrompu, rattaché à la version servie : la reprise
+    # complète le fichier mais l'empreinte annoncée ne correspond plus
+    with open(part_path, "wb") as f:
+        f.write(b"x" * 40)
+    with open(part_path + ".etag", "w", encoding="utf-8") as f:
+        f.write(_file_info(os.path.join(served_dir, "dataset.csv"))["etag"])
+
+    with pytest.raises(ValueError, match="empreinte"):
+        download_file("dataset", serve(served_dir), raw_dir=raw_dir)
+    assert not os.path.exists(part_path)
+    assert not os.path.exists(os.path.join(raw_dir, "dataset.csv"))
+
+    # Le lancement suivant repart d'un téléchargement complet
+    status, entry = download_file("dataset", serve(served_dir), raw_dir=raw_dir)
+    assert status == "téléchargé"
+    assert entry["sha256"] == hashlib.sha256(CONTENT).hexdigest()
@@ -0,0 +1,64 @@
+# tests/test_memo.py
+import contextlib
+import io
+
+from src.utils.memo import CallbackMemo
+from src.utils.warmup import Warmup
+
+
+def test_cle_identique_avec_ou_sans_valeur_par_defaut():
+    memo = CallbackMemo()
+    calls = []
+
+    @memo.memoize({})
+    def callback(a, b, rendered=None):
+        calls.append((a, b, rendered))
+        return a + b
+
+    assert callback.cache_key(1, 2) == callback.cache_key(1, 2, None)
+    assert callback.cache_key(1, 2) == callback.cache_key(1, b=2, rendered=None)
+    assert callback.cache_key(1, 2) != callback.cache_key(1, 2, {"maps": [True, True]})
+
+    callback(1, 2)
+    assert callback(1, 2, None) == 3
+    assert len(calls) == 1
+    assert memo.stats()["hits"] == 1
+
+
+def test_requete_dash_servie_par_le_prechauffage():
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+        from src.layouts import regional_layout
+        from src.utils.memo import callback_memo
+
+        report = Warmup(main.snapshots, [regional_layout], memo=callback_memo).run()
+    assert report["calls"] == report["cached"] > 0
+
+    # Requête telle que l'envoie le navigateur au premier affichage de la page Régions
+    output, spec = next(
+        (output, spec) for output, spec in main.app.callback_map.items()
+        if "regional-world-map.figure" in output
+    )
+    periode, indicateur, dates_str, rendered = regional_layout.warmup_calls(main.df_dict)[0][1]
+    values = {"regional-date-slider": periode, "regional-indicator": indicateur,
+              "regional-dates-store": dates_str, "regional-render-store": rendered}
+    body = {
+        "output": output,
+        "outputs": [
+            {"id": part.rsplit(".", 1)[0], "property": part.rsplit(".", 1)[1]}
+            for part in output.strip(".").split("...")
+        ],
+        "inputs": [dict(item, value=values[item["id"]]) for item in spec["inputs"]],
+        "state": [dict(item, value=values[item["id"]]) for item in spec["state"]],
+        "changedPropIds": ["regional-date-slider.value"],
+    }
+
+    before = callback_memo.stats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = main.server.test_client().post("/_dash-update-component", json=body)
+    after = callback_memo.stats()
+
+    assert response.status_code == 200
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+    assert after["entries"] == before["entries"]
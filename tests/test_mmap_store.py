@@ -0,0 +1,44 @@
+# tests/test_mmap_store.py
+import gc
+import os
+
+import pandas as pd
+import pytest
+
+from src.utils import mmap_store
+from src.utils.mmap_store import MmapStore, build_mmap_store
+
+pytestmark = pytest.mark.skipif(mmap_store.fcntl is None, reason="verrous flock indisponibles")
+
+
+def make_dfs(n):
+    return {"frequentation": pd.DataFrame({
+        "Region": pd.Categorical(["Asie", "Europe"] * n),
+        "Nombre de touristes": range(2 * n),
+    })}
+
+
+def test_anciennes_versions_supprimees_une_fois_liberees(tmp_path):
+    store_dir = str(tmp_path)
+    store_a = MmapStore(build_mmap_store(make_dfs(1), "a-v4", store_dir), "a")
+    df_a = store_a["frequentation"]
+
+    # La version a est encore ouverte : seule la publication de b a lieu
+    build_mmap_store(make_dfs(2), "b-v4", store_dir)
+    assert sorted(os.listdir(store_dir)) == ["a-v4", "b-v4"]
+
+    del store_a
+    gc.collect()
+    build_mmap_store(make_dfs(3), "c-v4", store_dir)
+    assert os.listdir(store_dir) == ["c-v4"]
+    # Les colonnes déjà mappées restent lisibles après la suppression des fichiers
+    assert df_a["Nombre de touristes"].tolist() == [0, 1]
+    assert len(MmapStore(os.path.join(store_dir, "c-v4"))["frequentation"]) == 6
+
+
+def test_constructions_en_cours_conservees(tmp_path):
+    store_dir = str(tmp_path)
+    os.makedirs(os.path.join(store_dir, ".build-123", "frequentation"))
+    build_mmap_store(make_dfs(1), "a-v4", store_dir)
+    build_mmap_store(make_dfs(2), "b-v4", store_dir)
+    assert sorted(os.listdir(store_dir)) == [".build-123", "b-v4"]
@@ -0,0 +1,39 @@
+# tests/test_rankings.py
+import gc
+
+import pandas as pd
+
+from src.utils.countries import country_table
+from src.utils.rankings import aggregate_by_country, ranking_index
+from src.utils.row_index import row_index
+
+
+def make_hotel():
+    return pd.DataFrame({
+        "Année": [2018, 2018, 2019, 2019],
+        "Region": pd.Categorical(["Asie", "Europe (hors France)", "Asie", "Asie"]),
+        "Pays": pd.Categorical(["Japon", "Italie", "Japon", "Autre Asie"]),
+        "Nombre de touristes": [10, 20, 30, 5],
+        "Nuitées touristiques": [100.0, 200.0, 300.0, 50.0],
+        "Durée de séjour moyenne": [10.0, 10.0, 10.0, 10.0],
+    })
+
+
+def test_classement_identique_a_pandas():
+    df = make_hotel()
+    ranking = ranking_index(df).ranking(region="Asie", individual=True)
+    expected = aggregate_by_country(df[(df["Region"] == "Asie") & (df["Pays"] != "Autre Asie")])
+    pd.testing.assert_frame_equal(ranking.df.reset_index(drop=True), expected.reset_index(drop=True))
+    assert ranking.top("Nombre de touristes", 1)["Pays"].tolist() == ["Japon"]
+
+
+def test_caches_vides_apres_liberation_du_dataframe():
+    caches = [ranking_index.cache, row_index.cache, country_table.cache]
+    before = [len(cache) for cache in caches]
+    for _ in range(3):
+        df = make_hotel()
+        ranking_index(df).ranking(region="Asie", year=2019, individual=True)
+        assert [len(cache) for cache in caches] == [n + 1 for n in before]
+        del df
+        gc.collect()
+    assert [len(cache) for cache in caches] == before
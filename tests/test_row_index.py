@@ -0,0 +1,44 @@
+# tests/test_row_index.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.row_index import GroupIndex, RowIndex
+
+
+def make_hotel(n_rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    regions = rng.choice(["Asie", "Europe", "Amérique", None], n_rows, p=[0.3, 0.3, 0.3, 0.1])
+    return pd.DataFrame({
+        "Année": rng.integers(2015, 2020, n_rows),
+        "Region": pd.Categorical(regions, categories=["Afrique", "Amérique", "Asie", "Europe"]),
+        "Nombre de touristes": rng.integers(0, 1000, n_rows),
+    })
+
+
+def test_positions_identiques_aux_masques():
+    df = make_hotel()
+    index = RowIndex(df)
+    for region in ["Asie", "Europe", "Amérique", "Afrique", "Inconnue", None]:
+        for year in [2015, 2017, 2019, 2030, None]:
+            mask = np.ones(len(df), dtype=bool)
+            if region is not None:
+                mask &= (df["Region"] == region).to_numpy()
+            if year is not None:
+                mask &= (df["Année"] == year).to_numpy()
+            pd.testing.assert_frame_equal(index.select(df, region, year), df[mask])
+
+
+def test_groupes_dans_l_ordre_des_lignes():
+    df = pd.DataFrame({"a": ["y", "x", "y", "x", "y"], "b": [2, 1, 1, 1, 2]})
+    index = GroupIndex(df, ["a", "b"])
+    assert index.positions("y", 2).tolist() == [0, 4]
+    assert index.positions("x", 1).tolist() == [1, 3]
+    assert index.positions("x", 2).tolist() == []
+    assert index.positions("z", 1).tolist() == []
+
+
+def test_select_refuse_un_autre_dataframe():
+    df = make_hotel()
+    with pytest.raises(ValueError):
+        RowIndex(df).select(df.head(10), region="Asie")
@@ -0,0 +1,70 @@
+# tests/test_schema.py
+import pandas as pd
+import pytest
+
+from src.utils.schema import ReadOnlyFrame, apply_schema, read_only
+
+
+@pytest.fixture
+def df():
+    return read_only(apply_schema(pd.DataFrame({
+        "Region": ["Asie", "Europe (hors France)", "Asie"],
+        "Pays": ["Japon", "Italie", "Chine"],
+        "Nombre de touristes": [10, 20, 30],
+        "Nuitées touristiques": [100.0, 200.0, 300.0],
+    })))
+
+
+MUTATIONS = {
+    "ajout de colonne": lambda df: df.__setitem__("Nouvelle", 1),
+    "remplacement de colonne": lambda df: df.__setitem__("Nombre de touristes", 0),
+    "suppression de colonne": lambda df: df.__delitem__("Pays"),
+    "insert": lambda df: df.insert(0, "Nouvelle", 1),
+    "pop": lambda df: df.pop("Pays"),
+    "update": lambda df: df.update(pd.DataFrame({"Nuitées touristiques": [0.0, 0.0, 0.0]})),
+    "attribut de colonne": lambda df: setattr(df, "Pays", "x"),
+    "columns": lambda df: setattr(df, "columns", ["a", "b", "c", "d"]),
+    "index": lambda df: setattr(df, "index", [5, 6, 7]),
+    "loc nouvelle colonne": lambda df: df.loc.__setitem__((slice(None), "Nouvelle"), 1),
+    "loc": lambda df: df.loc.__setitem__((0, "Nuitées touristiques"), 0.0),
+    "iloc": lambda df: df.iloc.__setitem__((0, 3), 0.0),
+    "at": lambda df: df.at.__setitem__((0, "Nombre de touristes"), 0),
+    "valeurs d'une colonne": lambda df: df["Nuitées touristiques"].to_numpy().__setitem__(0, 0.0),
+    "reset_index(inplace=True)": lambda df: df.reset_index(drop=True, inplace=True),
+    "set_index(inplace=True)": lambda df: df.set_index("Pays", inplace=True),
+    "rename(inplace=True)": lambda df: df.rename(columns={"Pays": "P"}, inplace=True),
+    "rename_axis(inplace=True)": lambda df: df.rename_axis("ligne", inplace=True),
+    "sort_values(inplace=True)": lambda df: df.sort_values("Pays", inplace=True),
+    "sort_index(inplace=True)": lambda df: df.sort_index(ascending=False, inplace=True),
+    "fillna(inplace=True)": lambda df: df.fillna(0, inplace=True),
+    "replace(inplace=True)": lambda df: df.replace(10, 0, inplace=True),
+    "drop(inplace=True)": lambda df: df.drop(index=0, inplace=True),
+    "dropna(inplace=True)": lambda df: df.dropna(inplace=True),
+    "drop_duplicates(inplace=True)": lambda df: df.drop_duplicates(inplace=True),
+    "query(inplace=True)": lambda df: df.query("`Nombre de touristes` > 10", inplace=True),
+    "eval(inplace=True)": lambda df: df.eval("x = 1", inplace=True),
+    "clip(inplace=True)": lambda df: df.clip(lower=0, inplace=True),
+    "where(inplace=True)": lambda df: df.where(df.notna(), inplace=True),
+}
+
+
+@pytest.mark.parametrize("mutation", MUTATIONS.values(), ids=MUTATIONS.keys())
+def test_mutation_refusee_sans_effet(df, mutation):
+    before = pd.DataFrame(df, copy=True)
+    with pytest.raises((TypeError, ValueError)):
+        mutation(df)
+    assert "Pays" not in vars(df)
+    assert list(df.columns) == list(before.columns)
+    assert list(df.index) == list(before.index)
+    pd.testing.assert_frame_equal(pd.DataFrame(df), before)
+
+
+def test_resultats_derives_modifiables(df):
+    filtered = df[df["Nombre de touristes"] > 10]
+    sorted_df = df.sort_values("Pays")
+    renamed = df.rename(columns={"Pays": "P"})
+    for result in (filtered, sorted_df, renamed, df.reset_index(), df.copy()):
+        assert not isinstance(result, ReadOnlyFrame)
+    filtered = filtered.assign(Nouvelle=1)
+    sorted_df.reset_index(drop=True, inplace=True)
+    assert "Nouvelle" not in df.columns
@@ -0,0 +1,42 @@
+# tests/test_shared_cache.py
+import sqlite3
+
+from src.utils.shared_cache import SharedCache, code_version
+
+
+def test_reponses_d_une_autre_version_du_code_non_servies(tmp_path):
+    path = str(tmp_path / "responses.db")
+    old = SharedCache(path, 1024 * 1024, 3600, version="v1")
+    old.put("snap", "digest", b"ancienne figure")
+    assert old.get("snap", "digest") == b"ancienne figure"
+
+    new = SharedCache(path, 1024 * 1024, 3600, version="v2")
+    assert new.get("snap", "digest") is None
+    assert new.stats()["entries"] == 0
+
+    new.put("snap", "digest", b"nouvelle figure")
+    assert SharedCache(path, 1024 * 1024, 3600, version="v2").get("snap", "digest") == b"nouvelle figure"
+
+
+def test_ancien_format_sans_version_remplace(tmp_path):
+    path = str(tmp_path / "responses.db")
+    db = sqlite3.connect(path)
+    db.execute("""
+        CREATE TABLE responses (
+            snapshot TEXT NOT NULL, digest TEXT NOT NULL, callback TEXT, body BLOB NOT NULL,
+            size INTEGER NOT NULL, created REAL NOT NULL, PRIMARY KEY (snapshot, digest)
+        )
+    """)
+    db.execute("INSERT INTO responses VALUES ('snap', 'digest', NULL, x'00', 1, 1e12)")
+    db.commit()
+    db.close()
+
+    cache = SharedCache(path, 1024 * 1024, 3600, version="v1")
+    assert cache.get("snap", "digest") is None
+    cache.put("snap", "digest", b"figure")
+    assert cache.get("snap", "digest") == b"figure"
+
+
+def test_version_du_code_depend_du_deploiement():
+    assert code_version("a") == code_version("a")
+    assert code_version("a") != code_version("b")
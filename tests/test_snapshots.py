@@ -0,0 +1,36 @@
+# tests/test_snapshots.py
+import pandas as pd
+from flask import Flask
+
+from src.utils.snapshots import SnapshotHolder
+
+
+def make_client(**options):
+    holder = SnapshotHolder(lambda: {"df": pd.DataFrame({"a": [1]})}, lambda: "v1")
+    server = Flask(__name__)
+    holder.install(server, **options)
+    return server.test_client()
+
+
+def post_reload(client, remote_addr="127.0.0.1", headers=None):
+    return client.post("/_reload", headers=headers or {},
+                       environ_overrides={"REMOTE_ADDR": remote_addr}).status_code
+
+
+def test_rechargement_refuse_sans_jeton_configure():
+    # Derrière un reverse proxy, toutes les requêtes arrivent de l'adresse locale
+    assert post_reload(make_client()) == 403
+
+
+def test_rechargement_avec_jeton():
+    client = make_client(token="secret")
+    assert post_reload(client) == 403
+    assert post_reload(client, headers={"X-Reload-Token": "faux"}) == 403
+    assert post_reload(client, "203.0.113.5", {"X-Reload-Token": "secret"}) == 202
+
+
+def test_appels_locaux_sans_jeton_si_autorises():
+    client = make_client(allow_local=True)
+    assert post_reload(client) == 202
+    assert post_reload(client, "::1") == 202
+    assert post_reload(client, "203.0.113.5") == 403